@@ -0,0 +1,126 @@
+# adjacency.py
+
+from array import array
+from typing import List, Optional, Tuple
+
+from config import MOVES
+
+# bit k di mask = arah MOVES[k] terbuka
+_FULL_MASK = (1 << len(MOVES)) - 1
+
+
+class NeighborTable:
+    """Tetangga terbuka (in-bounds, bukan rintangan) per sel, index flat r*cols+c.
+
+    Per sel disimpan satu byte mask arah yang terbuka (bit k = MOVES[k]).
+    deltas[mask] adalah tuple selisih index (dr * cols + dc) dalam urutan
+    MOVES, jadi tetangga sel i = i + d untuk d di deltas[masks[i]]. Cukup
+    1 byte per sel, sehingga map 1000x1000 tetap kecil.
+
+    Tetangga sebuah sel tidak bergantung pada isi sel itu sendiri, jadi toggle
+    rintangan di (r, c) cukup menghitung ulang 4 tetangganya (patch).
+    START/GOAL tidak mempengaruhi tabel ini.
+    """
+
+    def __init__(self, rows: int, cols: int):
+        self.rows = rows
+        self.cols = cols
+        self.masks = bytearray(rows * cols)
+        self.deltas: List[Tuple[int, ...]] = [
+            tuple(dr * cols + dc for k, (dr, dc) in enumerate(MOVES) if mask >> k & 1)
+            for mask in range(_FULL_MASK + 1)
+        ]
+        # pasangan arah tegak lurus (d1, d2, k2): tetangga i + d1 dan i + d2
+        # bersebelahan lewat sel sudut i + d1 + d2 (terbuka kalau
+        # masks[i + d1] punya bit k2)
+        self.corners: List[Tuple[int, int, int]] = [
+            (dr1 * cols + dc1, dr2 * cols + dc2, k2)
+            for k1, (dr1, dc1) in enumerate(MOVES)
+            for k2, (dr2, dc2) in enumerate(MOVES)
+            if k1 < k2 and dr1 * dr2 + dc1 * dc2 == 0
+        ]
+        self._csr: Optional[Tuple[array, array]] = None
+
+    def neighbors(self, i: int) -> Tuple[int, ...]:
+        return tuple(i + d for d in self.deltas[self.masks[i]])
+
+    def _open_mask(self, grid, r: int, c: int) -> int:
+        rows, cols = self.rows, self.cols
+        mask = 0
+        for k, (dr, dc) in enumerate(MOVES):
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < rows and 0 <= nc < cols and grid[nr][nc] == 0:
+                mask |= 1 << k
+        return mask
+
+    def rebuild(self, grid):
+        """Hitung semua mask; per baris, memakai byte grid sebagai bilangan besar.
+
+        Tiap byte grid bernilai 0/1, jadi (baris tetangga << k) menaruh bit
+        "tertutup" arah k di byte yang sama tanpa carry ke byte sebelah.
+        """
+        rows, cols = self.rows, self.cols
+        data = grid.data
+        wall = b"\x01"
+        wall_row = b"\x01" * cols
+        # mask tertutup -> mask terbuka
+        invert = bytes(_FULL_MASK ^ (b & _FULL_MASK) for b in range(256))
+
+        for r in range(rows):
+            base = r * cols
+            row = data[base:base + cols].tobytes()
+            shifted = {
+                (-1, 0): data[base - cols:base].tobytes() if r > 0 else wall_row,
+                (1, 0): data[base + cols:base + 2 * cols].tobytes() if r < rows - 1 else wall_row,
+                (0, -1): wall + row[:-1],
+                (0, 1): row[1:] + wall,
+            }
+            closed = 0
+            for k, move in enumerate(MOVES):
+                closed |= int.from_bytes(shifted[move], "big") << k
+            self.masks[base:base + cols] = closed.to_bytes(cols, "big").translate(invert)
+        self._csr = None
+
+    def patch(self, grid, r: int, c: int):
+        """Update setelah grid[r][c] berubah (rintangan <-> kosong)."""
+        rows, cols = self.rows, self.cols
+        for dr, dc in MOVES:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < rows and 0 <= nc < cols:
+                self.masks[nr * cols + nc] = self._open_mask(grid, nr, nc)
+        self._csr = None
+
+    def csr(self) -> Tuple[array, array]:
+        """(offsets, indices): tetangga sel i = indices[offsets[i]:offsets[i + 1]]."""
+        if self._csr is None:
+            offsets = array("i", [0])
+            indices = array("i")
+            deltas = self.deltas
+            for i, mask in enumerate(self.masks):
+                indices.extend([i + d for d in deltas[mask]])
+                offsets.append(len(indices))
+            self._csr = (offsets, indices)
+        return self._csr
+
+    def distances_to(self, goal: int) -> array:
+        """Jarak BFS (jumlah langkah) tiap sel ke goal lewat sel terbuka; -1 = tidak sampai.
+
+        goal harus sel terbuka (caller yang cek). Tetangga simetris, jadi BFS
+        dari goal memberi jarak dari tiap sel ke goal.
+        """
+        dist = array("i", [-1]) * (self.rows * self.cols)
+        dist[goal] = 0
+        masks, deltas = self.masks, self.deltas
+        frontier = [goal]
+        d = 0
+        while frontier:
+            d += 1
+            nxt = []
+            for v in frontier:
+                for dv in deltas[masks[v]]:
+                    u = v + dv
+                    if dist[u] < 0:
+                        dist[u] = d
+                        nxt.append(u)
+            frontier = nxt
+        return dist
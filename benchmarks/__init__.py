@@ -0,0 +1,4 @@
+# benchmarks/
+#
+# Benchmark kecil untuk hot path simulasi. Jalankan dari root repo, contoh:
+#   python -m benchmarks.visited
@@ -0,0 +1,94 @@
+# benchmarks/convergence.py
+#
+# Berapa simulasi dan waktu yang dibutuhkan Monte Carlo sampai best cost
+# masuk X% dari cost optimal (oracle.shortest_path), untuk beberapa map.
+#
+#   python -m benchmarks.convergence
+#   python -m benchmarks.convergence --map maps/contoh.txt --within 0 5 --policy biased
+
+import argparse
+import statistics
+import sys
+import time
+
+from mapfile import load_map
+from oracle import shortest_path
+from config import WALK_POLICIES
+from benchmarks.policy import build_cost_map
+from benchmarks.prune import build_maze
+
+
+def default_maps():
+    """(nama, SimulationState) bawaan: map contoh, map cost acak, labirin."""
+    return [
+        ("contoh", load_map("maps/contoh.txt")),
+        ("cost12", build_cost_map(12, 7)),
+        ("cost16", build_cost_map(16, 3)),
+        ("maze5", build_maze(5, 1, 0.2, 1)),
+    ]
+
+
+def run_until(sim, targets, max_sims: int, seed: int):
+    """Jalankan sampai semua target tercapai atau max_sims habis.
+
+    Return {target: (sims, detik)} untuk target yang tercapai.
+    """
+    sim.max_simulations = max_sims
+    sim.reseed(seed)
+    sim.steps_per_frame = 1
+    sim.paused = False
+
+    reached = {}
+    pending = sorted(targets, reverse=True)
+    t0 = time.perf_counter()
+    while pending and not sim.simulation_done:
+        sim.step_frame()
+        best = sim.best_path_cost
+        while pending and best is not None and best <= pending[0] + 1e-9:
+            reached[pending.pop(0)] = (sim.sim_count, time.perf_counter() - t0)
+    return reached
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark konvergensi best cost ke cost optimal.")
+    parser.add_argument("--map", action="append", help="file map (boleh berulang; default: map bawaan)")
+    parser.add_argument("--within", type=float, nargs="+", default=[10.0, 5.0, 0.0],
+                        help="target gap dalam persen dari cost optimal")
+    parser.add_argument("--policy", choices=WALK_POLICIES, default="uniform")
+    parser.add_argument("--seeds", type=int, default=3)
+    parser.add_argument("--max-sims", type=int, default=100000)
+    parser.add_argument("--max-steps", type=int, default=200)
+    parser.add_argument("--agents", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    maps = [(path, load_map(path)) for path in args.map] if args.map else default_maps()
+
+    print(f"policy {args.policy}, {args.seeds} seed, max {args.max_sims} simulasi")
+    print(f"{'map':>10} {'optimal':>8} {'gap':>5} {'median sims':>12} {'median s':>9} {'tercapai':>8}")
+    for name, sim in maps:
+        result = shortest_path(sim)
+        if result is None:
+            print(f"{name:>10} {'-':>8}  tidak ada jalur START -> GOAL")
+            continue
+        optimal = result[0]
+        sim.walk_policy = args.policy
+        sim.agent_count = args.agents
+        sim.max_steps_per_walk = args.max_steps
+        targets = {within: optimal * (1 + within / 100) for within in args.within}
+
+        runs = [run_until(sim, targets.values(), args.max_sims, seed)
+                for seed in range(1, args.seeds + 1)]
+        for within, target in targets.items():
+            hits = [run[target] for run in runs if target in run]
+            if hits:
+                sims = statistics.median(h[0] for h in hits)
+                secs = statistics.median(h[1] for h in hits)
+                print(f"{name:>10} {optimal:>8.2f} {within:>4g}% {sims:>12.0f} {secs:>9.2f} "
+                      f"{len(hits):>4}/{args.seeds}")
+            else:
+                print(f"{name:>10} {optimal:>8.2f} {within:>4g}% {'-':>12} {'-':>9} {0:>4}/{args.seeds}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+# benchmarks/paths.py
+#
+# Bandingkan penyimpanan path per agen: list of (r, c) tuples yang dibuat
+# ulang tiap episode + tabel cell_pos (versi lama) vs array int index flat
+# yang dipakai ulang antar episode (versi sekarang).
+#
+#   python -m benchmarks.paths
+#   python -m benchmarks.paths --rows 200 --cols 200 --max-steps 100 1000
+
+import argparse
+import sys
+import time
+import tracemalloc
+
+from simulation import SimulationState, Agent
+from rng import RandomStream
+
+
+class TuplePathState(SimulationState):
+    """SimulationState dengan path lama: list of tuples, best_path = path.copy()."""
+
+    def reset_simulation(self):
+        # versi lama menyimpan tabel index flat -> (r, c) untuk semua sel
+        self.cell_pos = [divmod(i, self.cols) for i in range(self.rows * self.cols)]
+        super().reset_simulation()
+
+    def create_agent(self, episode: int = 0) -> Agent:
+        start_cell = self.start[0] * self.cols + self.start[1]
+        visited = bytearray(self.rows * self.cols)
+        visited[start_cell] = 1
+        return Agent(path=[self.start], visited=visited, active=True, steps=0,
+                     cell=start_cell, cost=self.cost_table[start_cell],
+                     episode=episode, rng=RandomStream(self.episode_rng_seed(episode)))
+
+    def handle_success(self, agent: Agent):
+        path_len = len(agent.path)
+        path_cost = agent.cost
+        self.success_count += 1
+        self.total_success_length += path_len
+        self.total_success_cost += path_cost
+        if self.best_path is None or path_cost < self.best_path_cost - 1e-9 or \
+           (abs(path_cost - self.best_path_cost) < 1e-9 and path_len < len(self.best_path)):
+            self.best_path = agent.path.copy()
+            self.best_path_cost = path_cost
+
+    def step_agent(self, agent: Agent):
+        if not agent.active:
+            return
+        if agent.steps >= self.max_steps_per_walk:
+            agent.active = False
+            return
+        if agent.cell == self.goal_cell:
+            self.handle_success(agent)
+            agent.active = False
+            return
+        neighbors = self.get_valid_neighbors(agent)
+        if not neighbors:
+            agent.active = False
+            return
+        next_cell = neighbors[agent.rng.randbelow(len(neighbors))]
+        agent.cell = next_cell
+        agent.path.append(self.cell_pos[next_cell])
+        agent.visited[next_cell] = 1
+        agent.cost += self.cost_table[next_cell]
+        agent.steps += 1
+        self.visit_cell(next_cell)
+        if next_cell == self.goal_cell:
+            self.handle_success(agent)
+            agent.active = False
+
+    def restart_agent_if_possible(self, agent: Agent) -> bool:
+        if self.sim_count >= self.max_simulations:
+            return False
+        cols = self.cols
+        for r, c in agent.path:
+            agent.visited[r * cols + c] = 0
+        start_cell = self.start[0] * cols + self.start[1]
+        agent.visited[start_cell] = 1
+        agent.episode = self.sim_count
+        agent.rng.seed(self.episode_rng_seed(agent.episode))
+        agent.cell = start_cell
+        agent.cost = self.cost_table[start_cell]
+        agent.path = [self.start]
+        agent.active = True
+        agent.steps = 0
+        self.sim_count += 1
+        self.increment_visit(self.start)
+        return True
+
+
+def path_bytes(path) -> int:
+    """Ukuran container path + objek tuple/int di dalamnya (int kecil di-cache)."""
+    size = sys.getsizeof(path)
+    if isinstance(path, list):
+        size += sum(sys.getsizeof(p) for p in path)
+    return size
+
+
+def run_case(cls, rows: int, cols: int, sims: int, max_steps: int, agents: int, seed: int):
+    sim = cls(seed=seed)
+    sim.resize_grid(rows, cols)
+    sim.agent_count = agents
+    sim.max_steps_per_walk = max_steps
+    sim.max_simulations = sims
+    sim.reset_simulation()
+    sim.steps_per_frame = 1000
+    sim.paused = False
+
+    t0 = time.perf_counter()
+    while not sim.simulation_done:
+        sim.step_frame()
+    elapsed = time.perf_counter() - t0
+
+    # ulang dengan tracemalloc untuk ukur memori (lebih lambat, tidak dihitung
+    # waktunya); reseed di dalamnya supaya tabel cell_pos versi lama ikut terhitung
+    tracemalloc.start()
+    sim.reseed(seed)
+    sim.paused = False
+    while not sim.simulation_done:
+        sim.step_frame()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # per agen: path episode terakhir (buffer array bisa lebih panjang dari path_len)
+    per_agent = sum(path_bytes(a.path) for a in sim.agents) / max(1, len(sim.agents))
+    table = path_bytes(getattr(sim, "cell_pos", []))
+    return elapsed, peak, per_agent, table
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark path: list of tuples vs array index flat.")
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--cols", type=int, default=100)
+    parser.add_argument("--sims", type=int, default=2000)
+    parser.add_argument("--agents", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-steps", type=int, nargs="+", default=[50, 200, 1000])
+    args = parser.parse_args(argv)
+
+    print(f"{'max_steps':>9} {'impl':>6} {'us/sim':>8} {'peak KiB':>9} "
+          f"{'path B/agen':>12} {'cell_pos KiB':>13}")
+    for max_steps in args.max_steps:
+        for name, cls in (("tuple", TuplePathState), ("array", SimulationState)):
+            elapsed, peak, per_agent, table = run_case(
+                cls, args.rows, args.cols, args.sims, max_steps, args.agents, args.seed)
+            print(f"{max_steps:>9} {name:>6} {elapsed / args.sims * 1e6:>8.2f} "
+                  f"{peak / 1024:>9.1f} {per_agent:>12.0f} {table / 1024:>13.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
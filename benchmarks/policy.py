@@ -0,0 +1,112 @@
+# benchmarks/policy.py
+#
+# Berapa simulasi yang dibutuhkan tiap walk policy sampai best cost mencapai
+# cost optimal, di map dengan cost acak (jalur terpendek bukan yang termurah).
+# Juga membandingkan estimasi importance sampling policy biased dengan
+# statistik mentah policy uniform.
+#
+#   python -m benchmarks.policy
+#   python -m benchmarks.policy --size 20 --seeds 10 --max-sims 500000
+
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from config import BIAS_COST_DEFAULT, BIAS_GOAL_DEFAULT
+from simulation import SimulationState, importance_estimates
+from oracle import shortest_path
+
+
+def build_cost_map(size: int, seed: int, obstacle_p: float = 0.15) -> SimulationState:
+    """Map size x size: rintangan acak dan cost 0..9 acak di sel kosong."""
+    rnd = random.Random(seed)
+    sim = SimulationState(rows=size, cols=size, seed=seed)
+    sim.resize_grid(size, size)
+    for r in range(size):
+        for c in range(size):
+            if (r, c) in (sim.start, sim.goal):
+                continue
+            if rnd.random() < obstacle_p:
+                sim.grid[r][c] = 1
+            else:
+                sim.cell_costs[r][c] = rnd.randrange(10)
+    sim.reset_simulation()
+    return sim
+
+
+def sims_to_optimum(sim: SimulationState, policy: str, target: float, max_sims: int,
+                    max_steps: int, agents: int, seed: int):
+    """Jumlah simulasi yang sudah dimulai saat best cost pertama kali <= target."""
+    sim.walk_policy = policy
+    sim.agent_count = agents
+    sim.max_steps_per_walk = max_steps
+    sim.max_simulations = max_sims
+    sim.reseed(seed)
+    sim.steps_per_frame = 1
+    sim.paused = False
+
+    t0 = time.perf_counter()
+    while not sim.simulation_done:
+        sim.step_frame()
+        if sim.best_path_cost is not None and sim.best_path_cost <= target + 1e-9:
+            return sim.sim_count, time.perf_counter() - t0
+    return None, time.perf_counter() - t0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark walk policy: simulasi sampai cost optimal.")
+    parser.add_argument("--size", type=int, default=12)
+    parser.add_argument("--map-seed", type=int, default=7)
+    parser.add_argument("--seeds", type=int, default=5, help="jumlah seed run per policy")
+    parser.add_argument("--max-sims", type=int, default=200000)
+    parser.add_argument("--max-steps", type=int, default=200)
+    parser.add_argument("--agents", type=int, default=10)
+    parser.add_argument("--bias-cost", type=float, default=BIAS_COST_DEFAULT)
+    parser.add_argument("--bias-goal", type=float, default=BIAS_GOAL_DEFAULT)
+    parser.add_argument("--estimate-sims", type=int, default=50000,
+                        help="simulasi untuk membandingkan estimasi uniform vs biased")
+    args = parser.parse_args(argv)
+
+    sim = build_cost_map(args.size, args.map_seed)
+    sim.bias_cost = args.bias_cost
+    sim.bias_goal = args.bias_goal
+    target = shortest_path(sim)[0]
+    print(f"map {args.size}x{args.size} (seed {args.map_seed}), cost optimal {target:.2f}")
+
+    print(f"{'policy':>8} {'median sims':>12} {'min':>8} {'max':>8} {'ketemu':>7} {'median s':>9}")
+    for policy in ("uniform", "biased"):
+        counts, times = [], []
+        for seed in range(1, args.seeds + 1):
+            n, elapsed = sims_to_optimum(sim, policy, target, args.max_sims,
+                                         args.max_steps, args.agents, seed)
+            times.append(elapsed)
+            if n is not None:
+                counts.append(n)
+        found = f"{len(counts)}/{args.seeds}"
+        if counts:
+            print(f"{policy:>8} {statistics.median(counts):>12.0f} {min(counts):>8} "
+                  f"{max(counts):>8} {found:>7} {statistics.median(times):>9.2f}")
+        else:
+            print(f"{policy:>8} {'-':>12} {'-':>8} {'-':>8} {found:>7} {statistics.median(times):>9.2f}")
+
+    # estimasi untuk walk uniform: langsung (uniform) vs importance sampling
+    # (biased). ESS kecil = bobot berat sebelah, estimasi biased masih kasar.
+    print(f"\n{'policy':>8} {'sukses %':>9} {'avg cost':>9} {'ESS':>8}")
+    for policy in ("uniform", "biased"):
+        sim.walk_policy = policy
+        sim.max_simulations = args.estimate_sims
+        sim.reseed(1)
+        sim.steps_per_frame = 1000
+        sim.paused = False
+        while not sim.simulation_done:
+            sim.step_frame()
+        rate, mean_cost, ess = importance_estimates(sim)
+        mean_str = f"{mean_cost:.2f}" if mean_cost is not None else "-"
+        print(f"{policy:>8} {rate * 100:>9.3f} {mean_str:>9} {ess:>8.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
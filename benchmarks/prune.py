@@ -0,0 +1,120 @@
+# benchmarks/prune.py
+#
+# Bandingkan walk tanpa pangkas, dengan prune_walks, dan dengan prune_pockets
+# di map labirin: jumlah step (kunjungan heatmap), waktu, dan walk yang
+# dipangkas. Statistik sukses dan best path harus sama persis.
+#
+#   python -m benchmarks.prune
+#   python -m benchmarks.prune --cells 10 --width 3 --max-steps 100 3000
+
+import argparse
+import random
+import sys
+import time
+
+from simulation import SimulationState
+from gridarray import GridArray
+
+# nama mode -> (prune_walks, prune_pockets)
+MODES = {
+    "off": (False, False),
+    "on": (True, False),
+    "pockets": (True, True),
+}
+
+STAT_FIELDS = (
+    "sim_count", "success_count", "total_success_length",
+    "min_success_length", "max_success_length",
+    "total_success_cost", "min_success_cost", "max_success_cost",
+    "best_path_cost", "best_episode",
+)
+
+
+def maze_rows(cells: int, width: int, loops: float, seed: int):
+    """Labirin (recursive backtracker) cells x cells, lorong selebar `width` sel.
+    loops = peluang tiap tembok dalam dibuka (labirin dengan putaran)."""
+    rnd = random.Random(seed)
+    n = 2 * cells + 1
+    wall = [[1] * n for _ in range(n)]
+    wall[1][1] = 0
+    stack = [(1, 1)]
+    while stack:
+        r, c = stack[-1]
+        options = [(r + dr, c + dc) for dr, dc in ((-2, 0), (2, 0), (0, -2), (0, 2))
+                   if 0 < r + dr < n - 1 and 0 < c + dc < n - 1 and wall[r + dr][c + dc]]
+        if not options:
+            stack.pop()
+            continue
+        nr, nc = rnd.choice(options)
+        wall[(r + nr) // 2][(c + nc) // 2] = 0
+        wall[nr][nc] = 0
+        stack.append((nr, nc))
+    for r in range(1, n - 1):
+        for c in range(1, n - 1):
+            if wall[r][c] and rnd.random() < loops:
+                wall[r][c] = 0
+    return [[v for v in row for _ in range(width)] for row in wall for _ in range(width)]
+
+
+def build_maze(cells: int, width: int, loops: float, seed: int) -> SimulationState:
+    rows = maze_rows(cells, width, loops, seed)
+    size = len(rows)
+    sim = SimulationState(rows=size, cols=size, seed=seed)
+    sim.resize_grid(size, size)
+    sim.grid = GridArray.from_rows(rows, "b")
+    sim.start = (width, width)
+    sim.goal = (size - 1 - width, size - 1 - width)
+    sim.reset_simulation()
+    return sim
+
+
+def run_case(sim: SimulationState, mode: str, sims: int, max_steps: int,
+             agents: int, seed: int):
+    sim.prune_walks, sim.prune_pockets = MODES[mode]
+    sim.agent_count = agents
+    sim.max_steps_per_walk = max_steps
+    sim.max_simulations = sims
+    sim.reseed(seed)
+    sim.steps_per_frame = 1000
+    sim.paused = False
+
+    t0 = time.perf_counter()
+    while not sim.simulation_done:
+        sim.step_frame()
+    elapsed = time.perf_counter() - t0
+
+    stats = tuple(getattr(sim, name) for name in STAT_FIELDS)
+    best = sim.best_path.tobytes() if sim.best_path is not None else None
+    return elapsed, sim.visit_total, sim.pruned_count, (stats, best)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark prune_walks di map labirin.")
+    parser.add_argument("--cells", type=int, default=10, help="ukuran labirin (sel x sel)")
+    parser.add_argument("--width", type=int, nargs="+", default=[1, 3], help="lebar lorong")
+    parser.add_argument("--loops", type=float, default=0.05)
+    parser.add_argument("--sims", type=int, default=3000)
+    parser.add_argument("--agents", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-steps", type=int, nargs="+", default=[60, 3000])
+    args = parser.parse_args(argv)
+
+    print(f"{'lorong':>6} {'max_steps':>9} {'prune':>7} {'steps':>9} {'ms':>7} "
+          f"{'dipangkas':>9} {'sukses':>6} {'sama':>4}")
+    for width in args.width:
+        sim = build_maze(args.cells, width, args.loops, args.seed)
+        for max_steps in args.max_steps:
+            baseline = None
+            for mode in MODES:
+                elapsed, steps, pruned, result = run_case(
+                    sim, mode, args.sims, max_steps, args.agents, args.seed)
+                if baseline is None:
+                    baseline = result
+                same = "ya" if result == baseline else "TIDAK"
+                print(f"{width:>6} {max_steps:>9} {mode:>7} {steps:>9} "
+                      f"{elapsed * 1000:>7.0f} {pruned:>9} {result[0][1]:>6} {same:>4}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
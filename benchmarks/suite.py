@@ -0,0 +1,334 @@
+# benchmarks/suite.py
+#
+# Suite benchmark hot path simulasi & render dengan seed tetap, di matriks
+# map (open, default, labirin, cost) x ukuran grid x jumlah agen. Render diukur
+# off-screen (SDL dummy driver). Hasil ditulis ke JSON dan dibandingkan dengan
+# baseline; exit code 1 kalau ada yang lebih lambat dari ambang.
+#
+#   python -m benchmarks.suite --save-baseline          # simpan baseline mesin ini
+#   python -m benchmarks.suite                          # bandingkan dengan baseline
+#   python -m benchmarks.suite --quick --threshold 0.2
+#
+# Semua metrik berupa waktu (lebih kecil lebih baik). Tiap metrik = minimum
+# dari --repeat putaran (semua benchmark sekali per putaran), supaya noise
+# mesin tidak ikut terukur.
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from simulation import SimulationState, Agent
+from benchmarks.prune import build_maze
+from benchmarks.policy import build_cost_map
+
+DEFAULT_OUTPUT = "benchmarks/results.json"
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+
+
+# ---------- map ----------
+
+def build_open(size: int, seed: int) -> SimulationState:
+    sim = SimulationState(rows=size, cols=size, seed=seed)
+    for r in range(size):
+        for c in range(size):
+            sim.grid[r][c] = 0
+    sim.reset_simulation()
+    return sim
+
+
+def build_default(size: int, seed: int) -> SimulationState:
+    # rintangan bawaan __post_init__
+    return SimulationState(rows=size, cols=size, seed=seed)
+
+
+def build_maze_map(size: int, seed: int) -> SimulationState:
+    # labirin 2 * cells + 1 sel, dengan putaran supaya walk bisa sampai
+    return build_maze(max(2, (size - 1) // 2), 1, 0.2, seed)
+
+
+def build_cost(size: int, seed: int) -> SimulationState:
+    return build_cost_map(size, seed)
+
+
+MAPS = {
+    "open": build_open,
+    "default": build_default,
+    "maze": build_maze_map,
+    "cost": build_cost,
+}
+
+
+# ---------- benchmark simulasi ----------
+
+def bench_run(sim: SimulationState, agents: int, sims: int, max_steps: int, seed: int):
+    """Run penuh (step_agent + get_valid_neighbors + handle_success + restart).
+    Return (detik, steps, sukses)."""
+    sim.agent_count = agents
+    sim.max_steps_per_walk = max_steps
+    sim.max_simulations = sims
+    sim.reseed(seed)
+    sim.steps_per_frame = 1000
+    sim.paused = False
+    t0 = time.perf_counter()
+    while not sim.simulation_done:
+        sim.step_frame()
+    return time.perf_counter() - t0, sim.visit_total, sim.success_count
+
+
+def mid_walk_agents(sim: SimulationState, count: int, seed: int):
+    """Agen yang sedang di tengah walk (untuk get_valid_neighbors)."""
+    sim.agent_count = 1
+    sim.max_simulations = 10 ** 9
+    sim.reseed(seed)
+    agents = []
+    agent = sim.agents[0]
+    while len(agents) < count:
+        sim.step_agent(agent)
+        if agent.active:
+            snap = sim.create_agent(agent.episode)
+            snap.visited[:] = agent.visited
+            snap.cell = agent.cell
+            agents.append(snap)
+        else:
+            sim.restart_agent_if_possible(agent)
+    return agents
+
+
+def bench_neighbors(sim: SimulationState, seed: int, calls: int) -> float:
+    """ns per get_valid_neighbors."""
+    agents = mid_walk_agents(sim, 256, seed)
+    get = sim.get_valid_neighbors
+    rounds = max(1, calls // len(agents))
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for agent in agents:
+            get(agent)
+    return (time.perf_counter() - t0) / (rounds * len(agents)) * 1e9
+
+
+def bench_success(sim: SimulationState, calls: int) -> float:
+    """ns per handle_success dengan jalur optimal (oracle) sebagai walk sukses."""
+    from oracle import shortest_path
+
+    sim.reset_simulation()
+    result = shortest_path(sim)
+    if result is None:
+        return float("nan")
+    cost, cells = result
+    agent: Agent = sim.create_agent(0)
+    agent.path = cells
+    agent.path_len = len(cells)
+    agent.cost = cost
+    handle = sim.handle_success
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        handle(agent)
+    return (time.perf_counter() - t0) / calls * 1e9
+
+
+# ---------- benchmark render ----------
+
+def bench_render(sim: SimulationState, agents: int, frames: int, seed: int):
+    """ms per frame untuk ui.draw_grid dan ui.draw_sidebar (surface off-screen).
+    Simulasi maju satu frame di antara render (tidak diukur), seperti di window."""
+    import pygame
+    import ui
+    from config import CELL_SIZE, MARGIN, SIDEBAR_WIDTH
+    from worker import SimSnapshot
+
+    pygame.init()
+    font = pygame.font.SysFont(None, 20)
+    font_title = pygame.font.SysFont(None, 24, bold=True)
+
+    sim.agent_count = agents
+    sim.max_simulations = 10 ** 9
+    sim.reseed(seed)
+    sim.steps_per_frame = 5
+    sim.paused = False
+    snap = SimSnapshot()
+    snap.copy_from(sim)
+
+    grid_w, grid_h = ui.grid_view_size(snap, CELL_SIZE)
+    panel_h = ui.get_sidebar_height(snap, font, font_title)
+    canvas = pygame.Surface((grid_w + 2 * MARGIN + SIDEBAR_WIDTH, max(grid_h, panel_h) + 2 * MARGIN))
+
+    grid_s = sidebar_s = 0.0
+    for _ in range(frames):
+        sim.step_frame()
+        snap.copy_from(sim)
+        # teks sidebar dibangun sekali per frame (seperti main.py), dihitung ke sidebar
+        t0 = time.perf_counter()
+        sec = ui.build_sidebar_sections(snap)
+        tb = time.perf_counter()
+        ui.draw_grid(canvas, snap, CELL_SIZE, font, font_title, sec)
+        t1 = time.perf_counter()
+        ui.draw_sidebar(canvas, snap, font, font_title, CELL_SIZE, sec)
+        t2 = time.perf_counter()
+        grid_s += t1 - tb
+        sidebar_s += (tb - t0) + (t2 - t1)
+        # frame selesai: area berubah diambil seperti di main.py (tidak diukur)
+        ui.dirty.take()
+    return grid_s / frames * 1e3, sidebar_s / frames * 1e3
+
+
+# ---------- suite ----------
+
+def build_tasks(args):
+    """[(key, unit, fn)]; fn() mengembalikan nilai metrik dalam unit tsb."""
+    tasks = []
+    for name in args.maps:
+        for size in args.sizes:
+            case = f"{name}/{size}"
+            sim = MAPS[name](size, args.map_seed)
+            for agents in args.agents:
+                def run(sim=sim, agents=agents):
+                    elapsed, steps, _ = bench_run(sim, agents, args.sims, args.max_steps, args.seed)
+                    return {"us/sim": elapsed / args.sims * 1e6,
+                            "ns/step": elapsed / max(1, steps) * 1e9}
+                tasks.append(((f"run/{case}/a{agents}", "us/sim"),
+                              (f"step/{case}/a{agents}", "ns/step"), run))
+
+            tasks.append(((f"neighbors/{case}", "ns/call"),
+                          lambda sim=sim: {"ns/call": bench_neighbors(sim, args.seed, args.calls)}))
+            tasks.append(((f"handle_success/{case}", "ns/call"),
+                          lambda sim=sim: {"ns/call": bench_success(sim, args.calls // 10)}))
+            if not args.no_render:
+                agents = max(args.agents)
+
+                def render(sim=sim, agents=agents):
+                    grid_ms, sidebar_ms = bench_render(sim, agents, args.frames, args.seed)
+                    return {"grid": grid_ms, "sidebar": sidebar_ms}
+                tasks.append(((f"draw_grid/{case}/a{agents}", "grid"),
+                              (f"draw_sidebar/{case}/a{agents}", "sidebar"), render))
+    return tasks
+
+
+def run_suite(args) -> dict:
+    """Jalankan semua task --repeat putaran; tiap metrik = nilai terkecil.
+
+    Putaran berisi semua task sekali, jadi perlambatan mesin sesaat (throttle,
+    proses lain) hanya mengenai satu putaran, bukan semua pengulangan satu task.
+    """
+    units = {"grid": "ms/frame", "sidebar": "ms/frame"}
+    tasks = build_tasks(args)
+    best = {}
+    for round_no in range(args.repeat):
+        for *metrics, fn in tasks:
+            values = fn()
+            for key, field in metrics:
+                value = values[field]
+                if key not in best or value < best[key]:
+                    best[key] = value
+        print(f"putaran {round_no + 1}/{args.repeat} selesai", flush=True)
+
+    results = {}
+    for *metrics, _ in tasks:
+        for key, field in metrics:
+            unit = units.get(field, field)
+            results[key] = {"value": best[key], "unit": unit}
+            print(f"{key:<44} {best[key]:>12.3f} {unit}")
+    return results
+
+
+def metadata(args) -> dict:
+    meta = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "args": {k: v for k, v in vars(args).items()
+                 if k not in ("output", "baseline", "save_baseline", "threshold")},
+    }
+    try:
+        import numpy
+        meta["numpy"] = numpy.__version__
+    except ImportError:
+        meta["numpy"] = None
+    if not args.no_render:
+        import pygame
+        meta["pygame"] = pygame.version.ver
+    return meta
+
+
+def compare(results: dict, meta: dict, baseline: dict, threshold: float) -> int:
+    """Cetak perbandingan dengan baseline; return jumlah regresi."""
+    base = baseline["results"]
+    old_meta = baseline.get("meta", {})
+    for field in ("args", "python", "platform"):
+        if old_meta.get(field) != meta[field]:
+            print(f"peringatan: {field} berbeda dari baseline, perbandingan kurang adil")
+    regressions = 0
+    print(f"\n{'benchmark':<44} {'baseline':>10} {'sekarang':>10} {'rasio':>7}")
+    for key, res in results.items():
+        if key not in base:
+            continue
+        old, new = base[key]["value"], res["value"]
+        if not old or old != old or new != new:
+            continue
+        ratio = new / old
+        mark = ""
+        if ratio > 1 + threshold:
+            mark = "  LEBIH LAMBAT"
+            regressions += 1
+        elif ratio < 1 - threshold:
+            mark = "  lebih cepat"
+        print(f"{key:<44} {old:>10.3f} {new:>10.3f} {ratio:>7.2f}{mark}")
+    missing = set(base) - set(results)
+    if missing:
+        print(f"(tidak diukur kali ini: {len(missing)} benchmark baseline)")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Suite benchmark simulasi & render, dengan baseline.")
+    parser.add_argument("--maps", nargs="+", choices=sorted(MAPS), default=list(MAPS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 30])
+    parser.add_argument("--agents", type=int, nargs="+", default=[1, 20])
+    parser.add_argument("--sims", type=int, default=3000, help="simulasi per run")
+    parser.add_argument("--max-steps", type=int, default=200)
+    parser.add_argument("--calls", type=int, default=20000, help="panggilan per micro-benchmark")
+    parser.add_argument("--frames", type=int, default=60, help="frame per benchmark render")
+    parser.add_argument("--repeat", type=int, default=5, help="putaran; tiap metrik diambil yang tercepat")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--map-seed", type=int, default=7)
+    parser.add_argument("--quick", action="store_true", help="matriks kecil (ukuran 10, 20 agen)")
+    parser.add_argument("--no-render", action="store_true", help="lewati benchmark render (tanpa pygame)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="file JSON hasil")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="file JSON baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="tulis hasil sebagai baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="rasio sekarang/baseline di atas 1 + ini = regresi")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.sizes, args.agents, args.sims = [10], [20], 1000
+
+    data = {"meta": metadata(args), "results": run_suite(args)}
+    with open(args.output, "w") as f:
+        json.dump(data, f, indent=1)
+    print(f"\nhasil: {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(data, f, indent=1)
+        print(f"baseline disimpan: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"baseline {args.baseline} belum ada (buat dengan --save-baseline)")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(data["results"], data["meta"], baseline, args.threshold)
+    if regressions:
+        print(f"\n{regressions} benchmark lebih lambat > {args.threshold * 100:.0f}% dari baseline")
+        return 1
+    print(f"\ntidak ada regresi > {args.threshold * 100:.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+# benchmarks/visited.py
+#
+# Bandingkan visited-state per agen: set sel yang dibuat ulang tiap episode
+# (versi lama) vs bytearray flat r*cols+c yang di-reset di tempat (versi
+# sekarang). Loop langkah kedua sisi sama; statistik hasil dicek identik.
+#
+#   python -m benchmarks.visited
+#   python -m benchmarks.visited --sims 50000 --max-steps 10
+
+import argparse
+import sys
+import time
+import tracemalloc
+
+from simulation import SimulationState, Agent
+
+
+class BytearrayVisitedState(SimulationState):
+    """Visited sekarang (bytearray, reset di tempat) dengan step_agent tanpa
+    cabang policy/pangkas/walk log, supaya setara dengan SetVisitedState."""
+
+    def step_agent(self, agent: Agent):
+        if not agent.active:
+            return
+        if agent.steps >= self.max_steps_per_walk:
+            agent.active = False
+            return
+        if agent.cell == self.goal_cell:
+            self.handle_success(agent)
+            agent.active = False
+            return
+        neighbors = self.get_valid_neighbors(agent)
+        if not neighbors:
+            agent.active = False
+            return
+        next_cell = neighbors[agent.rng.randbelow(len(neighbors))]
+        agent.cell = next_cell
+        n = agent.path_len
+        try:
+            agent.path[n] = next_cell
+        except IndexError:
+            agent.path.append(next_cell)
+        agent.path_len = n + 1
+        agent.visited[next_cell] = 1
+        agent.cost += self.cost_table[next_cell]
+        agent.steps += 1
+        self.visit_cell(next_cell)
+        if next_cell == self.goal_cell:
+            self.handle_success(agent)
+            agent.active = False
+
+
+class SetVisitedState(SimulationState):
+    """Visited lama: set sel (index flat), dibuat ulang tiap restart.
+
+    Selain wadah visited, step_agent dan restart sama persis dengan
+    BytearrayVisitedState / SimulationState (field cell & cost, cost berjalan
+    dari cost_table), jadi selisih waktu = selisih visited-state saja.
+    """
+    def create_agent(self, episode: int = 0) -> Agent:
+        agent = super().create_agent(episode)
+        agent.visited = {agent.cell}
+        return agent
+
+    def get_valid_neighbors(self, agent: Agent):
+        visited = agent.visited
+        cell = agent.cell
+        table = self.neighbors
+        return [cell + d for d in table.deltas[table.masks[cell]] if cell + d not in visited]
+
+    def step_agent(self, agent: Agent):
+        if not agent.active:
+            return
+        if agent.steps >= self.max_steps_per_walk:
+            agent.active = False
+            return
+        if agent.cell == self.goal_cell:
+            self.handle_success(agent)
+            agent.active = False
+            return
+        neighbors = self.get_valid_neighbors(agent)
+        if not neighbors:
+            agent.active = False
+            return
+        next_cell = neighbors[agent.rng.randbelow(len(neighbors))]
+        agent.cell = next_cell
+        n = agent.path_len
+        try:
+            agent.path[n] = next_cell
+        except IndexError:
+            agent.path.append(next_cell)
+        agent.path_len = n + 1
+        agent.visited.add(next_cell)
+        agent.cost += self.cost_table[next_cell]
+        agent.steps += 1
+        self.visit_cell(next_cell)
+        if next_cell == self.goal_cell:
+            self.handle_success(agent)
+            agent.active = False
+
+    def restart_agent_if_possible(self, agent: Agent) -> bool:
+        if self.sim_count >= self.max_simulations:
+            return False
+        start_cell = self.start[0] * self.cols + self.start[1]
+        agent.visited = {start_cell}
+        agent.episode = self.sim_count
+        agent.rng.seed(self.episode_rng_seed(agent.episode))
+        agent.cell = start_cell
+        agent.cost = self.cost_table[start_cell]
+        agent.path[0] = start_cell
+        agent.path_len = 1
+        agent.log_weight = 0.0
+        agent.active = True
+        agent.steps = 0
+        self.sim_count += 1
+        self.increment_visit(self.start)
+        return True
+
+
+def result_key(sim: SimulationState):
+    """Statistik yang harus sama persis antara kedua implementasi."""
+    return (sim.sim_count, sim.success_count, sim.total_success_length,
+            sim.total_success_cost, sim.best_path_cost,
+            None if sim.best_path is None else sim.best_path.tolist(), sim.visit_total)
+
+
+def run_case(cls, sims: int, max_steps: int, agents: int, seed: int):
+    sim = cls(seed=seed)
+    sim.agent_count = agents
+    sim.max_steps_per_walk = max_steps
+    sim.max_simulations = sims
+    sim.reset_simulation()
+    sim.steps_per_frame = 1000
+    sim.paused = False
+
+    t0 = time.perf_counter()
+    while not sim.simulation_done:
+        sim.step_frame()
+    elapsed = time.perf_counter() - t0
+    key = result_key(sim)
+
+    # ulang dengan tracemalloc untuk ukur memori (lebih lambat, tidak dihitung waktunya)
+    sim.reseed(seed)
+    sim.paused = False
+    tracemalloc.start()
+    while not sim.simulation_done:
+        sim.step_frame()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    visited_bytes = sum(sys.getsizeof(a.visited) for a in sim.agents) / max(1, len(sim.agents))
+    return elapsed, peak, visited_bytes, key
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark visited-state: set vs bytearray.")
+    parser.add_argument("--sims", type=int, default=20000)
+    parser.add_argument("--agents", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-steps", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="putaran selang-seling; waktu diambil yang tercepat")
+    args = parser.parse_args(argv)
+
+    print(f"{'max_steps':>9} {'impl':>9} {'us/sim':>8} {'peak KiB':>9} {'visited B/agen':>15}")
+    for max_steps in args.max_steps:
+        impls = (("set", SetVisitedState), ("bytearray", BytearrayVisitedState))
+        best = {}
+        for _ in range(args.repeat):
+            for name, cls in impls:
+                result = run_case(cls, args.sims, max_steps, args.agents, args.seed)
+                if name not in best or result[0] < best[name][0]:
+                    best[name] = result
+        keys = []
+        for name, _ in impls:
+            elapsed, peak, visited_bytes, key = best[name]
+            keys.append(key)
+            print(f"{max_steps:>9} {name:>9} {elapsed / args.sims * 1e6:>8.2f} "
+                  f"{peak / 1024:>9.1f} {visited_bytes:>15.0f}")
+        if keys[0] != keys[1]:
+            print(f"statistik set != bytearray untuk max_steps {max_steps}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
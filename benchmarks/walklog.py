@@ -0,0 +1,94 @@
+# benchmarks/walklog.py
+#
+# Ongkos walk log: throughput simulasi tanpa log vs log walk sukses vs log
+# semua walk, ukuran file per walk, dan kecepatan baca read_walks. Selisih
+# waktu run mudah tertutup noise, jadi ongkos tulis juga diukur langsung:
+# walk hasil baca ditulis ulang ke WalkWriter baru (kolom "tulis").
+#
+#   python -m benchmarks.walklog
+#   python -m benchmarks.walklog --map maps/contoh.txt --sims 200000 --repeat 5
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from mapfile import load_map
+from simulation import SimulationState
+from walklog import WalkWriter, read_walks
+
+
+def run_once(sim: SimulationState, seed: int, path, include_failed: bool) -> float:
+    sim.reseed(seed)
+    sim.steps_per_frame = 1000
+    sim.paused = False
+    writer = WalkWriter(path, sim.rows, sim.cols, include_failed) if path else None
+    sim.walk_log = writer
+    t0 = time.perf_counter()
+    while not sim.simulation_done:
+        sim.step_frame()
+    if writer is not None:
+        writer.close()
+    elapsed = time.perf_counter() - t0
+    sim.walk_log = None
+    return elapsed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark walk log: overhead tulis & ukuran file.")
+    parser.add_argument("--map", default="maps/contoh.txt")
+    parser.add_argument("--sims", type=int, default=100000)
+    parser.add_argument("--agents", type=int, default=20)
+    parser.add_argument("--max-steps", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3, help="run per mode (diselang-seling)")
+    args = parser.parse_args(argv)
+
+    sim = load_map(args.map)
+    sim.agent_count = args.agents
+    sim.max_steps_per_walk = args.max_steps
+    sim.max_simulations = args.sims
+
+    tmp = tempfile.mkdtemp()
+    modes = (("tanpa log", None, False),
+             ("sukses", os.path.join(tmp, "ok.bin.gz"), False),
+             ("semua", os.path.join(tmp, "all.bin.gz"), True))
+    times = {name: [] for name, _, _ in modes}
+    for _ in range(args.repeat):
+        for name, path, failed in modes:
+            times[name].append(run_once(sim, args.seed, path, failed))
+
+    base = statistics.median(times["tanpa log"])
+    print(f"{'mode':>10} {'median s':>9} {'overhead':>9} {'walk':>9} {'KiB':>9} {'B/walk':>7} "
+          f"{'baca walk/s':>12} {'tulis us/walk':>14} {'tulis % run':>12}")
+    for name, path, _ in modes:
+        t = statistics.median(times[name])
+        line = f"{name:>10} {t:>9.3f} {(t / base - 1) * 100:>8.1f}%"
+        if path:
+            t0 = time.perf_counter()
+            records = list(read_walks(path))
+            read_s = time.perf_counter() - t0
+            walks = len(records)
+            size = os.path.getsize(path)
+
+            replay = os.path.join(tmp, "replay.bin.gz")
+            t0 = time.perf_counter()
+            with WalkWriter(replay, sim.rows, sim.cols, include_failed=True) as writer:
+                for w in records:
+                    writer.write(w.cells, len(w.cells), w.cost, w.episode, w.outcome)
+            write_s = time.perf_counter() - t0
+            os.remove(replay)
+
+            line += (f" {walks:>9} {size / 1024:>9.1f} {size / max(1, walks):>7.1f}"
+                     f" {walks / read_s:>12,.0f} {write_s / max(1, walks) * 1e6:>14.2f}"
+                     f" {write_s / base * 100:>11.1f}%")
+            os.remove(path)
+        print(line)
+    os.rmdir(tmp)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
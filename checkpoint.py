@@ -0,0 +1,290 @@
+# checkpoint.py
+#
+# Checkpoint SimulationState ke satu file biner, supaya run panjang bisa
+# dilanjutkan dan hasilnya identik bit per bit dengan run tanpa jeda.
+#
+#   prefix : b"MCCP", versi (I), offset meta (Q), panjang meta (Q)
+#   section: array mentah (grid, cost, heatmap, path agen, trie, ...),
+#            tiap section mulai di batas CHECKPOINT_ALIGN byte
+#   meta   : JSON di akhir file: setting, statistik, distribusi, state RNG
+#            agen, dan daftar section (offset, typecode, jumlah elemen)
+#
+# Section tidak di-encode, jadi menulis = menyalin buffer array apa adanya,
+# dan membaca bisa lewat mmap (CheckpointFile) tanpa parse. File ditulis ke
+# "<path>.tmp" lalu os.replace, jadi checkpoint lama tidak pernah setengah
+# tertimpa.
+#
+#   save_checkpoint(sim, "run.ckpt")
+#   sim, extra = load_checkpoint("run.ckpt")
+#
+# Yang tidak disimpan (dihitung ulang saat load): tabel tetangga, tabel cost,
+# jarak BFS ke GOAL, solusi eksak, visited agen (= sel path-nya), walk_log.
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Optional, Tuple
+
+from adjacency import NeighborTable
+from gridarray import GridArray
+from pathtrie import PathTrie
+from rng import RandomStream
+from simulation import Agent, SimulationState, PATH_TYPECODE
+from streamstats import Distribution, Histogram, Moments, QuantileSketch
+
+MAGIC = b"MCCP"
+VERSION = 1
+_PREFIX = struct.Struct("<4sIQQ")
+# kelipatan halaman: section bisa di-mmap / np.memmap langsung
+CHECKPOINT_ALIGN = 4096
+
+# field skalar yang disalin apa adanya (setting + statistik)
+_FIELDS = (
+    "rows", "cols", "start", "goal", "seed", "episode_base",
+    "agent_count", "steps_per_frame", "max_steps_per_walk", "max_simulations",
+    "prune_walks", "prune_pockets", "walk_policy", "bias_cost", "bias_goal",
+    "step_mode", "frame_budget_ms",
+    "stop_ci_halfwidth", "stop_patience", "best_improved_at", "stop_reason",
+    "track_paths", "path_trie_max_nodes",
+    "visit_max", "visit_total", "visit_nonzero",
+    "best_path_cost", "best_episode",
+    "sim_count", "success_count", "total_success_length",
+    "min_success_length", "max_success_length",
+    "total_success_cost", "min_success_cost", "max_success_cost",
+    "pruned_count", "success_weight", "success_weight_sq", "success_weight_cost",
+    "simulation_done", "paused", "first_step_after_reset",
+    "cursor_mode", "current_cost_value",
+)
+_TRIE_ARRAYS = ("parent", "cell", "children", "depth", "count", "cost")
+_TRIE_FIELDS = ("max_nodes", "keep_cheapest", "nodes", "distinct", "samples",
+                "top_node", "evicted_paths", "evicted_samples")
+
+
+# ---------- tulis ----------
+
+def save_checkpoint(sim: SimulationState, path: str, extra: Optional[dict] = None):
+    """Tulis checkpoint sim ke path secara atomik. Panggil di antara step_frame.
+
+    extra: data tambahan pemanggil (JSON), dikembalikan load_checkpoint.
+    """
+    sections: Dict[str, array] = {
+        "grid": sim.grid.data,
+        "cell_costs": sim.cell_costs.data,
+        "visit_counts": sim.visit_counts.data,
+    }
+    if sim.best_path is not None:
+        sections["best_path"] = sim.best_path
+
+    # path semua agen disambung; panjang tiap agen ada di meta
+    agent_paths = array(PATH_TYPECODE)
+    agents = []
+    for agent in sim.agents:
+        agent_paths.extend(agent.cells())
+        key, counter, buf, pos = agent.rng.getstate()
+        agents.append({
+            "path_len": agent.path_len, "active": agent.active, "steps": agent.steps,
+            "cell": agent.cell, "cost": agent.cost, "episode": agent.episode,
+            "log_weight": agent.log_weight,
+            "rng": [key.hex(), counter, list(buf), pos],
+        })
+    sections["agent_paths"] = agent_paths
+
+    trie = None
+    if sim.path_trie is not None:
+        t = sim.path_trie
+        trie = {name: getattr(t, name) for name in _TRIE_FIELDS}
+        for name in _TRIE_ARRAYS:
+            sections["trie_" + name] = getattr(t, name)
+        sections["trie_free"] = array("i", t.free)
+
+    meta = {
+        "byteorder": sys.byteorder,
+        "fields": {name: getattr(sim, name) for name in _FIELDS},
+        "agents": agents,
+        "length_dist": _dist_state(sim.length_dist),
+        "cost_dist": _dist_state(sim.cost_dist),
+        "path_trie": trie,
+        "extra": extra or {},
+        "sections": {},
+    }
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(bytes(CHECKPOINT_ALIGN))
+        offset = CHECKPOINT_ALIGN
+        for name, data in sections.items():
+            meta["sections"][name] = [offset, data.typecode, len(data)]
+            f.write(data)
+            offset += len(data) * data.itemsize
+            pad = -offset % CHECKPOINT_ALIGN
+            f.write(bytes(pad))
+            offset += pad
+        blob = json.dumps(meta, separators=(",", ":")).encode()
+        f.write(blob)
+        f.seek(0)
+        f.write(_PREFIX.pack(MAGIC, VERSION, offset, len(blob)))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _dist_state(dist: Distribution) -> dict:
+    m, h, s = dist.moments, dist.hist, dist.sketch
+    return {
+        "moments": [m.count, m.mean, m.m2],
+        "hist": [h.lo, h.hi, h.bins, h.counts],
+        # pasangan [key, n]: key dict di JSON selalu jadi string
+        "sketch": [s.alpha, s.max_buckets, list(s.buckets.items()), s.zero_count, s.count],
+    }
+
+
+def _dist_from_state(state: dict) -> Distribution:
+    lo, hi, bins, counts = state["hist"]
+    alpha, max_buckets, buckets, zero_count, count = state["sketch"]
+    return Distribution(
+        hist=Histogram(lo, hi, bins, counts),
+        moments=Moments(*state["moments"]),
+        sketch=QuantileSketch(alpha, max_buckets, dict(buckets), zero_count, count),
+    )
+
+
+# ---------- baca ----------
+
+class CheckpointFile:
+    """Checkpoint yang dibuka lewat mmap: meta + view section tanpa salin.
+
+    view() mengembalikan memoryview read-only ke isi file (mis. heatmap map
+    besar untuk dianalisis tanpa memuat semuanya); berlaku sampai close().
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._mm = None
+        self._views = []
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path}: bukan checkpoint (file kosong)")
+        if len(self._mm) < _PREFIX.size:
+            self.close()
+            raise ValueError(f"{path}: bukan checkpoint")
+        magic, version, meta_offset, meta_len = _PREFIX.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path}: bukan checkpoint versi {VERSION}")
+        self.meta = json.loads(self._mm[meta_offset:meta_offset + meta_len])
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.meta["sections"]
+
+    def view(self, name: str, shape: Optional[Tuple[int, ...]] = None) -> memoryview:
+        offset, typecode, n = self.meta["sections"][name]
+        itemsize = array(typecode).itemsize
+        raw = memoryview(self._mm)[offset:offset + n * itemsize]
+        view = raw.cast(typecode, shape) if shape else raw.cast(typecode)
+        self._views += [raw, view]
+        return view
+
+    def grid_view(self, name: str) -> memoryview:
+        """Section grid (grid / cell_costs / visit_counts) sebagai view [rows][cols]."""
+        fields = self.meta["fields"]
+        return self.view(name, (fields["rows"], fields["cols"]))
+
+    def load_array(self, name: str) -> array:
+        """Salinan section sebagai array (satu memcpy dari mmap)."""
+        offset, typecode, n = self.meta["sections"][name]
+        data = array(typecode)
+        raw = memoryview(self._mm)[offset:offset + n * data.itemsize]
+        data.frombytes(raw)
+        raw.release()
+        if self.meta["byteorder"] != sys.byteorder:
+            data.byteswap()
+        return data
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self) -> "CheckpointFile":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_checkpoint(path: str) -> Tuple[SimulationState, dict]:
+    """SimulationState dari checkpoint (siap step_frame lagi) + extra pemanggil."""
+    with CheckpointFile(path) as ck:
+        meta = ck.meta
+        fields = meta["fields"]
+        rows, cols = fields["rows"], fields["cols"]
+
+        # dibuat 1 x 1 dulu: map default ukuran penuh langsung ditimpa
+        sim = SimulationState(rows=1, cols=1, seed=fields["seed"])
+        for name in _FIELDS:
+            # checkpoint lama belum punya field baru: pakai default
+            if name in fields:
+                setattr(sim, name, fields[name])
+        sim.start = tuple(sim.start)
+        sim.goal = tuple(sim.goal)
+
+        sim.grid = GridArray(rows, cols, "b", ck.load_array("grid"))
+        sim.cell_costs = GridArray(rows, cols, "b", ck.load_array("cell_costs"))
+        sim.visit_counts = GridArray(rows, cols, "q", ck.load_array("visit_counts"))
+        sim.neighbors = NeighborTable(rows, cols)
+        # tabel turunan map (sama dengan reset_simulation, tanpa reset statistik)
+        sim.rebuild_neighbors()
+        sim.rebuild_cost_table()
+        sim.goal_cell = sim.goal[0] * cols + sim.goal[1]
+        sim.goal_dist = None
+        sim.touch_map()
+
+        sim.best_path = ck.load_array("best_path") if "best_path" in ck else None
+        sim.length_dist = _dist_from_state(meta["length_dist"])
+        sim.cost_dist = _dist_from_state(meta["cost_dist"])
+        sim.path_trie = _load_trie(ck, meta["path_trie"]) if meta["path_trie"] else None
+
+        agent_paths = ck.load_array("agent_paths")
+        sim.agents = []
+        pos = 0
+        for state in meta["agents"]:
+            n = state["path_len"]
+            path = agent_paths[pos:pos + n]
+            pos += n
+            visited = bytearray(rows * cols)
+            for i in path:
+                visited[i] = 1
+            rng = RandomStream()
+            key, counter, buf, buf_pos = state["rng"]
+            rng.setstate((bytes.fromhex(key), counter, buf, buf_pos))
+            sim.agents.append(Agent(
+                path=path, visited=visited, active=state["active"], steps=state["steps"],
+                cell=state["cell"], cost=state["cost"], episode=state["episode"],
+                rng=rng, path_len=n, log_weight=state["log_weight"],
+            ))
+        return sim, meta["extra"]
+
+
+def _load_trie(ck: CheckpointFile, state: dict) -> PathTrie:
+    trie = PathTrie(state["max_nodes"], state["keep_cheapest"])
+    for name in _TRIE_FIELDS:
+        setattr(trie, name, state[name])
+    for name in _TRIE_ARRAYS:
+        setattr(trie, name, ck.load_array("trie_" + name))
+    trie.free = ck.load_array("trie_free").tolist()
+    # dict edge dibangun ulang dari parent/cell node yang dipakai
+    free = set(trie.free)
+    parent, cell = trie.parent, trie.cell
+    trie.edges = {parent[node] << 32 | cell[node]: node
+                  for node in range(1, len(parent)) if node not in free}
+    return trie
@@ -12,10 +12,92 @@ GRID_ORIGIN_X = MARGIN
 GRID_ORIGIN_Y = MARGIN
 SIDEBAR_WIDTH = 320
 
+# Viewport: area grid di layar (px). Map yang lebih besar digambar lewat
+# zoom/pan; batas ini sama dengan map 15 x 23 sel pada CELL_SIZE.
+VIEWPORT_MAX_W = 1150
+VIEWPORT_MAX_H = 750
+# level zoom (piksel per sel). < 1 = beberapa sel digabung jadi satu piksel
+ZOOM_LEVELS = (1 / 16, 1 / 8, 1 / 4, 1 / 2, 1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 50, 64, 100)
+# detail yang hanya digambar kalau sel cukup besar
+GRID_LINE_MIN_PX = 8
+COST_DOT_MIN_PX = 20
+# START/GOAL tetap terlihat saat zoom out
+MARKER_MIN_PX = 3
+# heatmap ditulis & di-scale ulang per tile persegi segini (sel/blok terlihat),
+# hanya tile yang warnanya berubah sejak snapshot sebelumnya
+HEAT_TILE = 32
+
+# batas ukuran map yang bisa diatur dari keyboard
+MIN_GRID_SIZE = 5
+MAX_GRID_ROWS = 2000
+MAX_GRID_COLS = 2000
+
 FPS = 30
 DEFAULT_STEPS_PER_FRAME = 1
+MAX_STEPS_PER_FRAME = 20
+
+# mode "budget": step_frame jalan sampai budget waktu per frame habis
+FRAME_BUDGET_MS = 25.0
+MIN_FRAME_BUDGET_MS = 2.0
+FRAME_BUDGET_STEP_MS = 5.0
+# sisa waktu frame yang tidak dipakai simulasi (jaga FPS saat render lambat)
+FRAME_SLACK_MS = 2.0
+# jendela rata-rata kunjungan/detik di sidebar
+STEP_RATE_WINDOW_S = 0.5
+
+# thread worker: laju publish snapshot ke UI, dan potongan waktu step
+# (antrian perintah dicek di antara potongan)
+SNAPSHOT_HZ = FPS
+WORKER_SLICE_MS = 4.0
 MAX_STEPS_DEFAULT = 200
 MAX_SIMULATIONS_DEFAULT = 1000
+# policy walk "biased": bobot tetangga = exp(-BIAS_COST * (cost - 1)) dikali
+# exp(+BIAS_GOAL) kalau mendekati GOAL atau exp(-BIAS_GOAL) kalau menjauh
+WALK_POLICIES = ("uniform", "biased")
+BIAS_COST_DEFAULT = 1.0
+BIAS_GOAL_DEFAULT = 0.5
+# oracle (solver eksak) dihitung otomatis di window hanya sampai ukuran ini
+# (~0.13 s di map terbuka 200 x 200); map lebih besar: gap tidak ditampilkan
+# (headless selalu menghitung)
+ORACLE_MAX_CELLS = 40_000
+# window: oracle baru dihitung setelah map tidak berubah selama ini (detik),
+# jadi menggambar rintangan tidak tersendat A* di thread worker
+ORACLE_DEBOUNCE_S = 0.5
+# aturan berhenti dini (alternatif max simulations). 0 = mati.
+#   CI    : half-width interval kepercayaan peluang sukses <= nilai ini
+#   sabar : best cost tidak membaik selama N simulasi
+STOP_CI_Z = 1.96
+STOP_MIN_SIMULATIONS = 100
+# nilai yang dipakai tombol T di window
+STOP_CI_HALFWIDTH_DEFAULT = 0.01
+STOP_PATIENCE_DEFAULT = 2000
+# distribusi panjang & cost jalur sukses (streamstats.py): jumlah bin
+# histogram, dan akurasi relatif + batas bucket sketch kuantil
+HIST_BINS = 32
+SKETCH_RELATIVE_ACCURACY = 0.01
+SKETCH_MAX_BUCKETS = 1024
+# walk log (walklog.py): ukuran chunk sebelum dikompres & level gzip
+WALKLOG_CHUNK_BYTES = 1 << 20
+WALKLOG_LEVEL = 1
+# trie jalur sukses unik (pathtrie.py): batas node (~144 byte/node) sebelum
+# jalur paling jarang dibuang; sekian jalur termurah tidak pernah dibuang
+PATH_TRIE_MAX_NODES = 200_000
+PATH_TRIE_KEEP_CHEAPEST = 10
+# path ringkas: index flat sel (r * cols + c), array('i')
+PATH_TYPECODE = "i"
+# profiler frame (profiler.py): jendela rolling per fase (frame), interval
+# refresh teks overlay, dan default jumlah frame + file trace Chrome
+PROFILE_WINDOW = 120
+PROFILE_OVERLAY_REFRESH_S = 0.5
+PROFILE_TRACE_FRAMES = 300
+PROFILE_TRACE_PATH = "profile_trace.json"
+# window lain ukuran dari canvas: canvas di-scale per tile persegi segini (px
+# logis), hanya tile yang berubah; semua tile = tampilan penuh
+PRESENT_TILE = 128
+# checkpoint headless (checkpoint.py): interval tulis default (detik)
+CHECKPOINT_INTERVAL_S = 60.0
+# pruning: batas sel yang ditelusuri untuk cek walk terkurung jalurnya sendiri
+PRUNE_SEARCH_LIMIT = 64
 
 INITIAL_AGENT_COUNT = 3
 MAX_AGENT_COUNT = 20
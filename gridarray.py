@@ -0,0 +1,85 @@
+# gridarray.py
+#
+# Grid 2D (rows x cols) di atas satu array flat. Untuk map besar (1000x1000+)
+# list of list Python terlalu boros: tiap sel = pointer 8 byte + objek int.
+# Di sini tiap sel 1 byte (grid, cost) atau 8 byte (visit count).
+
+from array import array
+from typing import Iterable, Iterator, List
+
+
+class GridArray:
+    """Grid di atas array flat, index flat r * cols + c.
+
+    grid[r][c] tetap bisa dipakai seperti list of list: grid[r] adalah
+    memoryview baris ke array yang sama (baca/tulis langsung ke data).
+    Hot path dan renderer sebaiknya memakai .data langsung.
+
+    Catatan: grid[r][:] juga memoryview (bukan salinan); salin lewat copy()
+    atau tolist().
+    """
+
+    __slots__ = ("rows", "cols", "typecode", "data", "_rows")
+
+    def __init__(self, rows: int, cols: int, typecode: str = "b", data: array = None):
+        self.rows = rows
+        self.cols = cols
+        self.typecode = typecode
+        if data is None:
+            data = array(typecode, bytes(rows * cols * array(typecode).itemsize))
+        elif len(data) != rows * cols:
+            raise ValueError(f"data {len(data)} sel, harusnya {rows * cols}")
+        self.data = data
+        self._make_rows()
+
+    def _make_rows(self):
+        view = memoryview(self.data)
+        cols = self.cols
+        self._rows = [view[r * cols:(r + 1) * cols] for r in range(self.rows)]
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Iterable[int]], typecode: str = "b") -> "GridArray":
+        rows = [list(row) for row in rows]
+        n_cols = len(rows[0]) if rows else 0
+        data = array(typecode)
+        for row in rows:
+            if len(row) != n_cols:
+                raise ValueError("panjang baris tidak sama")
+            data.extend(row)
+        return cls(len(rows), n_cols, typecode, data)
+
+    @classmethod
+    def from_flat(cls, rows: int, cols: int, values, typecode: str = "b") -> "GridArray":
+        """values: iterable nilai flat, atau bytes mentah (mis. ndarray.tobytes())."""
+        return cls(rows, cols, typecode, array(typecode, values))
+
+    def __getitem__(self, r: int) -> memoryview:
+        return self._rows[r]
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __iter__(self) -> Iterator[memoryview]:
+        return iter(self._rows)
+
+    def __getstate__(self):
+        # memoryview tidak bisa di-pickle; cukup kirim array-nya
+        return self.rows, self.cols, self.typecode, self.data
+
+    def __setstate__(self, state):
+        self.rows, self.cols, self.typecode, self.data = state
+        self._make_rows()
+
+    def copy(self) -> "GridArray":
+        return GridArray(self.rows, self.cols, self.typecode, array(self.typecode, self.data))
+
+    def copy_into(self, other: "GridArray"):
+        """Salin isi other ke self (ukuran sama) tanpa alokasi baru."""
+        self.data[:] = other.data
+
+    def clear(self):
+        """Set semua sel ke 0 di tempat."""
+        memoryview(self.data).cast("B")[:] = bytes(len(self.data) * self.data.itemsize)
+
+    def tolist(self) -> List[List[int]]:
+        return [row.tolist() for row in self._rows]
@@ -0,0 +1,355 @@
+# headless.py
+#
+# Jalankan simulasi Monte Carlo tanpa pygame (tanpa window, font, surface).
+#
+#   python -m simulation run --map maps/contoh.txt --sims 1000000
+#   python headless.py run --rows 10 --cols 10 --sims 5000
+
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional
+
+from config import (
+    INITIAL_AGENT_COUNT, MAX_STEPS_DEFAULT, MAX_SIMULATIONS_DEFAULT,
+    DEFAULT_GRID_ROWS, DEFAULT_GRID_COLS,
+    WALK_POLICIES, BIAS_COST_DEFAULT, BIAS_GOAL_DEFAULT, STOP_CI_Z,
+    PATH_TRIE_MAX_NODES, CHECKPOINT_INTERVAL_S,
+)
+from simulation import (
+    SimulationState, decode_path, importance_estimates, optimality_gap,
+    success_rate_ci, describe_stop,
+)
+from streamstats import Distribution
+from mapfile import load_map
+from rng import new_seed
+from walklog import WalkWriter
+from checkpoint import save_checkpoint, load_checkpoint
+
+# berapa kali step_agent per agen dalam satu panggilan step_frame
+HEADLESS_STEPS_PER_FRAME = 1000
+
+
+def run_headless(sim: SimulationState, steps_per_frame: int = HEADLESS_STEPS_PER_FRAME,
+                 checkpoint: Optional[str] = None,
+                 checkpoint_every: float = CHECKPOINT_INTERVAL_S,
+                 elapsed_before: float = 0.0, extra: Optional[dict] = None) -> float:
+    """Jalankan sim sampai selesai dalam loop ketat. Return waktu (detik).
+
+    checkpoint: tulis checkpoint ke file ini tiap checkpoint_every detik dan
+    saat selesai. elapsed_before = waktu run sebelum resume (ikut disimpan).
+    extra: opsi pemanggil yang ikut disimpan (mis. top_paths untuk resume).
+    """
+    extra = dict(extra or {})
+    sim.steps_per_frame = steps_per_frame
+    sim.paused = False
+
+    t0 = time.perf_counter()
+    next_save = t0 + checkpoint_every
+    while not sim.simulation_done:
+        sim.step_frame()
+        if checkpoint is not None and time.perf_counter() >= next_save:
+            extra["elapsed"] = elapsed_before + time.perf_counter() - t0
+            save_checkpoint(sim, checkpoint, extra)
+            next_save = time.perf_counter() + checkpoint_every
+    elapsed = time.perf_counter() - t0
+    if checkpoint is not None:
+        extra["elapsed"] = elapsed_before + elapsed
+        save_checkpoint(sim, checkpoint, extra)
+    return elapsed
+
+
+def format_path(path) -> str:
+    return " -> ".join(f"({r},{c})" for r, c in path)
+
+
+def format_optimal(sim: SimulationState) -> str:
+    sim.update_optimal(force=True)
+    if sim.optimal_cost is None:
+        return "Optimal cost : tidak ada jalur START -> GOAL"
+    line = f"Optimal cost : {sim.optimal_cost:.2f} (length {sim.optimal_length})"
+    gap = optimality_gap(sim)
+    if gap is not None:
+        line += f", gap {gap * 100:.2f}%"
+    if sim.optimal_length - 1 > sim.max_steps_per_walk:
+        line += " [lebih panjang dari max steps]"
+    return line
+
+
+def format_spread(label: str, dist: Distribution, fmt: str) -> str:
+    """Simpangan baku + p50/p90/p99 (sketch, error relatif <= 1%)."""
+    q50, q90, q99 = (fmt.format(q) for q in dist.quantiles())
+    return f"{label} sd/p50/p90/p99: {dist.moments.std:.2f}/{q50}/{q90}/{q99}"
+
+
+def format_histogram(label: str, dist: Distribution, width: int = 40) -> List[str]:
+    """Histogram teks; bin kosong di kedua ujung tidak dicetak."""
+    hist = dist.hist
+    used = [i for i, n in enumerate(hist.counts) if n]
+    if not used:
+        return []
+    peak = max(hist.counts)
+    lines = [f"Histogram {label}:"]
+    for i in range(used[0], used[-1] + 1):
+        a, b = hist.edges(i)
+        n = hist.counts[i]
+        bar = "#" * round(n / peak * width)
+        lines.append(f"  [{a:>8.6g}, {b:>8.6g}) {n:>9} {bar}")
+    return lines
+
+
+def format_paths(sim: SimulationState, k: int) -> List[str]:
+    """Ringkasan trie jalur unik + top-k paling sering dan termurah."""
+    trie = sim.path_trie
+    lines = [
+        f"Jalur unik   : {trie.distinct} dari {trie.total_samples} sukses "
+        f"(node {trie.nodes}, ~{trie.approx_bytes / 2**20:.1f} MiB)",
+    ]
+    if trie.evicted_paths:
+        lines.append(f"Dibuang      : {trie.evicted_paths} jalur jarang "
+                     f"({trie.evicted_samples} sukses), batas {trie.max_nodes} node")
+    if k <= 0:
+        return lines
+    for title, top in (("Top sering", trie.top_frequent(k)), ("Top murah", trie.top_cheapest(k))):
+        lines.append(f"{title}:")
+        for i, (count, cost, cells) in enumerate(top, 1):
+            share = count / trie.total_samples * 100
+            lines.append(f"  {i}. {count}x ({share:.2f}%) cost {cost:.2f} len {len(cells)}: "
+                         f"{format_path(decode_path(cells, sim.cols))}")
+    return lines
+
+
+def format_stats(sim: SimulationState, elapsed: float) -> List[str]:
+    success_rate = (sim.success_count / sim.sim_count * 100) if sim.sim_count > 0 else 0.0
+
+    lines = [
+        f"Map          : {sim.rows} x {sim.cols}, START {sim.start}, GOAL {sim.goal}",
+        f"Agen         : {sim.agent_count}",
+        f"Max steps    : {sim.max_steps_per_walk}",
+        f"Simulasi     : {sim.sim_count}/{sim.max_simulations}",
+        f"Sukses       : {sim.success_count} ({success_rate:.2f}%)",
+    ]
+    if sim.stop_ci_halfwidth > 0 or sim.stop_patience > 0:
+        lines.append(f"Berhenti     : {describe_stop(sim)}")
+        if sim.stop_ci_halfwidth > 0:
+            _, half = success_rate_ci(sim, sim.sim_count)
+            lines.append(f"CI sukses    : ±{half * 100:.3f}% ({STOP_CI_Z:g} sigma)")
+    if sim.prune_walks:
+        lines.append(f"Dipangkas    : {sim.pruned_count} walk (pasti gagal)")
+    if sim.walk_policy != "uniform":
+        rate, mean_cost, ess = importance_estimates(sim)
+        mean_str = f"{mean_cost:.2f}" if mean_cost is not None else "-"
+        lines += [
+            f"Policy       : {sim.walk_policy} (cost {sim.bias_cost:g}, goal {sim.bias_goal:g})",
+            f"Est. uniform : sukses {rate * 100:.2f}%, avg cost {mean_str} (ESS {ess:.0f})",
+        ]
+
+    if sim.success_count > 0:
+        avg_len = sim.total_success_length / sim.success_count
+        avg_cost = sim.total_success_cost / sim.success_count
+        lines += [
+            f"Best length  : {len(sim.best_path)}",
+            f"Best cost    : {sim.best_path_cost:.2f}",
+            f"Best path    : {format_path(decode_path(sim.best_path, sim.cols))}",
+            f"Len min/avg/max : {sim.min_success_length}/{avg_len:.2f}/{sim.max_success_length}",
+            f"Cost min/avg/max: {sim.min_success_cost:.2f}/{avg_cost:.2f}/{sim.max_success_cost:.2f}",
+            format_spread("Len ", sim.length_dist, "{:.0f}"),
+            format_spread("Cost", sim.cost_dist, "{:.2f}"),
+        ]
+    else:
+        lines.append("Belum ada jalur sukses.")
+    lines.append(format_optimal(sim))
+
+    sims_per_sec = sim.sim_count / elapsed if elapsed > 0 else float("inf")
+    # kunjungan heatmap: langkah agen + sel START tiap walk baru
+    visits_per_sec = sim.visit_total / elapsed if elapsed > 0 else float("inf")
+    lines.append(
+        f"Waktu        : {elapsed:.3f} s ({sims_per_sec:,.0f} sims/s, {visits_per_sec:,.0f} visits/s)"
+    )
+    return lines
+
+
+def run_vector(sim: SimulationState, batch_size: Optional[int] = None,
+               seed: Optional[int] = None) -> float:
+    """Jalankan sim dengan VectorEngine (numpy lockstep). Return waktu (detik)."""
+    from vector_engine import VectorEngine
+
+    t0 = time.perf_counter()
+    engine = VectorEngine(sim, batch_size=batch_size, seed=seed)
+    engine.run()
+    return time.perf_counter() - t0
+
+
+def build_sim(args) -> SimulationState:
+    if args.map:
+        sim = load_map(args.map)
+    else:
+        sim = SimulationState(rows=args.rows, cols=args.cols)
+
+    sim.agent_count = args.agents
+    sim.max_steps_per_walk = args.max_steps
+    sim.max_simulations = args.sims
+    sim.prune_walks = args.prune or args.prune_pockets
+    sim.prune_pockets = args.prune_pockets
+    sim.walk_policy = args.policy
+    sim.bias_cost = args.bias_cost
+    sim.bias_goal = args.bias_goal
+    sim.stop_ci_halfwidth = args.stop_ci
+    sim.stop_patience = args.stop_patience
+    sim.track_paths = args.top_paths > 0
+    sim.path_trie_max_nodes = args.paths_max_nodes
+    sim.reset_simulation()
+    return sim
+
+
+def cmd_run(args) -> int:
+    if args.engine == "vector" and (args.prune or args.prune_pockets
+                                    or args.policy != "uniform"):
+        print("--prune dan --policy hanya untuk --engine agent", file=sys.stderr)
+        return 2
+    if (args.engine == "vector" or args.workers > 1) and (args.stop_ci > 0
+                                                          or args.stop_patience > 0):
+        # tiap shard hanya melihat sebagian data: aturan per shard tidak sama
+        # artinya dengan aturan pada hasil gabungan
+        print("--stop-ci dan --stop-patience hanya untuk --engine agent, 1 worker",
+              file=sys.stderr)
+        return 2
+    if args.engine == "vector" and (args.walk_log or args.top_paths > 0):
+        print("--walk-log dan --top-paths hanya untuk --engine agent", file=sys.stderr)
+        return 2
+    if (args.checkpoint or args.resume) and (args.engine == "vector" or args.workers > 1
+                                             or args.walk_log):
+        print("--checkpoint / --resume hanya untuk --engine agent, 1 worker, tanpa --walk-log",
+              file=sys.stderr)
+        return 2
+
+    if args.resume:
+        # map, setting, seed dan progres dari checkpoint; opsi map/setting diabaikan
+        sim, extra = load_checkpoint(args.resume)
+        seed = sim.seed
+        # K top-paths dari run asal, kecuali diminta lain saat resume
+        if args.top_paths <= 0:
+            args.top_paths = extra.get("top_paths", 0)
+        elapsed = run_headless(sim, args.batch, args.checkpoint or args.resume,
+                               args.checkpoint_every, extra.get("elapsed", 0.0),
+                               {"top_paths": args.top_paths})
+        elapsed += extra.get("elapsed", 0.0)
+        print(f"Resume       : {args.resume}")
+        print_report(sim, elapsed, seed, args)
+        return 0
+
+    sim = build_sim(args)
+    seed = args.seed if args.seed is not None else new_seed()
+
+    if args.checkpoint:
+        sim.reseed(seed)
+        elapsed = run_headless(sim, args.batch, args.checkpoint, args.checkpoint_every,
+                               extra={"top_paths": args.top_paths})
+    elif args.workers > 1:
+        from parallel import run_parallel
+
+        t0 = time.perf_counter()
+        result = run_parallel(sim, args.workers, seed, engine=args.engine,
+                              walk_log=args.walk_log, walk_log_failed=args.walk_log_failed)
+        elapsed = time.perf_counter() - t0
+        result.apply_to(sim)
+    elif args.engine == "vector":
+        elapsed = run_vector(sim, args.walkers, seed=seed)
+    elif args.walk_log:
+        sim.reseed(seed)
+        with WalkWriter(args.walk_log, sim.rows, sim.cols, args.walk_log_failed) as writer:
+            sim.walk_log = writer
+            elapsed = run_headless(sim, args.batch)
+        sim.walk_log = None
+    else:
+        sim.reseed(seed)
+        elapsed = run_headless(sim, args.batch)
+
+    print_report(sim, elapsed, seed, args)
+    return 0
+
+
+def print_report(sim: SimulationState, elapsed: float, seed: int, args):
+    print("\n".join(format_stats(sim, elapsed)))
+    if args.hist:
+        print("\n".join(format_histogram("panjang", sim.length_dist)
+                        + format_histogram("cost", sim.cost_dist)))
+    if sim.path_trie is not None:
+        print("\n".join(format_paths(sim, args.top_paths)))
+    if args.walk_log:
+        walks = sim.sim_count if args.walk_log_failed else sim.success_count
+        size = os.path.getsize(args.walk_log)
+        print(f"Walk log     : {walks} walk -> {args.walk_log} "
+              f"({size / 1024:,.1f} KiB, {size / max(1, walks):.1f} B/walk)")
+    print(f"Seed         : {seed} (workers {args.workers})")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m simulation",
+        description="Monte Carlo pathfinding tanpa tampilan (headless).",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="jalankan simulasi sampai selesai dan cetak statistik")
+    run.add_argument("--map", help="file map teks (. kosong, # rintangan, S start, G goal, 1-9 cost)")
+    run.add_argument("--rows", type=int, default=DEFAULT_GRID_ROWS, help="jumlah baris (tanpa --map)")
+    run.add_argument("--cols", type=int, default=DEFAULT_GRID_COLS, help="jumlah kolom (tanpa --map)")
+    run.add_argument("--sims", type=int, default=MAX_SIMULATIONS_DEFAULT, help="max simulations")
+    run.add_argument("--agents", type=int, default=INITIAL_AGENT_COUNT, help="jumlah agen paralel")
+    run.add_argument("--max-steps", type=int, default=MAX_STEPS_DEFAULT, help="max steps per episode")
+    run.add_argument("--batch", type=int, default=HEADLESS_STEPS_PER_FRAME,
+                     help="steps per frame untuk loop headless")
+    run.add_argument("--engine", choices=("agent", "vector"), default="agent",
+                     help="agent = SimulationState.step_agent, vector = numpy lockstep "
+                          "(~30-40x lebih cepat dari agent, lihat README)")
+    run.add_argument("--walkers", type=int, default=None,
+                     help="jumlah walker per batch untuk --engine vector (default: otomatis)")
+    run.add_argument("--workers", type=int, default=1,
+                     help="jumlah proses; max simulations dibagi rata ke tiap shard")
+    run.add_argument("--prune", action="store_true",
+                     help="hentikan walk yang GOAL-nya di luar sisa step (statistik sukses tetap sama)")
+    run.add_argument("--prune-pockets", action="store_true",
+                     help="dengan --prune: hentikan juga walk yang menutup GOAL dengan "
+                          "jalurnya sendiri (hemat step, bukan waktu)")
+    run.add_argument("--policy", choices=WALK_POLICIES, default="uniform",
+                     help="biased = condong ke cost rendah & arah GOAL (dengan bobot importance)")
+    run.add_argument("--bias-cost", type=float, default=BIAS_COST_DEFAULT,
+                     help="kekuatan bias cost untuk --policy biased")
+    run.add_argument("--bias-goal", type=float, default=BIAS_GOAL_DEFAULT,
+                     help="kekuatan bias arah GOAL untuk --policy biased")
+    run.add_argument("--stop-ci", type=float, default=0.0,
+                     help="berhenti saat half-width CI peluang sukses <= nilai ini (mis. 0.005)")
+    run.add_argument("--stop-patience", type=int, default=0,
+                     help="berhenti saat best cost tidak membaik selama N simulasi")
+    run.add_argument("--hist", action="store_true",
+                     help="cetak histogram panjang & cost jalur sukses")
+    run.add_argument("--walk-log", default=None, metavar="FILE",
+                     help="tulis tiap walk sukses ke FILE (biner gzip, baca dengan walklog.read_walks)")
+    run.add_argument("--walk-log-failed", action="store_true",
+                     help="--walk-log juga menulis walk gagal")
+    run.add_argument("--top-paths", type=int, default=0, metavar="K",
+                     help="hitung jalur sukses unik; cetak K paling sering & K termurah")
+    run.add_argument("--paths-max-nodes", type=int, default=PATH_TRIE_MAX_NODES,
+                     help="batas node trie --top-paths (~144 byte/node); jalur jarang dibuang")
+    run.add_argument("--checkpoint", default=None, metavar="FILE",
+                     help="simpan state ke FILE tiap --checkpoint-every detik dan saat selesai")
+    run.add_argument("--checkpoint-every", type=float, default=CHECKPOINT_INTERVAL_S, metavar="S",
+                     help="interval checkpoint (detik)")
+    run.add_argument("--resume", default=None, metavar="FILE",
+                     help="lanjutkan run dari checkpoint (map & setting dari FILE)")
+    run.add_argument("--seed", type=int, default=None,
+                     help="seed run (default: acak, dicetak di akhir supaya bisa diulang)")
+    run.set_defaults(func=cmd_run)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
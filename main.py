@@ -1,144 +1,285 @@
 # main.py
 
+import argparse
 import sys
+import time
 import pygame
 
 from config import (
-    GRID_ORIGIN_X, GRID_ORIGIN_Y, MARGIN,
+    MARGIN,
     SIDEBAR_WIDTH, FPS, MAX_AGENT_COUNT,
-    CELL_SIZE
+    CELL_SIZE, MAX_STEPS_PER_FRAME,
+    MIN_GRID_SIZE, MAX_GRID_ROWS, MAX_GRID_COLS,
+    DEFAULT_GRID_ROWS, DEFAULT_GRID_COLS,
+    MIN_FRAME_BUDGET_MS, FRAME_BUDGET_STEP_MS,
+    STOP_CI_HALFWIDTH_DEFAULT, STOP_PATIENCE_DEFAULT,
+    PROFILE_TRACE_FRAMES, PROFILE_TRACE_PATH,
 )
 from simulation import SimulationState
+from mapfile import load_map
+from pathtrie import PathTrie
+from profiler import FrameProfiler
+from present import Presenter
+from worker import SimulationWorker
 import ui
 
 
 def compute_logical_size(sim: SimulationState, font, font_title):
-    grid_w = sim.cols * CELL_SIZE
-    grid_h = sim.rows * CELL_SIZE
+    # area grid = viewport (dibatasi), bukan seluruh map
+    grid_w, grid_h = ui.grid_view_size(sim, CELL_SIZE)
     panel_h = ui.get_sidebar_height(sim, font, font_title)
     logical_w = grid_w + 2 * MARGIN + SIDEBAR_WIDTH
     logical_h = max(grid_h, panel_h) + 2 * MARGIN
     return logical_w, logical_h
 
 
-def main():
+def apply_key(sim: SimulationState, key: int):
+    """Tombol yang mengubah simulasi; dijalankan di thread worker."""
+    if key == pygame.K_SPACE:
+        if not sim.simulation_done:
+            sim.paused = not sim.paused
+
+    elif key == pygame.K_r:
+        # reset manual = seed baru; reset karena ganti setting memakai seed yang sama
+        sim.reseed()
+
+    elif key == pygame.K_z:
+        if sim.agent_count > 1:
+            sim.agent_count -= 1
+            sim.reset_simulation()
+    elif key == pygame.K_x:
+        if sim.agent_count < MAX_AGENT_COUNT:
+            sim.agent_count += 1
+            sim.reset_simulation()
+
+    elif key == pygame.K_c:
+        if sim.step_mode == "budget":
+            sim.frame_budget_ms = max(MIN_FRAME_BUDGET_MS,
+                                      sim.frame_budget_ms - FRAME_BUDGET_STEP_MS)
+        elif sim.steps_per_frame > 1:
+            sim.steps_per_frame -= 1
+    elif key == pygame.K_v:
+        if sim.step_mode == "budget":
+            sim.frame_budget_ms = min(1000.0 / FPS,
+                                      sim.frame_budget_ms + FRAME_BUDGET_STEP_MS)
+        elif sim.steps_per_frame < MAX_STEPS_PER_FRAME:
+            sim.steps_per_frame += 1
+
+    elif key == pygame.K_b:
+        sim.step_mode = "fixed" if sim.step_mode == "budget" else "budget"
+
+    elif key == pygame.K_w:
+        # ganti policy = statistik baru
+        sim.walk_policy = "biased" if sim.walk_policy == "uniform" else "uniform"
+        sim.reset_simulation()
+
+    elif key == pygame.K_p:
+        # statistik sukses tidak berubah, jadi tidak perlu reset
+        sim.prune_walks = not sim.prune_walks
+
+    elif key == pygame.K_u:
+        # hitung jalur unik mulai sekarang (atau berhenti menghitung)
+        sim.track_paths = not sim.track_paths
+        sim.path_trie = PathTrie(sim.path_trie_max_nodes) if sim.track_paths else None
+
+    elif key == pygame.K_t:
+        # aturan berhenti dini on/off; yang sudah terpenuhi tetap berlaku
+        if sim.stop_ci_halfwidth > 0 or sim.stop_patience > 0:
+            sim.stop_ci_halfwidth = 0.0
+            sim.stop_patience = 0
+        else:
+            sim.stop_ci_halfwidth = STOP_CI_HALFWIDTH_DEFAULT
+            sim.stop_patience = STOP_PATIENCE_DEFAULT
+
+    elif key == pygame.K_LEFTBRACKET:
+        if sim.max_simulations > sim.agent_count:
+            sim.max_simulations = max(sim.max_simulations - 50, sim.agent_count)
+
+    elif key == pygame.K_RIGHTBRACKET:
+        sim.max_simulations += 50
+
+    elif key == pygame.K_COMMA:
+        if sim.max_steps_per_walk > 10:
+            sim.max_steps_per_walk -= 10
+
+    elif key == pygame.K_PERIOD:
+        sim.max_steps_per_walk += 10
+
+    elif key == pygame.K_1:
+        sim.cursor_mode = "obstacle"
+    elif key == pygame.K_2:
+        sim.cursor_mode = "cost"
+
+    # ========= RESIZE MAP VIA KEYBOARD =========
+    elif key == pygame.K_n:  # rows -
+        new_rows = max(MIN_GRID_SIZE, sim.rows - 1)
+        if new_rows != sim.rows:
+            sim.resize_grid(new_rows, sim.cols)
+
+    elif key == pygame.K_m:  # rows +
+        new_rows = min(MAX_GRID_ROWS, sim.rows + 1)
+        if new_rows != sim.rows:
+            sim.resize_grid(new_rows, sim.cols)
+
+    elif key == pygame.K_k:  # cols -
+        new_cols = max(MIN_GRID_SIZE, sim.cols - 1)
+        if new_cols != sim.cols:
+            sim.resize_grid(sim.rows, new_cols)
+
+    elif key == pygame.K_l:  # cols +
+        new_cols = min(MAX_GRID_COLS, sim.cols + 1)
+        if new_cols != sim.cols:
+            sim.resize_grid(sim.rows, new_cols)
+
+    # ==========================================
+
+
+def adjust_cost_value(sim: SimulationState, delta: int):
+    sim.current_cost_value = max(0, min(9, sim.current_cost_value + delta))
+
+
+def click_cell(sim: SimulationState, r: int, c: int, button: int):
+    # snapshot yang diklik bisa lebih tua dari map (resize belum terlihat)
+    if 0 <= r < sim.rows and 0 <= c < sim.cols:
+        sim.handle_grid_click(r, c, button)
+
+
+PAN_KEYS = {
+    pygame.K_UP: (-1, 0),
+    pygame.K_DOWN: (1, 0),
+    pygame.K_LEFT: (0, -1),
+    pygame.K_RIGHT: (0, 1),
+}
+
+
+def to_logical(screen, pos, logical_w: int, logical_h: int):
+    """Posisi mouse di window -> koordinat canvas logis."""
+    display_w, display_h = screen.get_size()
+    scale_x = logical_w / display_w
+    scale_y = logical_h / display_h
+    return int(pos[0] * scale_x), int(pos[1] * scale_y)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Monte Carlo pathfinding (window pygame).")
+    parser.add_argument("--map", help="file map teks (. kosong, # rintangan, S start, G goal, 1-9 cost)")
+    parser.add_argument("--rows", type=int, default=DEFAULT_GRID_ROWS, help="jumlah baris (tanpa --map)")
+    parser.add_argument("--cols", type=int, default=DEFAULT_GRID_COLS, help="jumlah kolom (tanpa --map)")
+    parser.add_argument("--profile", action="store_true",
+                        help="mulai dengan overlay profiler (tombol O)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="rekam trace Chrome sejak frame pertama ke FILE")
+    parser.add_argument("--trace-frames", type=int, default=PROFILE_TRACE_FRAMES,
+                        help="jumlah frame per trace (--trace dan tombol J)")
+    return parser
+
+
+def build_sim(parser: argparse.ArgumentParser, args) -> SimulationState:
+    """Map awal dari --map atau --rows/--cols (batas sama dengan tombol resize)."""
+    if args.map:
+        try:
+            sim = load_map(args.map)
+        except (OSError, ValueError) as e:
+            parser.error(f"--map {args.map}: {e}")
+    else:
+        sim = None
+    rows, cols = (sim.rows, sim.cols) if sim else (args.rows, args.cols)
+    if not (MIN_GRID_SIZE <= rows <= MAX_GRID_ROWS and MIN_GRID_SIZE <= cols <= MAX_GRID_COLS):
+        parser.error(f"ukuran map {rows} x {cols} di luar "
+                     f"{MIN_GRID_SIZE}..{MAX_GRID_ROWS} x {MIN_GRID_SIZE}..{MAX_GRID_COLS}")
+    return sim or SimulationState(rows=rows, cols=cols)
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    sim = build_sim(parser, args)
     pygame.init()
 
     font = pygame.font.SysFont(None, 20)
     font_title = pygame.font.SysFont(None, 24, bold=True)
-    
-    sim = SimulationState()
+
+    # fase loop ini + step_frame di worker; mati = hanya cek flag
+    prof = FrameProfiler()
+    if args.profile:
+        prof.toggle_overlay()
+    if args.trace:
+        prof.start_trace(args.trace, args.trace_frames)
+    # simulasi jalan di thread worker; loop ini hanya membaca snapshot
+    worker = SimulationWorker(sim, profiler=prof)
 
     LOGICAL_WIDTH, LOGICAL_HEIGHT = compute_logical_size(sim, font, font_title)
     windowed_size = (LOGICAL_WIDTH, LOGICAL_HEIGHT)
+    shown_size = (sim.rows, sim.cols)
 
     screen = pygame.display.set_mode(windowed_size, pygame.RESIZABLE)
     pygame.display.set_caption("Monte Carlo Pathfinding - Pygame (Multi-agent)")
 
-    canvas = pygame.Surface((LOGICAL_WIDTH, LOGICAL_HEIGHT))
+    # canvas = layar langsung kalau ukuran window = ukuran logis
+    presenter = Presenter()
 
     clock = pygame.time.Clock()
+    worker.start()
 
     running = True
     cost_minus_rect = pygame.Rect(0, 0, 0, 0)
     cost_plus_rect = pygame.Rect(0, 0, 0, 0)
+    # waktu render + event per frame (EMA), dipakai worker untuk budget simulasi
+    other_ms = 0.0
 
     while running:
+        prof.begin_frame()
         clock.tick(FPS)
+        prof.lap("tick")
+        t_other = time.perf_counter()
+
+        snap = worker.snapshots.acquire()
 
         # rebuild size kalau map baru di-resize
-        if sim.map_just_resized:
-            LOGICAL_WIDTH, LOGICAL_HEIGHT = compute_logical_size(sim, font, font_title)
+        if (snap.rows, snap.cols) != shown_size:
+            LOGICAL_WIDTH, LOGICAL_HEIGHT = compute_logical_size(snap, font, font_title)
             windowed_size = (LOGICAL_WIDTH, LOGICAL_HEIGHT)
+            shown_size = (snap.rows, snap.cols)
 
             screen = pygame.display.set_mode(windowed_size, pygame.RESIZABLE)
-            canvas = pygame.Surface((LOGICAL_WIDTH, LOGICAL_HEIGHT))
-            sim.map_just_resized = False
-
-        sim.step_frame()
 
-        ui.draw_grid(canvas, sim, CELL_SIZE, font, font_title)
-        ui.draw_paths(canvas, sim, CELL_SIZE)
-        cost_minus_rect, cost_plus_rect = ui.draw_sidebar(canvas, sim, font, font_title, CELL_SIZE)
-
-        display_size = screen.get_size()
-        scaled = pygame.transform.scale(canvas, display_size)
-        screen.blit(scaled, (0, 0))
-        pygame.display.flip()
+        canvas, reconfigured = presenter.begin(screen, (LOGICAL_WIDTH, LOGICAL_HEIGHT))
+        if reconfigured:
+            ui.dirty.invalidate()
+        prof.lap("snapshot")
+
+        # teks sidebar diformat sekali per frame, dipakai semua fungsi gambar
+        sec = ui.build_sidebar_sections(snap)
+        prof.lap("sidebar_text")
+        ui.draw_grid(canvas, snap, CELL_SIZE, font, font_title, sec)
+        prof.lap("draw_grid")
+        ui.draw_paths(canvas, snap, CELL_SIZE)
+        prof.lap("draw_paths")
+        cost_minus_rect, cost_plus_rect = ui.draw_sidebar(canvas, snap, font, font_title, CELL_SIZE, sec)
+        prof.lap("draw_sidebar")
+        if prof.overlay:
+            ui.draw_profile_overlay(canvas, snap, prof.overlay_lines(), font, font_title, CELL_SIZE,
+                                    sec)
+            prof.lap("overlay")
+        worker.snapshots.release()
+
+        full, rects = presenter.rescale(*ui.dirty.take())
+        prof.lap("scale")
+        presenter.update(full, rects)
+        prof.lap("flip")
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
 
+            elif event.type == pygame.VIDEOEXPOSE:
+                # isi window hilang (mis. tertutup window lain): kirim ulang semua
+                ui.dirty.invalidate()
+
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     running = False
 
-                elif event.key == pygame.K_SPACE:
-                    if not sim.simulation_done:
-                        sim.paused = not sim.paused
-
-                elif event.key == pygame.K_r:
-                    sim.reset_simulation()
-
-                elif event.key == pygame.K_z:
-                    if sim.agent_count > 1:
-                        sim.agent_count -= 1
-                        sim.reset_simulation()
-                elif event.key == pygame.K_x:
-                    if sim.agent_count < MAX_AGENT_COUNT:
-                        sim.agent_count += 1
-                        sim.reset_simulation()
-
-                elif event.key == pygame.K_c:
-                    if sim.steps_per_frame > 1:
-                        sim.steps_per_frame -= 1
-                elif event.key == pygame.K_v:
-                    if sim.steps_per_frame < 20:
-                        sim.steps_per_frame += 1
-
-                elif event.key == pygame.K_LEFTBRACKET:
-                    if sim.max_simulations > sim.agent_count:
-                        sim.max_simulations = max(sim.max_simulations - 50, sim.agent_count)
-
-                elif event.key == pygame.K_RIGHTBRACKET:
-                    sim.max_simulations += 50
-
-                elif event.key == pygame.K_COMMA:
-                    if sim.max_steps_per_walk > 10:
-                        sim.max_steps_per_walk -= 10
-
-                elif event.key == pygame.K_PERIOD:
-                    sim.max_steps_per_walk += 10
-
-                elif event.key == pygame.K_1:
-                    sim.cursor_mode = "obstacle"
-                elif event.key == pygame.K_2:
-                    sim.cursor_mode = "cost"
-
-                # ========= RESIZE MAP VIA KEYBOARD =========
-                elif event.key == pygame.K_n:  # rows -
-                    new_rows = max(5, sim.rows - 1)
-                    if new_rows != sim.rows:
-                        sim.resize_grid(new_rows, sim.cols)
-
-                elif event.key == pygame.K_m:  # rows +
-                    new_rows = min(15, sim.rows + 1)
-                    if new_rows != sim.rows:
-                        sim.resize_grid(new_rows, sim.cols)
-
-                elif event.key == pygame.K_k:  # cols -
-                    new_cols = max(5, sim.cols - 1)
-                    if new_cols != sim.cols:
-                        sim.resize_grid(sim.rows, new_cols)
-
-                elif event.key == pygame.K_l:  # cols +
-                    new_cols = min(23, sim.cols + 1)
-                    if new_cols != sim.cols:
-                        sim.resize_grid(sim.rows, new_cols)
-
-                # ==========================================
-
                 elif event.key == pygame.K_f:
                     current_size = screen.get_size()
                     if hasattr(pygame.display, "get_desktop_sizes"):
@@ -154,32 +295,60 @@ def main():
                     else:
                         screen = pygame.display.set_mode(windowed_size, pygame.RESIZABLE)
 
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                mx, my = event.pos
-                display_w, display_h = screen.get_size()
-
-                scale_x = LOGICAL_WIDTH / display_w
-                scale_y = LOGICAL_HEIGHT / display_h
+                elif event.key == pygame.K_o:
+                    prof.toggle_overlay()
+                    # sidebar di bawah kotak overlay harus terlihat lagi
+                    ui.dirty.invalidate()
+                elif event.key == pygame.K_j:
+                    if prof.tracing:
+                        prof.finish_trace()
+                    else:
+                        prof.start_trace(PROFILE_TRACE_PATH if args.trace is None else args.trace,
+                                         args.trace_frames)
+
+                # ========= ZOOM / PAN (hanya tampilan, tidak ke worker) =========
+                elif event.key in PAN_KEYS:
+                    dr, dc = PAN_KEYS[event.key]
+                    step_r, step_c = ui.viewport.pan_step()
+                    ui.viewport.pan(dr * step_r, dc * step_c)
+                elif event.key == pygame.K_EQUALS:
+                    ui.viewport.zoom_by(1)
+                elif event.key == pygame.K_MINUS:
+                    ui.viewport.zoom_by(-1)
+
+                else:
+                    worker.submit(apply_key, event.key)
+
+            elif event.type == pygame.MOUSEWHEEL:
+                ui.viewport.zoom_by(event.y, to_logical(screen, pygame.mouse.get_pos(),
+                                                        LOGICAL_WIDTH, LOGICAL_HEIGHT))
 
-                mx_log = int(mx * scale_x)
-                my_log = int(my * scale_y)
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                if event.button > 3:
+                    # roda mouse sudah ditangani lewat MOUSEWHEEL
+                    continue
+                mx_log, my_log = to_logical(screen, event.pos, LOGICAL_WIDTH, LOGICAL_HEIGHT)
 
                 if cost_minus_rect.collidepoint(mx_log, my_log):
-                    sim.current_cost_value = max(0, sim.current_cost_value - 1)
+                    worker.submit(adjust_cost_value, -1)
                     continue
                 if cost_plus_rect.collidepoint(mx_log, my_log):
-                    sim.current_cost_value = min(9, sim.current_cost_value + 1)
+                    worker.submit(adjust_cost_value, 1)
                     continue
 
-                grid_w = sim.cols * CELL_SIZE
-                grid_h = sim.rows * CELL_SIZE
+                cell = ui.viewport.cell_at(mx_log, my_log)
+                if cell is not None:
+                    worker.submit(click_cell, cell[0], cell[1], event.button)
+
+        prof.lap("events")
+        prof.end_frame()
 
-                if (GRID_ORIGIN_X <= mx_log < GRID_ORIGIN_X + grid_w and
-                    GRID_ORIGIN_Y <= my_log < GRID_ORIGIN_Y + grid_h):
-                    c = (mx_log - GRID_ORIGIN_X) // CELL_SIZE
-                    r = (my_log - GRID_ORIGIN_Y) // CELL_SIZE
-                    sim.handle_grid_click(r, c, event.button)
+        other_ms = 0.8 * other_ms + 0.2 * (time.perf_counter() - t_other) * 1000.0
+        worker.ui_ms = other_ms
 
+    worker.stop()
+    # trace yang belum selesai tetap ditulis
+    prof.finish_trace()
     pygame.quit()
     sys.exit()
 
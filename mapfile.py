@@ -0,0 +1,86 @@
+# mapfile.py
+
+from typing import List
+
+from simulation import SimulationState
+
+# Format map teks (satu baris per row grid):
+#   .      sel kosong
+#   #      rintangan
+#   S      START
+#   G      GOAL
+#   1..9   sel kosong dengan cost (jumlah titik)
+OPEN_CHAR = "."
+OBSTACLE_CHAR = "#"
+START_CHAR = "S"
+GOAL_CHAR = "G"
+# hanya digit ASCII (str.isdigit juga menerima mis. "²" dan "٣")
+COST_CHARS = "0123456789"
+
+
+def parse_map(text: str) -> SimulationState:
+    """Bangun SimulationState dari teks map."""
+    lines = [ln.rstrip() for ln in text.splitlines()]
+    lines = [ln for ln in lines if ln and not ln.startswith(";")]
+    if not lines:
+        raise ValueError("map kosong")
+
+    rows, cols = len(lines), len(lines[0])
+    for i, ln in enumerate(lines):
+        if len(ln) != cols:
+            raise ValueError(f"baris {i} panjangnya {len(ln)}, harusnya {cols}")
+
+    sim = SimulationState(rows=rows, cols=cols)
+    sim.resize_grid(rows, cols)
+    sim.map_just_resized = False
+
+    start = goal = None
+    for r, ln in enumerate(lines):
+        for c, ch in enumerate(ln):
+            if ch == OBSTACLE_CHAR:
+                sim.grid[r][c] = 1
+            elif ch == START_CHAR:
+                start = (r, c)
+            elif ch == GOAL_CHAR:
+                goal = (r, c)
+            elif ch in COST_CHARS:
+                sim.cell_costs[r][c] = int(ch)
+            elif ch != OPEN_CHAR:
+                raise ValueError(f"karakter tidak dikenal {ch!r} di ({r}, {c})")
+
+    if start is not None:
+        sim.start = start
+    if goal is not None:
+        sim.goal = goal
+    sim.reset_simulation()
+    return sim
+
+
+def load_map(path: str) -> SimulationState:
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_map(f.read())
+
+
+def format_map(sim: SimulationState) -> str:
+    """Kebalikan parse_map: tulis grid, cost, START dan GOAL sebagai teks."""
+    out: List[str] = []
+    for r in range(sim.rows):
+        row = []
+        for c in range(sim.cols):
+            if (r, c) == sim.start:
+                row.append(START_CHAR)
+            elif (r, c) == sim.goal:
+                row.append(GOAL_CHAR)
+            elif sim.grid[r][c] == 1:
+                row.append(OBSTACLE_CHAR)
+            elif sim.cell_costs[r][c] > 0:
+                row.append(str(sim.cell_costs[r][c]))
+            else:
+                row.append(OPEN_CHAR)
+        out.append("".join(row))
+    return "\n".join(out) + "\n"
+
+
+def save_map(sim: SimulationState, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(format_map(sim))
@@ -0,0 +1,62 @@
+# oracle.py
+#
+# Solver eksak (A*) untuk model cost yang sama dengan Monte Carlo: gerak
+# MOVES lewat sel terbuka, cost path = jumlah cost_table semua sel termasuk
+# START. Dipakai untuk menghitung optimality gap best_path_cost.
+
+import heapq
+from array import array
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from config import PATH_TYPECODE
+
+if TYPE_CHECKING:
+    # simulation.py mengimpor modul ini (update_optimal)
+    from simulation import SimulationState
+
+
+def shortest_path(sim: "SimulationState") -> Optional[Tuple[float, array]]:
+    """(cost, path ringkas) termurah START -> GOAL, atau None kalau tidak ada.
+
+    Heuristik A*: jarak BFS ke GOAL x cost sel termurah. Cost sel >= 1, jadi
+    heuristik ini tidak pernah melebihi sisa cost (admissible & konsisten).
+    Path tidak dibatasi max_steps_per_walk.
+    """
+    cols = sim.cols
+    start = sim.start[0] * cols + sim.start[1]
+    goal = sim.goal_cell
+    dist = sim.goal_distances()
+    cost_table = sim.cost_table
+    if start == goal:
+        return cost_table[start], array(PATH_TYPECODE, [start])
+
+    masks, deltas = sim.neighbors.masks, sim.neighbors.deltas
+    if not any(dist[start + d] >= 0 for d in deltas[masks[start]]):
+        return None
+    step_min = min(cost_table)
+
+    best = {start: cost_table[start]}
+    parent = {start: -1}
+    heap = [(best[start], best[start], start)]
+    while heap:
+        _, cost, cell = heapq.heappop(heap)
+        if cell == goal:
+            cells = []
+            while cell >= 0:
+                cells.append(cell)
+                cell = parent[cell]
+            cells.reverse()
+            return cost, array(PATH_TYPECODE, cells)
+        if cost > best[cell]:
+            continue
+        for d in deltas[masks[cell]]:
+            n = cell + d
+            h = dist[n]
+            if h < 0:
+                continue
+            c = cost + cost_table[n]
+            if c < best.get(n, float("inf")):
+                best[n] = c
+                parent[n] = cell
+                heapq.heappush(heap, (c + h * step_min, c, n))
+    return None
@@ -0,0 +1,127 @@
+# parallel.py
+#
+# Jalankan max_simulations dibagi ke beberapa proses (ProcessPoolExecutor).
+# Tiap shard = SimulationState independen yang menjalankan rentang episode
+# sendiri (episode_base); stream RNG per episode diturunkan dari seed run.
+# Hasil digabung berurutan sesuai nomor shard, jadi untuk (seed, jumlah
+# worker) yang sama hasilnya identik.
+
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from simulation import SimulationState
+from results import RunResult
+from rng import derive_seed
+from walklog import WalkWriter
+
+
+def map_spec(sim: SimulationState) -> dict:
+    """Map + setting yang perlu dikirim ke proses worker (picklable)."""
+    return {
+        "rows": sim.rows,
+        "cols": sim.cols,
+        "grid": sim.grid.copy(),
+        "cell_costs": sim.cell_costs.copy(),
+        "start": sim.start,
+        "goal": sim.goal,
+        "agent_count": sim.agent_count,
+        "max_steps_per_walk": sim.max_steps_per_walk,
+        "prune_walks": sim.prune_walks,
+        "prune_pockets": sim.prune_pockets,
+        "walk_policy": sim.walk_policy,
+        "bias_cost": sim.bias_cost,
+        "bias_goal": sim.bias_goal,
+        "stop_ci_halfwidth": sim.stop_ci_halfwidth,
+        "stop_patience": sim.stop_patience,
+        "track_paths": sim.track_paths,
+        "path_trie_max_nodes": sim.path_trie_max_nodes,
+    }
+
+
+def build_state(spec: dict, max_simulations: int, seed: int,
+                episode_base: int = 0) -> SimulationState:
+    sim = SimulationState(rows=spec["rows"], cols=spec["cols"], seed=seed,
+                          episode_base=episode_base)
+    sim.grid = spec["grid"].copy()
+    sim.cell_costs = spec["cell_costs"].copy()
+    sim.start = tuple(spec["start"])
+    sim.goal = tuple(spec["goal"])
+    sim.agent_count = spec["agent_count"]
+    sim.max_steps_per_walk = spec["max_steps_per_walk"]
+    sim.prune_walks = spec["prune_walks"]
+    sim.prune_pockets = spec["prune_pockets"]
+    sim.walk_policy = spec["walk_policy"]
+    sim.bias_cost = spec["bias_cost"]
+    sim.bias_goal = spec["bias_goal"]
+    sim.stop_ci_halfwidth = spec["stop_ci_halfwidth"]
+    sim.stop_patience = spec["stop_patience"]
+    sim.track_paths = spec["track_paths"]
+    sim.path_trie_max_nodes = spec["path_trie_max_nodes"]
+    sim.max_simulations = max_simulations
+    sim.reset_simulation()
+    return sim
+
+
+def shard_sizes(total: int, shards: int) -> List[int]:
+    """Bagi total simulasi serata mungkin; shard awal dapat sisa."""
+    base, extra = divmod(total, shards)
+    return [base + (1 if i < extra else 0) for i in range(shards)]
+
+
+def run_shard(spec: dict, sims: int, seed: int, shard: int, episode_base: int,
+              engine: str = "agent", walk_log: Optional[str] = None,
+              walk_log_failed: bool = False) -> RunResult:
+    from headless import run_headless, run_vector
+
+    sim = build_state(spec, sims, seed, episode_base)
+    if engine == "vector":
+        run_vector(sim, seed=derive_seed(seed, "shard", shard))
+    elif walk_log is not None:
+        with WalkWriter(walk_log, sim.rows, sim.cols, walk_log_failed) as writer:
+            sim.walk_log = writer
+            run_headless(sim)
+        sim.walk_log = None
+    else:
+        run_headless(sim)
+    return RunResult.from_state(sim)
+
+
+def shard_log_path(walk_log: str, shard: int) -> str:
+    return f"{walk_log}.{shard}"
+
+
+def run_parallel(sim: SimulationState, workers: int, seed: int,
+                 engine: str = "agent", max_workers: Optional[int] = None,
+                 walk_log: Optional[str] = None, walk_log_failed: bool = False) -> RunResult:
+    """Jalankan sim.max_simulations dalam `workers` shard, lalu gabungkan.
+
+    Dengan walk_log, tiap shard menulis file sendiri; file-file itu lalu
+    disambung berurutan ke walk_log (format walk log boleh disambung).
+    """
+    spec = map_spec(sim)
+    sizes = [n for n in shard_sizes(sim.max_simulations, workers) if n > 0]
+    bases = [sum(sizes[:i]) for i in range(len(sizes))]
+
+    with ProcessPoolExecutor(max_workers=max_workers or workers) as pool:
+        futures = [
+            pool.submit(run_shard, spec, n, seed, i, base, engine,
+                        shard_log_path(walk_log, i) if walk_log else None, walk_log_failed)
+            for i, (n, base) in enumerate(zip(sizes, bases))
+        ]
+        # gabung sesuai urutan shard, bukan urutan selesai
+        results = [f.result() for f in futures]
+
+    if walk_log:
+        with open(walk_log, "wb") as out:
+            for i in range(len(sizes)):
+                part = shard_log_path(walk_log, i)
+                with open(part, "rb") as f:
+                    shutil.copyfileobj(f, out)
+                os.remove(part)
+
+    merged = RunResult(rows=sim.rows, cols=sim.cols)
+    for res in results:
+        merged.merge(res)
+    return merged
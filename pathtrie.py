@@ -0,0 +1,190 @@
+# pathtrie.py
+#
+# Trie jalur sukses: tiap jalur berbeda = satu node terminal dengan jumlah
+# sampel dan cost-nya. Prefix yang sama dipakai bersama, jadi memori tumbuh
+# dengan jumlah jalur berbeda, bukan total langkah. Node disimpan di array
+# flat (index = id node) + satu dict edge (id induk << 32 | sel) -> id anak.
+# Kalau node melebihi max_nodes, jalur paling jarang dibuang.
+
+import heapq
+from array import array
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple
+
+from config import PATH_TRIE_MAX_NODES, PATH_TRIE_KEEP_CHEAPEST
+
+# perkiraan byte per node: entri dict edge + objek int key/value + array
+NODE_BYTES = 144
+# eviction membuang sampai node <= max_nodes x ini, supaya tidak tiap insert
+EVICT_TO = 0.75
+
+
+class PathTrie:
+    def __init__(self, max_nodes: int = PATH_TRIE_MAX_NODES,
+                 keep_cheapest: int = PATH_TRIE_KEEP_CHEAPEST):
+        self.max_nodes = max_nodes
+        self.keep_cheapest = keep_cheapest
+
+        self.edges = {}
+        # node 0 = akar (jalur kosong)
+        self.parent = array("i", [-1])
+        self.cell = array("i", [-1])
+        self.children = array("i", [0])
+        self.depth = array("i", [0])
+        self.count = array("q", [0])
+        self.cost = array("d", [0.0])
+        self.free: List[int] = []
+
+        self.nodes = 1
+        self.distinct = 0
+        self.samples = 0
+        # jalur paling sering (tidak pernah dibuang: eviction mulai dari yang jarang)
+        self.top_node = 0
+        # yang hilang karena batas memori
+        self.evicted_paths = 0
+        self.evicted_samples = 0
+
+    # ---------- insert ----------
+
+    def add(self, cells, n: int, cost: float, times: int = 1):
+        """Catat `times` sampel jalur n sel pertama dari cells."""
+        edges = self.edges
+        node = 0
+        i = 0
+        for c in islice(cells, n):
+            child = edges.get(node << 32 | c)
+            if child is None:
+                break
+            node = child
+            i += 1
+        if i < n:
+            # sisa jalur pasti belum ada: dibuat sekaligus
+            node = self._add_suffix(node, cells[i:n])
+
+        if self.count[node] == 0:
+            self.distinct += 1
+        self.count[node] += times
+        self.cost[node] = cost
+        self.samples += times
+        if self.count[node] > self.count[self.top_node]:
+            self.top_node = node
+
+        if self.nodes > self.max_nodes:
+            self.evict(int(self.max_nodes * EVICT_TO))
+
+    def _add_suffix(self, node: int, suffix) -> int:
+        """Rantai node baru untuk suffix di bawah node; return node terakhir."""
+        m = len(suffix)
+        self.children[node] += 1
+        self.nodes += m
+        depth = self.depth[node]
+        if len(self.free) >= m:
+            # pakai ulang id dari eviction
+            ids = self.free[-m:]
+            del self.free[-m:]
+            parent = node
+            for k, c in enumerate(suffix):
+                new = ids[k]
+                self.parent[new] = parent
+                self.cell[new] = c
+                self.children[new] = 1
+                self.depth[new] = depth + k + 1
+                self.count[new] = 0
+                self.edges[parent << 32 | c] = new
+                parent = new
+        else:
+            base = len(self.parent)
+            ids = range(base, base + m)
+            parents = [node]
+            parents.extend(range(base, base + m - 1))
+            self.parent.extend(parents)
+            self.cell.extend(suffix)
+            self.children.extend([1] * m)
+            self.depth.extend(range(depth + 1, depth + m + 1))
+            self.count.extend([0] * m)
+            self.cost.extend([0.0] * m)
+            self.edges.update(zip([p << 32 | c for p, c in zip(parents, suffix)], ids))
+        self.children[ids[-1]] = 0
+        return ids[-1]
+
+    def merge(self, other: "PathTrie"):
+        """Tambahkan semua jalur other (mis. dari shard lain)."""
+        for node in other.terminals():
+            self.add(other.cells_of(node), other.depth[node], other.cost[node], other.count[node])
+        self.evicted_paths += other.evicted_paths
+        self.evicted_samples += other.evicted_samples
+
+    # ---------- eviction ----------
+
+    def evict(self, target_nodes: int):
+        """Buang jalur paling jarang (cost lebih mahal dulu kalau sama) sampai
+        node <= target_nodes. keep_cheapest jalur termurah tidak dibuang."""
+        terminals = list(self.terminals())
+        keep = set(heapq.nsmallest(self.keep_cheapest, terminals, key=self._cost_key))
+        keep.add(self.top_node)
+        count, cost = self.count, self.cost
+        terminals.sort(key=lambda node: (count[node], -cost[node]))
+        for node in terminals:
+            if self.nodes <= target_nodes:
+                break
+            if node not in keep:
+                self._remove(node)
+
+    def _remove(self, node: int):
+        self.evicted_paths += 1
+        self.evicted_samples += self.count[node]
+        self.distinct -= 1
+        self.samples -= self.count[node]
+        self.count[node] = 0
+        # lepas node yang tidak lagi dipakai jalur lain, dari ujung ke akar
+        while node != 0 and self.children[node] == 0 and self.count[node] == 0:
+            parent = self.parent[node]
+            del self.edges[parent << 32 | self.cell[node]]
+            self.children[parent] -= 1
+            self.free.append(node)
+            self.nodes -= 1
+            node = parent
+
+    # ---------- query ----------
+
+    def terminals(self) -> Iterator[int]:
+        # node di free list selalu count 0
+        count = self.count
+        return (node for node in range(1, len(count)) if count[node] > 0)
+
+    def cells_of(self, node: int) -> array:
+        cells = array("i")
+        while node > 0:
+            cells.append(self.cell[node])
+            node = self.parent[node]
+        cells.reverse()
+        return cells
+
+    def _cost_key(self, node: int):
+        return self.cost[node], self.depth[node], -self.count[node]
+
+    def top_frequent(self, k: int) -> List[Tuple[int, float, array]]:
+        """k jalur paling sering: (jumlah sampel, cost, sel); seri -> lebih murah dulu."""
+        count, cost = self.count, self.cost
+        nodes = heapq.nsmallest(k, self.terminals(), key=lambda node: (-count[node], cost[node]))
+        return [(count[node], cost[node], self.cells_of(node)) for node in nodes]
+
+    def top_cheapest(self, k: int) -> List[Tuple[int, float, array]]:
+        """k jalur termurah (seri -> lebih pendek, lalu lebih sering): (jumlah sampel, cost, sel)."""
+        nodes = heapq.nsmallest(k, self.terminals(), key=self._cost_key)
+        return [(self.count[node], self.cost[node], self.cells_of(node)) for node in nodes]
+
+    @property
+    def total_samples(self) -> int:
+        """Semua sampel yang pernah dicatat, termasuk yang sudah dibuang."""
+        return self.samples + self.evicted_samples
+
+    def top_share(self) -> Optional[float]:
+        """Porsi sampel jalur paling sering dari semua sampel."""
+        if self.samples == 0:
+            return None
+        return self.count[self.top_node] / self.total_samples
+
+    @property
+    def approx_bytes(self) -> int:
+        return self.nodes * NODE_BYTES
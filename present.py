@@ -0,0 +1,99 @@
+# present.py
+#
+# Menampilkan canvas logis ke window.
+#
+# - Window seukuran canvas: UI menggambar langsung ke surface layar (tanpa
+#   canvas terpisah, tanpa scale), lalu hanya rect yang berubah di-update.
+# - Window lain ukuran (resize, fullscreen F): canvas milik Presenter dibuat
+#   sekali per ukuran dan di-scale langsung ke surface layar per tile
+#   PRESENT_TILE; hanya tile yang kena rect berubah yang di-scale ulang.
+#   Tampilan penuh juga lewat tile yang sama, jadi tiap piksel layar selalu
+#   hasil scale yang sama (tidak ada beda sampling antara update sebagian
+#   dan penuh).
+#
+# Rect berubah datang dari ui.dirty (koordinat logis).
+
+from typing import List, Tuple
+
+import pygame
+
+from config import PRESENT_TILE
+
+
+class Presenter:
+    def __init__(self, tile: int = PRESENT_TILE):
+        self.tile = tile
+        self.screen = None
+        self.canvas = None
+        # canvas sendiri, hanya dipakai kalau perlu scale
+        self._own = None
+        self._config = None
+        self.scaled = False
+
+    def begin(self, screen, logical_size: Tuple[int, int]) -> Tuple[pygame.Surface, bool]:
+        """Canvas untuk frame ini; True kalau konfigurasi berubah (gambar ulang semua)."""
+        config = (screen, screen.get_size(), logical_size)
+        if config == self._config:
+            return self.canvas, False
+        self._config = config
+        self.screen = screen
+        self.scaled = screen.get_size() != logical_size
+        if not self.scaled:
+            self._own = None
+            self.canvas = screen
+        else:
+            if self._own is None or self._own.get_size() != logical_size:
+                self._own = pygame.Surface(logical_size)
+            self.canvas = self._own
+        return self.canvas, True
+
+    def to_display(self, rect: pygame.Rect) -> pygame.Rect:
+        """Rect logis -> rect layar. Batas dihitung dengan rumus yang sama
+        untuk tiap rect, jadi tile yang bersebelahan tetap rapat di layar."""
+        lw, lh = self.canvas.get_size()
+        dw, dh = self.screen.get_size()
+        x0, x1 = rect.left * dw // lw, rect.right * dw // lw
+        y0, y1 = rect.top * dh // lh, rect.bottom * dh // lh
+        return pygame.Rect(x0, y0, x1 - x0, y1 - y0)
+
+    def dirty_tiles(self, full: bool, rects: List[pygame.Rect]) -> List[Tuple[int, int]]:
+        """(kolom, baris) tile yang kena salah satu rect (semua kalau full)."""
+        t = self.tile
+        w, h = self.canvas.get_size()
+        if full:
+            return [(tx, ty) for ty in range(-(-h // t)) for tx in range(-(-w // t))]
+        tiles = set()
+        for rect in rects:
+            rect = rect.clip((0, 0, w, h))
+            if rect.width <= 0 or rect.height <= 0:
+                continue
+            for ty in range(rect.top // t, (rect.bottom - 1) // t + 1):
+                for tx in range(rect.left // t, (rect.right - 1) // t + 1):
+                    tiles.add((tx, ty))
+        return sorted(tiles)
+
+    def rescale(self, full: bool, rects: List[pygame.Rect]) -> Tuple[bool, List[pygame.Rect]]:
+        """Scale tile canvas yang berubah ke layar; return (full, rect layar)."""
+        if not self.scaled:
+            # sudah tergambar di layar
+            return full, rects
+        t = self.tile
+        bounds = self.canvas.get_rect()
+        canvas, screen = self.canvas, self.screen
+        updated = []
+        for tx, ty in self.dirty_tiles(full, rects):
+            rect = pygame.Rect(tx * t, ty * t, t, t).clip(bounds)
+            dest = self.to_display(rect)
+            if dest.width <= 0 or dest.height <= 0:
+                continue
+            pygame.transform.scale(canvas.subsurface(rect), dest.size, screen.subsurface(dest))
+            updated.append(dest)
+        return full, updated
+
+    @staticmethod
+    def update(full: bool, rects: List[pygame.Rect]):
+        """Kirim layar ke window: semua, atau hanya rect yang berubah."""
+        if full:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
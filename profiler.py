@@ -0,0 +1,179 @@
+# profiler.py
+#
+# Profiler per fase untuk loop window: waktu tiap fase (step_frame di thread
+# worker, draw_grid, draw_paths, draw_sidebar, scale, flip, ...) disimpan di
+# ring buffer per fase, jadi rata-rata, p95 dan p99 selalu dari PROFILE_WINDOW
+# sampel terakhir. Trace bisa direkam untuk N frame lalu ditulis sebagai JSON
+# trace-event Chrome (buka di chrome://tracing atau ui.perfetto.dev).
+#
+#   prof.begin_frame()
+#   ...; prof.lap("draw_grid")
+#   ...; prof.lap("flip")
+#   prof.end_frame()
+#
+# Kalau mati (tidak ada overlay / trace), tiap panggilan hanya cek satu flag.
+
+import json
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from config import PROFILE_WINDOW, PROFILE_OVERLAY_REFRESH_S
+
+# tid di file trace
+UI_TID = 1
+WORKER_TID = 2
+_THREAD_NAMES = {UI_TID: "ui", WORKER_TID: "simulation"}
+
+
+class PhaseStats:
+    """Ring buffer durasi (ms) satu fase."""
+
+    __slots__ = ("values", "size", "pos", "total")
+
+    def __init__(self, window: int):
+        self.values = array("d", bytes(8 * window))
+        self.size = 0
+        self.pos = 0
+        self.total = 0
+
+    def add(self, ms: float):
+        self.values[self.pos] = ms
+        self.pos = (self.pos + 1) % len(self.values)
+        self.size = min(self.size + 1, len(self.values))
+        self.total += 1
+
+    def summary(self) -> Tuple[float, float, float]:
+        """(rata-rata, p95, p99) dalam ms."""
+        data = sorted(self.values[:self.size])
+        n = len(data)
+        if n == 0:
+            return 0.0, 0.0, 0.0
+        return sum(data) / n, data[min(n - 1, int(0.95 * n))], data[min(n - 1, int(0.99 * n))]
+
+
+class FrameProfiler:
+    def __init__(self, window: int = PROFILE_WINDOW):
+        self.window = window
+        # overlay di sidebar; profiler juga aktif selama trace direkam
+        self.overlay = False
+        self.enabled = False
+        self.phases: Dict[str, PhaseStats] = {}
+
+        self._frame_start = 0.0
+        self._last = 0.0
+
+        self._events: Optional[list] = None
+        self._trace_path: Optional[str] = None
+        self._trace_frames = 0
+        self._trace_t0 = 0.0
+        self.last_trace: Optional[str] = None
+
+        self._lines: List[str] = []
+        self._lines_at = 0.0
+
+    def _update_enabled(self):
+        self.enabled = self.overlay or self._events is not None
+
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        self._update_enabled()
+
+    # ---------- pencatatan ----------
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._frame_start = self._last = time.perf_counter()
+
+    def lap(self, phase: str):
+        """Catat fase yang berakhir sekarang (mulai di lap sebelumnya)."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._record(phase, self._last, now, UI_TID)
+        self._last = now
+
+    def record(self, phase: str, start: float, end: float, tid: int = WORKER_TID):
+        """Catat fase dengan waktu perf_counter eksplisit (thread worker)."""
+        if not self.enabled:
+            return
+        self._record(phase, start, end, tid)
+
+    def _record(self, phase: str, start: float, end: float, tid: int):
+        stats = self.phases.get(phase)
+        if stats is None:
+            # dict hanya ditulis per nama fase baru; aman dengan GIL
+            stats = self.phases[phase] = PhaseStats(self.window)
+        stats.add((end - start) * 1000.0)
+        events = self._events
+        if events is not None:
+            events.append((phase, start, end, tid))
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._record("frame", self._frame_start, now, UI_TID)
+        if self._events is not None:
+            self._trace_frames -= 1
+            if self._trace_frames <= 0:
+                self.finish_trace()
+
+    # ---------- trace Chrome ----------
+
+    @property
+    def tracing(self) -> bool:
+        return self._events is not None
+
+    def start_trace(self, path: str, frames: int):
+        """Rekam `frames` frame berikutnya lalu tulis ke path."""
+        self._events = []
+        self._trace_path = path
+        self._trace_frames = frames
+        self._trace_t0 = time.perf_counter()
+        self._update_enabled()
+
+    def finish_trace(self) -> Optional[str]:
+        """Tulis trace yang sedang direkam (kalau ada); return path-nya."""
+        events, self._events = self._events, None
+        self._update_enabled()
+        if events is None:
+            return None
+        t0 = self._trace_t0
+        trace = [{"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}}
+                 for tid, name in _THREAD_NAMES.items()]
+        # list disalin: worker bisa masih menambah satu event saat ini
+        trace += [{"name": phase, "ph": "X", "pid": 1, "tid": tid,
+                   "ts": round((start - t0) * 1e6, 1), "dur": round((end - start) * 1e6, 1)}
+                  for phase, start, end, tid in list(events)]
+        with open(self._trace_path, "w") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+        self.last_trace = self._trace_path
+        return self._trace_path
+
+    # ---------- ringkasan ----------
+
+    def summary(self) -> List[Tuple[str, float, float, float]]:
+        """[(fase, rata-rata, p95, p99)] dalam ms, "frame" paling akhir."""
+        rows = [(name, *stats.summary()) for name, stats in list(self.phases.items()) if name != "frame"]
+        rows.sort(key=lambda row: -row[1])
+        frame = self.phases.get("frame")
+        if frame is not None:
+            rows.append(("frame", *frame.summary()))
+        return rows
+
+    def overlay_lines(self) -> List[str]:
+        """Baris overlay; dihitung ulang paling sering tiap PROFILE_OVERLAY_REFRESH_S."""
+        now = time.perf_counter()
+        if now - self._lines_at >= PROFILE_OVERLAY_REFRESH_S:
+            self._lines_at = now
+            lines = [f"[Profiler] ms avg/p95/p99 ({self.window} sampel)"]
+            lines += [f"{name}: {avg:.2f}/{p95:.2f}/{p99:.2f}"
+                      for name, avg, p95, p99 in self.summary()]
+            if self.tracing:
+                lines.append(f"Trace: sisa {self._trace_frames} frame")
+            elif self.last_trace:
+                lines.append(f"Trace: {self.last_trace}")
+            self._lines = lines
+        return self._lines
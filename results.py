@@ -0,0 +1,201 @@
+# results.py
+
+from array import array
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy opsional: tanpa numpy heatmap dijumlah per sel
+    np = None
+
+from simulation import SimulationState, PATH_TYPECODE, is_better_path
+from gridarray import GridArray
+from streamstats import Distribution
+from pathtrie import PathTrie
+
+
+@dataclass
+class RunResult:
+    """Statistik akhir satu run (atau gabungan beberapa shard).
+
+    Field-nya sama dengan yang diisi SimulationState.handle_success, plus
+    heatmap visit_counts (flat, r * cols + c).
+    """
+    rows: int
+    cols: int
+
+    sim_count: int = 0
+    success_count: int = 0
+    total_success_length: int = 0
+    min_success_length: Optional[int] = None
+    max_success_length: Optional[int] = None
+
+    total_success_cost: float = 0.0
+    min_success_cost: Optional[float] = None
+    max_success_cost: Optional[float] = None
+
+    # path ringkas (index flat), seperti SimulationState.best_path
+    best_path: Optional[array] = None
+    best_path_cost: Optional[float] = None
+    best_episode: Optional[int] = None
+
+    pruned_count: int = 0
+    # aturan berhenti tiap shard, unik & terurut, digabung "+"
+    stop_reason: Optional[str] = None
+
+    success_weight: float = 0.0
+    success_weight_sq: float = 0.0
+    success_weight_cost: float = 0.0
+
+    length_dist: Optional[Distribution] = None
+    cost_dist: Optional[Distribution] = None
+    path_trie: Optional[PathTrie] = None
+
+    visit_counts: Optional[array] = None
+
+    @classmethod
+    def from_state(cls, sim: SimulationState) -> "RunResult":
+        return cls(
+            rows=sim.rows,
+            cols=sim.cols,
+            sim_count=sim.sim_count,
+            success_count=sim.success_count,
+            total_success_length=sim.total_success_length,
+            min_success_length=sim.min_success_length,
+            max_success_length=sim.max_success_length,
+            total_success_cost=sim.total_success_cost,
+            min_success_cost=sim.min_success_cost,
+            max_success_cost=sim.max_success_cost,
+            best_path=array(PATH_TYPECODE, sim.best_path) if sim.best_path is not None else None,
+            best_path_cost=sim.best_path_cost,
+            best_episode=sim.best_episode,
+            pruned_count=sim.pruned_count,
+            stop_reason=sim.stop_reason,
+            success_weight=sim.success_weight,
+            success_weight_sq=sim.success_weight_sq,
+            success_weight_cost=sim.success_weight_cost,
+            length_dist=sim.length_dist.copy(),
+            cost_dist=sim.cost_dist.copy(),
+            path_trie=sim.path_trie,
+            visit_counts=array("q", sim.visit_counts.data),
+        )
+
+    def merge(self, other: "RunResult"):
+        """Gabungkan other ke self. Urutan merge menentukan hasil (deterministik)."""
+        if (self.rows, self.cols) != (other.rows, other.cols):
+            raise ValueError("ukuran map berbeda, tidak bisa digabung")
+
+        self.sim_count += other.sim_count
+        self.success_count += other.success_count
+        self.total_success_length += other.total_success_length
+        self.total_success_cost += other.total_success_cost
+        self.pruned_count += other.pruned_count
+        self.stop_reason = _merge_reasons(self.stop_reason, other.stop_reason)
+        self.success_weight += other.success_weight
+        self.success_weight_sq += other.success_weight_sq
+        self.success_weight_cost += other.success_weight_cost
+        self.length_dist = _merge_dist(self.length_dist, other.length_dist)
+        self.cost_dist = _merge_dist(self.cost_dist, other.cost_dist)
+        if other.path_trie is not None:
+            if self.path_trie is None:
+                # trie baru: other (mis. milik SimulationState) tidak ikut berubah
+                self.path_trie = PathTrie(other.path_trie.max_nodes, other.path_trie.keep_cheapest)
+            self.path_trie.merge(other.path_trie)
+
+        self.min_success_length = _merge_min(self.min_success_length, other.min_success_length)
+        self.max_success_length = _merge_max(self.max_success_length, other.max_success_length)
+        self.min_success_cost = _merge_min(self.min_success_cost, other.min_success_cost)
+        self.max_success_cost = _merge_max(self.max_success_cost, other.max_success_cost)
+
+        # tie-break sama dengan handle_success
+        if other.best_path is not None:
+            if self.best_path is None or is_better_path(
+                    other.best_path_cost, len(other.best_path), other.best_episode,
+                    self.best_path_cost, len(self.best_path), self.best_episode):
+                self.best_path = array(PATH_TYPECODE, other.best_path)
+                self.best_path_cost = other.best_path_cost
+                self.best_episode = other.best_episode
+
+        if other.visit_counts is not None:
+            if self.visit_counts is None:
+                self.visit_counts = array("q", other.visit_counts)
+            else:
+                _add_counts(self.visit_counts, other.visit_counts)
+
+    def apply_to(self, sim: SimulationState):
+        """Tulis statistik ke sim (mis. untuk format_stats atau UI)."""
+        sim.sim_count = self.sim_count
+        sim.success_count = self.success_count
+        sim.total_success_length = self.total_success_length
+        sim.min_success_length = self.min_success_length
+        sim.max_success_length = self.max_success_length
+        sim.total_success_cost = self.total_success_cost
+        sim.min_success_cost = self.min_success_cost
+        sim.max_success_cost = self.max_success_cost
+        sim.best_path = array(PATH_TYPECODE, self.best_path) if self.best_path is not None else None
+        sim.best_path_cost = self.best_path_cost
+        sim.best_episode = self.best_episode
+        sim.pruned_count = self.pruned_count
+        sim.stop_reason = self.stop_reason
+        sim.success_weight = self.success_weight
+        sim.success_weight_sq = self.success_weight_sq
+        sim.success_weight_cost = self.success_weight_cost
+        if self.length_dist is not None:
+            sim.length_dist = self.length_dist.copy()
+            sim.cost_dist = self.cost_dist.copy()
+        sim.path_trie = self.path_trie
+
+        counts = self.visit_counts
+        if counts is None:
+            counts = array("q", bytes(8 * self.rows * self.cols))
+        sim.visit_counts = GridArray(self.rows, self.cols, "q", array("q", counts))
+        sim.recompute_heat_stats()
+        sim.agents = []
+        sim.first_step_after_reset = False
+        sim.simulation_done = True
+
+
+def _add_counts(total: array, counts: array):
+    """total += counts per sel, di tempat (array "q" sama panjang)."""
+    if np is not None:
+        view = np.frombuffer(total, dtype=np.int64)
+        view += np.frombuffer(counts, dtype=np.int64)
+        return
+    # heatmap shard biasanya jarang: sel nol dilewati
+    for i, v in enumerate(counts):
+        if v:
+            total[i] += v
+
+
+def _merge_dist(a: Optional[Distribution], b: Optional[Distribution]) -> Optional[Distribution]:
+    if b is None:
+        return a
+    if a is None:
+        return b.copy()
+    a.merge(b)
+    return a
+
+
+def _merge_reasons(a: Optional[str], b: Optional[str]) -> Optional[str]:
+    reasons = set()
+    for r in (a, b):
+        if r:
+            reasons.update(r.split("+"))
+    return "+".join(sorted(reasons)) if reasons else None
+
+
+def _merge_min(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a, b)
+
+
+def _merge_max(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return max(a, b)
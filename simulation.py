@@ -1,27 +1,133 @@
 # simulation.py
 
-import random
+import itertools
+import math
+import time
+from array import array
 from dataclasses import dataclass, field
 from typing import List, Tuple, Optional
 
 from config import (
     DEFAULT_GRID_ROWS, DEFAULT_GRID_COLS,
     DEFAULT_STEPS_PER_FRAME, MAX_STEPS_DEFAULT, MAX_SIMULATIONS_DEFAULT,
-    INITIAL_AGENT_COUNT, MAX_AGENT_COUNT,
-    MOVES
+    FRAME_BUDGET_MS, STEP_RATE_WINDOW_S, PRUNE_SEARCH_LIMIT,
+    BIAS_COST_DEFAULT, BIAS_GOAL_DEFAULT, ORACLE_MAX_CELLS,
+    STOP_CI_Z, STOP_MIN_SIMULATIONS, HIST_BINS, PATH_TRIE_MAX_NODES,
+    INITIAL_AGENT_COUNT, MAX_AGENT_COUNT, PATH_TYPECODE,
 )
+from adjacency import NeighborTable
+from gridarray import GridArray
+from streamstats import Distribution
+from pathtrie import PathTrie
+from walklog import (
+    WalkWriter, OUTCOME_SUCCESS, OUTCOME_MAX_STEPS, OUTCOME_DEAD_END, OUTCOME_PRUNED,
+)
+from rng import RandomStream, new_seed, episode_seed
+from oracle import shortest_path
 
 Pos = Tuple[int, int]
 Path = List[Pos]
 
 
+def decode_path(cells, cols: int) -> Path:
+    """Path ringkas (index flat) -> list (r, c). Dipakai hanya untuk tampilan."""
+    return [divmod(i, cols) for i in cells]
+
+
+def is_better_path(cost: float, length: int, episode: Optional[int],
+                   best_cost: float, best_length: int, best_episode: Optional[int]) -> bool:
+    """Urutan best path: cost, lalu panjang, lalu nomor episode (kecil menang).
+
+    Tie-break episode membuat best path tidak bergantung pada urutan walk
+    selesai (jumlah agen, shard, pruning). Episode None (engine vector) tidak
+    pernah menang tie.
+    """
+    if cost < best_cost - 1e-9:
+        return True
+    if cost > best_cost + 1e-9:
+        return False
+    if length != best_length:
+        return length < best_length
+    return episode is not None and (best_episode is None or episode < best_episode)
+
+
+def importance_estimates(stats) -> Tuple[float, Optional[float], float]:
+    """(peluang sukses, rata-rata cost sukses, effective sample size) untuk
+    walk uniform, dari bobot walk sukses. stats: SimulationState, snapshot,
+    atau RunResult. Policy uniform: bobot 1, sama dengan statistik mentah.
+    """
+    rate = stats.success_weight / stats.sim_count if stats.sim_count > 0 else 0.0
+    mean_cost = (stats.success_weight_cost / stats.success_weight
+                 if stats.success_weight > 0 else None)
+    ess = (stats.success_weight ** 2 / stats.success_weight_sq
+           if stats.success_weight_sq > 0 else 0.0)
+    return rate, mean_cost, ess
+
+
+def success_rate_ci(stats, completed: int, z: float = STOP_CI_Z) -> Tuple[float, float]:
+    """(estimasi, half-width) peluang sukses walk uniform dari `completed` walk selesai.
+
+    Interval Wilson, dengan varians p(1-p)/n diganti varians sampel bobot
+    importance (policy uniform: bobot 1, jadi persis Wilson). Tetap lebar
+    saat belum ada sukses, tidak runtuh ke 0 seperti interval normal biasa.
+    """
+    if completed <= 0:
+        return 0.0, float("inf")
+    n = completed
+    mean = stats.success_weight / n
+    var = max(stats.success_weight_sq / n - mean * mean, 0.0) / n
+    z2 = z * z
+    half = z / (1 + z2 / n) * math.sqrt(var + z2 / (4 * n * n))
+    return mean, half
+
+
+def describe_stop(stats) -> str:
+    """Teks aturan yang menghentikan run (stop_reason)."""
+    reasons = {
+        "max_simulations": "max simulations tercapai",
+        "ci": f"CI sukses <= ±{stats.stop_ci_halfwidth * 100:g}%",
+        "patience": f"best cost tetap {stats.stop_patience} simulasi",
+    }
+    if not stats.stop_reason:
+        return "-"
+    return " + ".join(reasons.get(r, r) for r in stats.stop_reason.split("+"))
+
+
+def optimality_gap(stats) -> Optional[float]:
+    """(best_path_cost - optimal_cost) / optimal_cost, None kalau salah satu belum ada."""
+    if stats.best_path_cost is None or not stats.optimal_cost:
+        return None
+    return (stats.best_path_cost - stats.optimal_cost) / stats.optimal_cost
+
+
+# nomor versi map unik lintas instance, jadi cache render/snapshot cukup
+# membandingkan map_version tanpa perlu tahu objek SimulationState mana
+_map_versions = itertools.count(1)
+
+
 @dataclass
 class Agent:
-    pos: Pos
-    path: Path
-    visited: set
+    # index flat sel yang dilewati; hanya path[:path_len] yang berlaku. Buffer
+    # dipakai ulang antar episode (tidak dialokasi ulang, hanya tumbuh).
+    path: array
+    # visited[r * cols + c] == 1 kalau sel sudah dilewati di episode ini
+    visited: bytearray
     active: bool
     steps: int
+    # index flat sel posisi sekarang (r * cols + c)
+    cell: int = 0
+    # total cost path sejauh ini (sama dengan compute_cells_cost(cells()))
+    cost: float = 0.0
+    # nomor episode yang sedang dijalankan + stream RNG-nya
+    episode: int = 0
+    rng: Optional[RandomStream] = None
+    path_len: int = 1
+    # log likelihood ratio walk ini: log P(path | uniform) - log P(path | policy)
+    log_weight: float = 0.0
+
+    def cells(self) -> array:
+        """Salinan ringkas path episode sekarang."""
+        return self.path[:self.path_len]
 
 
 @dataclass
@@ -31,23 +137,76 @@ class SimulationState:
     cols: int = DEFAULT_GRID_COLS
 
     # grid & costs
-    grid: List[List[int]] = field(default_factory=list)
-    visit_counts: List[List[int]] = field(default_factory=list)
-    cell_costs: List[List[int]] = field(default_factory=list)
+    # GridArray: grid[r][c] seperti list of list, .data = array flat r*cols+c
+    grid: Optional[GridArray] = None
+    visit_counts: Optional[GridArray] = None
+    # ringkasan heatmap, di-update tiap increment (tanpa scan ulang grid)
+    visit_max: int = 0
+    visit_total: int = 0
+    visit_nonzero: int = 0
+    cell_costs: Optional[GridArray] = None
+
+    # tetangga terbuka per sel
+    neighbors: Optional[NeighborTable] = None
+    # get_cell_cost_value per sel, index flat
+    cost_table: List[float] = field(default_factory=list)
 
     start: Pos = (0, 0)
     goal: Pos = (DEFAULT_GRID_ROWS - 1, DEFAULT_GRID_COLS - 1)
+    # index flat GOAL, diisi reset_simulation (dipakai cek sukses di hot path)
+    goal_cell: int = 0
+    # jarak BFS tiap sel ke GOAL (-1 = tidak sampai); None = dibangun ulang
+    # saat dibutuhkan (dibuang setiap rintangan/START/GOAL/ukuran berubah)
+    goal_dist: Optional[array] = None
 
     # sim settings
     agent_count: int = INITIAL_AGENT_COUNT
     steps_per_frame: int = DEFAULT_STEPS_PER_FRAME
     max_steps_per_walk: int = MAX_STEPS_DEFAULT
     max_simulations: int = MAX_SIMULATIONS_DEFAULT
+    # pangkas walk yang pasti gagal karena GOAL di luar sisa step (cek O(1)
+    # goal_dist tiap langkah); statistik sukses tetap sama persis
+    prune_walks: bool = False
+    # tambahan prune_walks: pangkas juga walk yang GOAL-nya tertutup jalurnya
+    # sendiri (flood-fill kantong). Menghemat step, bukan waktu: pencariannya
+    # lebih mahal dari step yang dihemat
+    prune_pockets: bool = False
+    # "uniform": tetangga dipilih rata; "biased": condong ke cost rendah dan
+    # mendekati GOAL, tiap walk membawa likelihood ratio ke policy uniform
+    walk_policy: str = "uniform"
+    bias_cost: float = BIAS_COST_DEFAULT
+    bias_goal: float = BIAS_GOAL_DEFAULT
+
+    # "fixed": steps_per_frame putaran per frame; "budget": putaran sebanyak
+    # yang muat dalam frame_budget_ms (dihitung dari ongkos putaran terukur)
+    step_mode: str = "fixed"
+    frame_budget_ms: float = FRAME_BUDGET_MS
+    round_cost_s: float = 0.0
+
+    # kunjungan heatmap/detik yang tercapai (rata-rata per jendela STEP_RATE_WINDOW_S);
+    # termasuk kunjungan sel START tiap walk baru, jadi bukan murni langkah
+    visits_per_sec: float = 0.0
+    rate_window_start: float = 0.0
+    rate_window_visits: int = 0
+
+    # RNG: episode ke-n memakai stream episode_seed(seed, episode_base + n).
+    # seed None = diambil acak saat dibuat. episode_base dipakai shard paralel.
+    seed: Optional[int] = None
+    episode_base: int = 0
 
     # sim state
     agents: List[Agent] = field(default_factory=list)
-    best_path: Optional[Path] = None
+    # path ringkas (array index flat), decode_path untuk (r, c)
+    best_path: Optional[array] = None
     best_path_cost: Optional[float] = None
+    # nomor episode global (episode_base + episode) pemilik best_path
+    best_episode: Optional[int] = None
+
+    # solusi eksak (oracle.shortest_path) untuk map_version == optimal_version;
+    # None = tidak ada jalur, atau belum dihitung (map > ORACLE_MAX_CELLS)
+    optimal_cost: Optional[float] = None
+    optimal_length: Optional[int] = None
+    optimal_version: int = 0
 
     sim_count: int = 0
     success_count: int = 0
@@ -59,6 +218,39 @@ class SimulationState:
     min_success_cost: Optional[float] = None
     max_success_cost: Optional[float] = None
 
+    # walk yang dihentikan prune_walks (dihitung gagal)
+    pruned_count: int = 0
+
+    # aturan berhenti dini (0 = mati), dicek per putaran setelah
+    # STOP_MIN_SIMULATIONS; walk yang sedang jalan tetap diselesaikan
+    stop_ci_halfwidth: float = 0.0
+    stop_patience: int = 0
+    # sim_count saat best_path_cost terakhir turun
+    best_improved_at: int = 0
+    # "max_simulations" / "ci" / "patience" (gabungan shard: "ci+patience")
+    stop_reason: Optional[str] = None
+
+    # importance sampling: jumlah bobot w = exp(log_weight) walk sukses.
+    # Estimasi untuk walk uniform: P(sukses) = success_weight / sim_count,
+    # rata-rata cost sukses = success_weight_cost / success_weight.
+    success_weight: float = 0.0
+    success_weight_sq: float = 0.0
+    success_weight_cost: float = 0.0
+
+    # distribusi panjang & cost jalur sukses (mean/varians, histogram,
+    # kuantil) bermemori tetap; dibuat ulang di reset_stats
+    length_dist: Optional[Distribution] = None
+    cost_dist: Optional[Distribution] = None
+
+    # trie jalur sukses unik + jumlah sampelnya (opsional, ~30 us per sukses)
+    track_paths: bool = False
+    path_trie_max_nodes: int = PATH_TRIE_MAX_NODES
+    path_trie: Optional[PathTrie] = None
+
+    # kalau diisi, tiap walk sukses (dan gagal, kalau include_failed) ditulis
+    # ke file; pemanggil yang membuat dan menutupnya
+    walk_log: Optional[WalkWriter] = None
+
     simulation_done: bool = False
     paused: bool = True
     first_step_after_reset: bool = True
@@ -69,8 +261,12 @@ class SimulationState:
 
     # dipakai main.py untuk rebuild window/canvas
     map_just_resized: bool = False
+    # diganti setiap grid/cost/START/GOAL/ukuran berubah (dipakai cache render)
+    map_version: int = 0
 
     def __post_init__(self):
+        if self.seed is None:
+            self.seed = new_seed()
         self._allocate_grids(self.rows, self.cols)
 
         self.start = (0, 0)
@@ -92,9 +288,10 @@ class SimulationState:
     # ---------- grid allocation / resize ----------
 
     def _allocate_grids(self, rows: int, cols: int):
-        self.grid = [[0 for _ in range(cols)] for _ in range(rows)]
-        self.visit_counts = [[0 for _ in range(cols)] for _ in range(rows)]
-        self.cell_costs = [[0 for _ in range(cols)] for _ in range(rows)]
+        self.grid = GridArray(rows, cols, "b")
+        self.visit_counts = GridArray(rows, cols, "q")
+        self.cell_costs = GridArray(rows, cols, "b")
+        self.neighbors = NeighborTable(rows, cols)
 
     def resize_grid(self, rows: int, cols: int):
         """Resize map dan reset simulasi."""
@@ -112,30 +309,73 @@ class SimulationState:
     def increment_visit(self, pos: Pos):
         r, c = pos
         if 0 <= r < self.rows and 0 <= c < self.cols:
-            self.visit_counts[r][c] += 1
-
-    def create_agent(self) -> Agent:
+            self.visit_cell(r * self.cols + c)
+
+    def visit_cell(self, i: int):
+        """increment_visit dengan index flat (hot path, tanpa cek batas)."""
+        data = self.visit_counts.data
+        count = data[i] + 1
+        data[i] = count
+        self.visit_total += 1
+        if count == 1:
+            self.visit_nonzero += 1
+        if count > self.visit_max:
+            self.visit_max = count
+
+    def clear_visit(self, r: int, c: int):
+        """Nol-kan hitungan satu sel (mis. jadi rintangan) dan jaga ringkasan heatmap."""
+        count = self.visit_counts[r][c]
+        if count == 0:
+            return
+        self.visit_counts[r][c] = 0
+        self.visit_total -= count
+        self.visit_nonzero -= 1
+        # max hanya bisa turun kalau sel ini pemegangnya; jarang (klik user), scan sekali
+        if count == self.visit_max:
+            self.visit_max = max(self.visit_counts.data, default=0)
+
+    def recompute_heat_stats(self):
+        """Hitung ulang ringkasan setelah visit_counts diganti utuh (engine lain, merge)."""
+        data = self.visit_counts.data
+        self.visit_max = max(data, default=0)
+        self.visit_total = sum(data)
+        self.visit_nonzero = len(data) - data.count(0)
+
+    def episode_rng_seed(self, episode: int) -> int:
+        return episode_seed(self.seed, self.episode_base + episode)
+
+    def create_agent(self, episode: int = 0) -> Agent:
+        start_cell = self.start[0] * self.cols + self.start[1]
+        visited = bytearray(self.rows * self.cols)
+        visited[start_cell] = 1
         return Agent(
-            pos=self.start,
-            path=[self.start],
-            visited={self.start},
+            path=array(PATH_TYPECODE, [start_cell]),
+            visited=visited,
             active=True,
             steps=0,
+            cell=start_cell,
+            cost=self.cost_table[start_cell],
+            episode=episode,
+            rng=RandomStream(self.episode_rng_seed(episode)),
         )
 
     def reset_agents(self):
         self.agents = []
-        for _ in range(self.agent_count):
-            a = self.create_agent()
+        for i in range(self.agent_count):
+            a = self.create_agent(i)
             self.agents.append(a)
             self.increment_visit(self.start)
 
     def reset_heatmap(self):
-        self.visit_counts = [[0 for _ in range(self.cols)] for _ in range(self.rows)]
+        self.visit_counts.clear()
+        self.visit_max = 0
+        self.visit_total = 0
+        self.visit_nonzero = 0
 
     def reset_stats(self):
         self.best_path = None
         self.best_path_cost = None
+        self.best_episode = None
 
         self.success_count = 0
         self.total_success_length = 0
@@ -146,9 +386,53 @@ class SimulationState:
         self.min_success_cost = None
         self.max_success_cost = None
 
+        self.pruned_count = 0
+        self.best_improved_at = 0
+        self.stop_reason = None
+        self.success_weight = 0.0
+        self.success_weight_sq = 0.0
+        self.success_weight_cost = 0.0
+        self.length_dist, self.cost_dist = self.new_distributions()
+        self.path_trie = PathTrie(self.path_trie_max_nodes) if self.track_paths else None
         self.sim_count = 0
 
+    def new_distributions(self) -> Tuple[Distribution, Distribution]:
+        """Distribusi panjang & cost kosong. Bin histogram mencakup semua jalur
+        yang mungkin dengan max_steps_per_walk sekarang (cost sel <= 9 titik)."""
+        max_len = self.max_steps_per_walk + 1
+        max_cost = max_len * self.dots_cost_value(9)
+        # lebar bin bulat supaya batas bin mudah dibaca
+        len_width = -(-max_len // HIST_BINS)
+        cost_width = math.ceil(max_cost / HIST_BINS)
+        len_bins = -(-max_len // len_width)
+        cost_bins = math.ceil(max_cost / cost_width)
+        return (Distribution.with_range(1, 1 + len_bins * len_width, len_bins),
+                Distribution.with_range(0, cost_bins * cost_width, cost_bins))
+
+    def reseed(self, seed: Optional[int] = None):
+        """Ganti seed run (None = acak baru) dan reset simulasi."""
+        self.seed = new_seed() if seed is None else seed
+        self.reset_simulation()
+
+    def touch_map(self):
+        """Tandai map berubah (versi baru, unik lintas instance)."""
+        self.map_version = next(_map_versions)
+
+    def rebuild_neighbors(self):
+        self.neighbors.rebuild(self.grid)
+
+    def rebuild_cost_table(self):
+        # cost hanya bergantung jumlah titik (0..9): satu objek float per nilai
+        by_dots = [self.dots_cost_value(dots) for dots in range(10)]
+        self.cost_table = [by_dots[dots] for dots in self.cell_costs.data]
+
     def reset_simulation(self):
+        # map bisa saja diubah langsung (resize, load map), jadi tabel dibangun ulang di sini
+        self.rebuild_neighbors()
+        self.rebuild_cost_table()
+        self.goal_cell = self.goal[0] * self.cols + self.goal[1]
+        self.goal_dist = None
+        self.touch_map()
         self.reset_heatmap()
         self.reset_stats()
         self.simulation_done = False
@@ -158,39 +442,65 @@ class SimulationState:
 
     # ---------- Monte Carlo logic ----------
 
-    def get_valid_neighbors(self, agent: Agent) -> List[Pos]:
-        r, c = agent.pos
-        neighbors = []
-        for dr, dc in MOVES:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                if self.grid[nr][nc] == 0 and (nr, nc) not in agent.visited:
-                    neighbors.append((nr, nc))
-        return neighbors
+    def get_valid_neighbors(self, agent: Agent) -> List[int]:
+        """Index flat tetangga terbuka yang belum dikunjungi agen (urutan MOVES)."""
+        visited = agent.visited
+        cell = agent.cell
+        table = self.neighbors
+        return [cell + d for d in table.deltas[table.masks[cell]] if not visited[cell + d]]
 
-    def get_cell_cost_value(self, r: int, c: int) -> float:
-        dots = self.cell_costs[r][c]
+    @staticmethod
+    def dots_cost_value(dots: int) -> float:
         return 1.0 + 0.2 * dots
 
+    def get_cell_cost_value(self, r: int, c: int) -> float:
+        return self.dots_cost_value(self.cell_costs[r][c])
+
     def compute_path_cost(self, path: Path) -> float:
         return sum(self.get_cell_cost_value(r, c) for (r, c) in path)
 
+    def compute_cells_cost(self, cells) -> float:
+        """compute_path_cost untuk path ringkas (index flat)."""
+        cost_table = self.cost_table
+        return sum(cost_table[i] for i in cells)
+
+    def on_cell_cost_changed(self, r: int, c: int):
+        """Update cost_table, dan cost berjalan agen yang path-nya melewati (r, c)."""
+        i = r * self.cols + c
+        self.cost_table[i] = self.get_cell_cost_value(r, c)
+        for agent in self.agents:
+            if agent.active and agent.visited[i]:
+                agent.cost = self.compute_cells_cost(agent.cells())
+
     def handle_success(self, agent: Agent):
-        path_len = len(agent.path)
-        path_cost = self.compute_path_cost(agent.path)
+        path_len = agent.path_len
+        path_cost = agent.cost
 
         self.success_count += 1
         self.total_success_length += path_len
         self.total_success_cost += path_cost
-
-        if self.best_path is None:
-            self.best_path = agent.path.copy()
+        self.length_dist.add(path_len)
+        self.cost_dist.add(path_cost)
+        if self.path_trie is not None:
+            self.path_trie.add(agent.path, path_len, path_cost)
+
+        weight = math.exp(agent.log_weight)
+        self.success_weight += weight
+        self.success_weight_sq += weight * weight
+        self.success_weight_cost += weight * path_cost
+
+        episode = self.episode_base + agent.episode
+        if self.best_path_cost is None or path_cost < self.best_path_cost - 1e-9:
+            self.best_improved_at = self.sim_count
+        if self.best_path is None or is_better_path(
+                path_cost, path_len, episode,
+                self.best_path_cost, len(self.best_path), self.best_episode):
+            self.best_path = agent.cells()
             self.best_path_cost = path_cost
-        else:
-            if (path_cost < self.best_path_cost - 1e-9) or \
-               (abs(path_cost - self.best_path_cost) < 1e-9 and path_len < len(self.best_path)):
-                self.best_path = agent.path.copy()
-                self.best_path_cost = path_cost
+            self.best_episode = episode
+
+        if self.walk_log is not None:
+            self.log_walk(agent, OUTCOME_SUCCESS)
 
         if self.min_success_length is None or path_len < self.min_success_length:
             self.min_success_length = path_len
@@ -208,9 +518,11 @@ class SimulationState:
 
         if agent.steps >= self.max_steps_per_walk:
             agent.active = False
+            if self.walk_log is not None:
+                self.log_walk(agent, OUTCOME_MAX_STEPS)
             return
 
-        if agent.pos == self.goal:
+        if agent.cell == self.goal_cell:
             self.handle_success(agent)
             agent.active = False
             return
@@ -218,34 +530,293 @@ class SimulationState:
         neighbors = self.get_valid_neighbors(agent)
         if not neighbors:
             agent.active = False
+            if self.walk_log is not None:
+                self.log_walk(agent, OUTCOME_DEAD_END)
             return
 
-        next_pos = random.choice(neighbors)
-        agent.pos = next_pos
-        agent.path.append(next_pos)
-        agent.visited.add(next_pos)
+        prev_cell = agent.cell
+        if self.walk_policy == "biased":
+            next_cell = self.choose_biased(agent, neighbors)
+        else:
+            next_cell = neighbors[agent.rng.randbelow(len(neighbors))]
+        agent.cell = next_cell
+        n = agent.path_len
+        try:
+            agent.path[n] = next_cell
+        except IndexError:
+            # buffer hanya tumbuh saat walk lebih panjang dari yang pernah ada
+            agent.path.append(next_cell)
+        agent.path_len = n + 1
+        agent.visited[next_cell] = 1
+        agent.cost += self.cost_table[next_cell]
         agent.steps += 1
-        self.increment_visit(next_pos)
+        self.visit_cell(next_cell)
 
-        if agent.pos == self.goal:
+        if next_cell == self.goal_cell:
             self.handle_success(agent)
             agent.active = False
+        elif self.prune_walks and self.walk_is_doomed(agent, prev_cell, neighbors):
+            agent.active = False
+            self.pruned_count += 1
+            if self.walk_log is not None:
+                self.log_walk(agent, OUTCOME_PRUNED)
+
+    def log_walk(self, agent: Agent, outcome: int):
+        self.walk_log.write(agent.path, agent.path_len, agent.cost,
+                            self.episode_base + agent.episode, outcome)
+
+    def choose_biased(self, agent: Agent, options: List[int]) -> int:
+        """Pilih tetangga dengan bobot cost dan arah ke GOAL; catat likelihood ratio.
+
+        Tetangga yang tidak bisa sampai GOAL (goal_dist -1) tidak dipilih,
+        jadi estimasi hanya berlaku untuk besaran walk sukses (peluang dan
+        cost sukses), bukan panjang walk gagal.
+        """
+        dist = self.goal_distances()
+        here = dist[agent.cell]
+        cost_table = self.cost_table
+        beta = self.bias_cost
+        toward = math.exp(self.bias_goal)
+        away = 1.0 / toward
+
+        weights = []
+        total = 0.0
+        for n in options:
+            d = dist[n]
+            if d < 0:
+                w = 0.0
+            else:
+                w = math.exp(-beta * (cost_table[n] - 1.0)) * (toward if d < here or here < 0 else away)
+            weights.append(w)
+            total += w
+        if total <= 0.0:
+            # semua buntu: walk pasti gagal, bobot tidak dipakai
+            return options[agent.rng.randbelow(len(options))]
+
+        u = agent.rng.random() * total
+        for i, w in enumerate(weights):
+            if w > 0.0:
+                k = i
+                if u < w:
+                    break
+                u -= w
+        # P_uniform = 1/len(options), P_biased = weights[k] / total
+        agent.log_weight += math.log(total / (len(options) * weights[k]))
+        return options[k]
+
+    def update_optimal(self, force: bool = False):
+        """Hitung ulang solusi eksak kalau map berubah sejak terakhir dihitung.
+
+        Tanpa force, map lebih besar dari ORACLE_MAX_CELLS dilewati (A* Python
+        butuh beberapa detik di map 1000 x 1000).
+        """
+        if self.optimal_version == self.map_version:
+            return
+        self.optimal_cost = self.optimal_length = None
+        if not force and self.rows * self.cols > ORACLE_MAX_CELLS:
+            return
+        result = shortest_path(self)
+        if result is not None:
+            self.optimal_cost, cells = result
+            self.optimal_length = len(cells)
+        self.optimal_version = self.map_version
+
+    # ---------- pruning ----------
+
+    def goal_distances(self) -> array:
+        if self.goal_dist is None:
+            goal = self.goal_cell
+            if self.grid.data[goal] == 0:
+                self.goal_dist = self.neighbors.distances_to(goal)
+            else:
+                # GOAL rintangan: tidak bisa dimasuki dari mana pun
+                self.goal_dist = array("i", [-1]) * (self.rows * self.cols)
+        return self.goal_dist
+
+    def walk_is_doomed(self, agent: Agent, prev_cell: int, options: List[int]) -> bool:
+        """True kalau walk yang baru pindah dari prev_cell pasti tidak sampai GOAL.
+
+        options = tetangga bebas prev_cell sebelum pindah (termasuk sel
+        sekarang). Cek sisa step vs goal_dist selalu jalan; pencarian kantong
+        (prune_pockets) hanya di langkah yang meninggalkan sel dengan tepat 2
+        tetangga bebas yang tidak terhubung lewat sudut, yaitu lorong yang
+        benar-benar bisa terputus.
+        """
+        dist = self.goal_distances()[agent.cell]
+        if dist < 0 or dist > self.max_steps_per_walk - agent.steps:
+            return True
+        if self.prune_pockets and len(options) == 2 \
+                and self.splits_free_space(agent, prev_cell, options):
+            return not self.goal_reachable(agent, options)
+        return False
+
+    def splits_free_space(self, agent: Agent, cell: int, options: List[int]) -> bool:
+        """True kalau tetangga bebas cell (options) tidak saling terhubung lewat
+        sel sudut di sekitarnya, jadi menutup cell bisa memecah ruang bebas."""
+        masks = self.neighbors.masks
+        visited = agent.visited
+        links = 0
+        for d1, d2, k2 in self.neighbors.corners:
+            a = cell + d1
+            if a in options and cell + d2 in options and masks[a] >> k2 & 1 \
+                    and not visited[a + d2]:
+                links += 1
+        # 4 tetangga + 4 sudut = satu lingkaran utuh
+        return links < 4 and len(options) - links > 1
+
+    def goal_reachable(self, agent: Agent, options: List[int]) -> bool:
+        """Apakah GOAL masih bisa dicapai dari posisi agen lewat sel bebas.
+
+        Ruang bebas hanya bisa terpecah di sel yang baru ditinggalkan, jadi
+        tiap tetangga bebasnya (options) ditelusuri bergiliran, satu sel per
+        giliran, dan penelusuran yang bertemu digabung. Selesai begitu grup
+        agen menyentuh GOAL, habis, atau tinggal sendirian, jadi biayanya
+        sebanding kantong terkecil. Lewat PRUNE_SEARCH_LIMIT sel dianggap
+        terjangkau (walk tidak dipangkas). Sel dengan goal_dist -1 = tembok.
+        """
+        goal = self.goal_cell
+        dist = self.goal_dist
+        masks, deltas = self.neighbors.masks, self.neighbors.deltas
+        visited = agent.visited
+
+        seeds = [cell for cell in options if dist[cell] >= 0]
+        me = seeds.index(agent.cell)
+        owner = {cell: k for k, cell in enumerate(seeds)}
+        root = list(range(len(seeds)))
+        stacks = [[cell] for cell in seeds]
+        goal_root = None
+
+        def find(k):
+            while root[k] != k:
+                k = root[k]
+            return k
+
+        budget = PRUNE_SEARCH_LIMIT
+        while budget > 0:
+            alive = 0
+            for k in range(len(seeds)):
+                stack = stacks[k]
+                if root[k] != k or not stack:
+                    continue
+                budget -= 1
+                cell = stack.pop()
+                for d in deltas[masks[cell]]:
+                    n = cell + d
+                    if visited[n] or dist[n] < 0:
+                        continue
+                    if n == goal:
+                        # GOAL tidak ditelusuri; grup yang menyentuhnya
+                        # saling terhubung lewat GOAL
+                        if goal_root is None:
+                            goal_root = k
+                            continue
+                        other = goal_root
+                    else:
+                        other = owner.get(n)
+                        if other is None:
+                            owner[n] = k
+                            stack.append(n)
+                            continue
+                    other = find(other)
+                    if other != k:
+                        root[other] = k
+                        stack.extend(stacks[other])
+                        stacks[other] = []
+                if stack:
+                    alive += 1
+
+            mine = find(me)
+            if goal_root is not None and find(goal_root) == mine:
+                return True
+            if not stacks[mine]:
+                return False
+            if goal_root is None and alive == 1:
+                # grup lain tertutup tanpa GOAL; sebelum langkah ini GOAL
+                # masih terjangkau, jadi GOAL ada di grup agen
+                return True
+        return True
 
     def restart_agent_if_possible(self, agent: Agent) -> bool:
         if self.sim_count >= self.max_simulations:
             return False
 
-        agent.pos = self.start
-        agent.path = [self.start]
-        agent.visited = {self.start}
+        # reset visited di tempat: cukup hapus sel yang ada di path lama
+        visited = agent.visited
+        for i in agent.cells():
+            visited[i] = 0
+        start_cell = self.start[0] * self.cols + self.start[1]
+        visited[start_cell] = 1
+
+        # episode baru = stream RNG baru, tidak bergantung agen/urutan
+        agent.episode = self.sim_count
+        agent.rng.seed(self.episode_rng_seed(agent.episode))
+
+        agent.cell = start_cell
+        agent.cost = self.cost_table[start_cell]
+        agent.path[0] = start_cell
+        agent.path_len = 1
+        agent.log_weight = 0.0
         agent.active = True
         agent.steps = 0
         self.sim_count += 1
         self.increment_visit(self.start)
         return True
 
-    def step_frame(self):
+    def step_round(self) -> bool:
+        """Satu langkah untuk semua agen + restart. False kalau simulasi selesai."""
+        for agent in self.agents:
+            self.step_agent(agent)
+
+        # aturan dini dikunci begitu terpenuhi; batas max_simulations tidak,
+        # supaya menaikkan max saat walk terakhir masih jalan tetap berlaku
+        if self.stop_reason is None:
+            self.stop_reason = self.check_stop_rules()
+
+        if self.stop_reason is None and self.sim_count < self.max_simulations:
+            remaining = self.max_simulations - self.sim_count
+            for agent in self.agents:
+                if not agent.active and remaining > 0:
+                    if self.restart_agent_if_possible(agent):
+                        remaining -= 1
+                    else:
+                        break
+
+        if (self.stop_reason is not None or self.sim_count >= self.max_simulations) \
+                and all(not a.active for a in self.agents):
+            if self.stop_reason is None:
+                self.stop_reason = "max_simulations"
+            self.simulation_done = True
+            return False
+        return True
+
+    @property
+    def distinct_paths(self) -> Optional[int]:
+        return self.path_trie.distinct if self.path_trie is not None else None
+
+    @property
+    def top_path_share(self) -> Optional[float]:
+        return self.path_trie.top_share() if self.path_trie is not None else None
+
+    def completed_count(self) -> int:
+        """Walk yang sudah selesai (sim_count juga menghitung walk yang masih jalan)."""
+        return self.sim_count - sum(1 for a in self.agents if a.active)
+
+    def check_stop_rules(self) -> Optional[str]:
+        """Aturan berhenti dini yang terpenuhi, atau None."""
+        if self.sim_count < STOP_MIN_SIMULATIONS:
+            return None
+        if self.stop_patience > 0 and self.sim_count - self.best_improved_at >= self.stop_patience:
+            return "patience"
+        if self.stop_ci_halfwidth > 0:
+            _, half = success_rate_ci(self, self.completed_count())
+            if half <= self.stop_ci_halfwidth:
+                return "ci"
+        return None
+
+    def step_frame(self, budget_ms: Optional[float] = None):
+        """Satu frame simulasi. budget_ms (mode budget) default frame_budget_ms."""
         if self.paused or self.simulation_done:
+            self.update_visit_rate()
             return
 
         if self.first_step_after_reset:
@@ -253,23 +824,57 @@ class SimulationState:
             self.sim_count = min(active_agents, self.max_simulations)
             self.first_step_after_reset = False
 
-        for _ in range(self.steps_per_frame):
-            for agent in self.agents:
-                self.step_agent(agent)
-
-            if self.sim_count < self.max_simulations:
-                remaining = self.max_simulations - self.sim_count
-                for agent in self.agents:
-                    if not agent.active and remaining > 0:
-                        if self.restart_agent_if_possible(agent):
-                            remaining -= 1
-                        else:
-                            break
-
-            if self.sim_count >= self.max_simulations and all(not a.active for a in self.agents):
-                self.simulation_done = True
+        if self.step_mode == "budget":
+            if budget_ms is None:
+                budget_ms = self.frame_budget_ms
+            self.step_for_budget(budget_ms / 1000.0)
+        else:
+            for _ in range(self.steps_per_frame):
+                if not self.step_round():
+                    break
+
+        self.update_visit_rate()
+
+    def step_for_budget(self, budget_s: float):
+        """Jalankan putaran sampai budget (detik) habis.
+
+        Putaran dijalankan per blok; ukuran blok dari ongkos putaran terukur
+        (EMA) supaya jam tidak dibaca tiap putaran tapi deadline tetap tepat.
+        """
+        now = time.perf_counter()
+        deadline = now + budget_s
+        while now < deadline:
+            cost = self.round_cost_s
+            # blok ~1/4 sisa waktu; tanpa estimasi mulai dari 1 putaran
+            rounds = max(1, int((deadline - now) * 0.25 / cost)) if cost > 0 else 1
+            t0 = now
+            done = 0
+            while done < rounds:
+                done += 1
+                if not self.step_round():
+                    break
+            now = time.perf_counter()
+            per_round = (now - t0) / done
+            self.round_cost_s = per_round if cost <= 0 else 0.8 * cost + 0.2 * per_round
+            if self.simulation_done:
                 break
 
+    def update_visit_rate(self):
+        """Perbarui visits_per_sec dari jumlah kunjungan heatmap per jendela waktu."""
+        now = time.perf_counter()
+        visits = self.visit_total
+        if visits < self.rate_window_visits:
+            # heatmap di-reset: mulai jendela baru
+            self.rate_window_start = now
+            self.rate_window_visits = visits
+            self.visits_per_sec = 0.0
+            return
+        elapsed = now - self.rate_window_start
+        if elapsed >= STEP_RATE_WINDOW_S:
+            self.visits_per_sec = (visits - self.rate_window_visits) / elapsed
+            self.rate_window_start = now
+            self.rate_window_visits = visits
+
     # ---------- Interaksi grid (mouse) ----------
 
     def handle_grid_click(self, r: int, c: int, button: int):
@@ -278,13 +883,22 @@ class SimulationState:
                 if (r, c) != self.start and (r, c) != self.goal:
                     if self.grid[r][c] == 0:
                         self.grid[r][c] = 1
-                        self.cell_costs[r][c] = 0
-                        self.visit_counts[r][c] = 0
+                        self.clear_visit(r, c)
+                        if self.cell_costs[r][c] != 0:
+                            self.cell_costs[r][c] = 0
+                            self.on_cell_cost_changed(r, c)
                     else:
                         self.grid[r][c] = 0
+                    self.neighbors.patch(self.grid, r, c)
+                    self.goal_dist = None
+                    self.touch_map()
             elif self.cursor_mode == "cost":
                 if self.grid[r][c] == 0:
-                    self.cell_costs[r][c] = max(0, min(9, self.current_cost_value))
+                    value = max(0, min(9, self.current_cost_value))
+                    if self.cell_costs[r][c] != value:
+                        self.cell_costs[r][c] = value
+                        self.on_cell_cost_changed(r, c)
+                        self.touch_map()
 
         elif button == 2:
             if (r, c) != self.goal:
@@ -295,3 +909,11 @@ class SimulationState:
             if (r, c) != self.start:
                 self.goal = (r, c)
                 self.reset_simulation()
+
+
+if __name__ == "__main__":
+    # python -m simulation run ... (mode headless, tanpa pygame)
+    import sys
+    from headless import main
+
+    sys.exit(main())
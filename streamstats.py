@@ -0,0 +1,212 @@
+# streamstats.py
+#
+# Estimator streaming bermemori tetap untuk distribusi panjang & cost jalur
+# sukses: momen Welford (mean/varians), histogram bin tetap, dan sketch
+# kuantil ala DDSketch (error relatif terbatas). Nilai tidak disimpan satu
+# per satu; semuanya bisa di-merge, jadi hasil shard / run bisa digabung.
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import HIST_BINS, SKETCH_RELATIVE_ACCURACY, SKETCH_MAX_BUCKETS
+
+try:
+    import numpy as np
+except ImportError:  # add_array saja yang butuh numpy
+    np = None
+
+
+@dataclass
+class Moments:
+    """Count, mean, varians (Welford); merge pakai rumus Chan dkk."""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def add(self, x: float):
+        self.count += 1
+        d = x - self.mean
+        self.mean += d / self.count
+        self.m2 += d * (x - self.mean)
+
+    def merge(self, other: "Moments"):
+        if other.count == 0:
+            return
+        n = self.count + other.count
+        d = other.mean - self.mean
+        self.mean += d * other.count / n
+        self.m2 += other.m2 + d * d * self.count * other.count / n
+        self.count = n
+
+    @property
+    def variance(self) -> float:
+        """Varians sampel (n - 1)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+@dataclass
+class Histogram:
+    """Bin lebar sama di [lo, hi), plus bin underflow (0) dan overflow (bins + 1)."""
+    lo: float
+    hi: float
+    bins: int = HIST_BINS
+    counts: List[int] = field(default_factory=list)
+
+    def __post_init__(self):
+        if not self.counts:
+            self.counts = [0] * (self.bins + 2)
+        self._scale = self.bins / (self.hi - self.lo)
+
+    def add(self, x: float):
+        if x < self.lo:
+            self.counts[0] += 1
+        elif x >= self.hi:
+            self.counts[-1] += 1
+        else:
+            self.counts[1 + min(int((x - self.lo) * self._scale), self.bins - 1)] += 1
+
+    def merge(self, other: "Histogram"):
+        if (self.lo, self.hi, self.bins) != (other.lo, other.hi, other.bins):
+            raise ValueError("bin histogram berbeda, tidak bisa digabung")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+
+    def edges(self, i: int) -> Tuple[float, float]:
+        """Batas [a, b) bin ke-i (0 = underflow, bins + 1 = overflow)."""
+        width = (self.hi - self.lo) / self.bins
+        if i == 0:
+            return -math.inf, self.lo
+        if i == self.bins + 1:
+            return self.hi, math.inf
+        return self.lo + (i - 1) * width, self.lo + i * width
+
+
+@dataclass
+class QuantileSketch:
+    """Kuantil dengan error relatif <= alpha untuk nilai > 0 (DDSketch).
+
+    Nilai x masuk bucket k = ceil(log_gamma(x)), gamma = (1 + alpha) / (1 - alpha);
+    kuantil dibaca dari titik tengah bucket. Kalau bucket melebihi max_buckets,
+    bucket terkecil dilebur (kuantil rendah kehilangan akurasi lebih dulu).
+    """
+    alpha: float = SKETCH_RELATIVE_ACCURACY
+    max_buckets: int = SKETCH_MAX_BUCKETS
+    buckets: Dict[int, int] = field(default_factory=dict)
+    # nilai <= 0 tidak punya bucket log
+    zero_count: int = 0
+    count: int = 0
+
+    def __post_init__(self):
+        self._gamma = (1 + self.alpha) / (1 - self.alpha)
+        self._inv_log_gamma = 1.0 / math.log(self._gamma)
+
+    def add(self, x: float):
+        self.count += 1
+        if x <= 0:
+            self.zero_count += 1
+            return
+        k = math.ceil(math.log(x) * self._inv_log_gamma)
+        buckets = self.buckets
+        buckets[k] = buckets.get(k, 0) + 1
+        if len(buckets) > self.max_buckets:
+            self._collapse()
+
+    def merge(self, other: "QuantileSketch"):
+        if self.alpha != other.alpha:
+            raise ValueError("akurasi sketch berbeda, tidak bisa digabung")
+        buckets = self.buckets
+        for k, n in other.buckets.items():
+            buckets[k] = buckets.get(k, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if len(buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self):
+        keys = sorted(self.buckets)
+        excess = len(keys) - self.max_buckets
+        target = keys[excess]
+        for k in keys[:excess]:
+            self.buckets[target] += self.buckets.pop(k)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for k in sorted(self.buckets):
+            seen += self.buckets[k]
+            if seen > rank:
+                return 2 * self._gamma ** k / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.buckets) / (self._gamma + 1)
+
+
+@dataclass
+class Distribution:
+    """Moments + Histogram + QuantileSketch untuk satu besaran (panjang / cost)."""
+    hist: Histogram
+    moments: Moments = field(default_factory=Moments)
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+
+    @classmethod
+    def with_range(cls, lo: float, hi: float, bins: int = HIST_BINS) -> "Distribution":
+        return cls(hist=Histogram(lo, hi, bins))
+
+    @property
+    def count(self) -> int:
+        return self.moments.count
+
+    def add(self, x: float):
+        self.moments.add(x)
+        self.hist.add(x)
+        self.sketch.add(x)
+
+    def add_many(self, values: Iterable[float]):
+        for x in values:
+            self.add(x)
+
+    def add_array(self, values):
+        """add_many untuk array numpy 1-D: diringkas per batch lalu di-merge."""
+        n = len(values)
+        if n == 0:
+            return
+        values = values.astype(np.float64)
+        mean = float(values.mean())
+        self.moments.merge(Moments(n, mean, float(np.square(values - mean).sum())))
+
+        h = self.hist
+        idx = np.minimum(((values - h.lo) * h._scale).astype(np.int64), h.bins - 1) + 1
+        idx[values < h.lo] = 0
+        idx[values >= h.hi] = h.bins + 1
+        counts = np.bincount(idx, minlength=h.bins + 2)
+        h.counts = [a + b for a, b in zip(h.counts, counts.tolist())]
+
+        s = self.sketch
+        pos = values[values > 0]
+        keys, key_counts = np.unique(np.ceil(np.log(pos) * s._inv_log_gamma).astype(np.int64),
+                                     return_counts=True)
+        s.merge(QuantileSketch(s.alpha, s.max_buckets,
+                               dict(zip(keys.tolist(), key_counts.tolist())),
+                               zero_count=n - len(pos), count=n))
+
+    def merge(self, other: "Distribution"):
+        self.moments.merge(other.moments)
+        self.hist.merge(other.hist)
+        self.sketch.merge(other.sketch)
+
+    def quantiles(self, qs=(0.5, 0.9, 0.99)) -> List[Optional[float]]:
+        return [self.sketch.quantile(q) for q in qs]
+
+    def copy(self) -> "Distribution":
+        m, h, s = self.moments, self.hist, self.sketch
+        return Distribution(
+            hist=Histogram(h.lo, h.hi, h.bins, list(h.counts)),
+            moments=Moments(m.count, m.mean, m.m2),
+            sketch=QuantileSketch(s.alpha, s.max_buckets, dict(s.buckets), s.zero_count, s.count),
+        )
@@ -2,19 +2,68 @@
 
 import pygame
 
+try:
+    import numpy as np
+except ImportError:  # numpy opsional: tanpa numpy zoom out memakai sampling
+    np = None
+
 from config import (
     GRID_ORIGIN_X, GRID_ORIGIN_Y,
     SIDEBAR_WIDTH,
+    VIEWPORT_MAX_W, VIEWPORT_MAX_H, ZOOM_LEVELS,
+    GRID_LINE_MIN_PX, COST_DOT_MIN_PX, MARKER_MIN_PX, HEAT_TILE,
+    MIN_GRID_SIZE, MAX_GRID_ROWS, MAX_GRID_COLS,
     WHITE, BLACK, GRAY, GREEN, RED, BLUE,
     BG, PANEL_BG, PANEL_BORDER,
+    PROFILE_TRACE_FRAMES,
 )
 
-from simulation import SimulationState
+from simulation import (
+    SimulationState, decode_path, importance_estimates, optimality_gap,
+    success_rate_ci, describe_stop,
+)
 
 
 # =========================================================
 # Sumber tunggal semua teks sidebar (NO DUPLICATION)
 # =========================================================
+# Kontrol & legend tidak pernah berubah
+CONTROLS_LINES = [
+    "[Kontrol]",
+    "SPACE : Start / Pause",
+    "R     : Reset simulasi (seed baru)",
+    "Z / X : Agen - / +",
+    "C / V : Steps/frame (atau budget ms) - / +",
+    "B     : Mode step: tetap / budget waktu",
+    "P     : Pangkas walk pasti gagal on/off",
+    "W     : Policy walk: uniform / biased",
+    "T     : Berhenti dini (CI / sabar) on/off",
+    "U     : Hitung jalur unik on/off",
+    "O     : Overlay profiler on/off",
+    f"J     : Rekam trace Chrome ({PROFILE_TRACE_FRAMES} frame)",
+    "[ / ] : Max simulations - / +",
+    ", / . : Max steps/episode - / +",
+    f"N / M : Baris - / + ({MIN_GRID_SIZE}..{MAX_GRID_ROWS})",
+    f"K / L : Kolom - / + ({MIN_GRID_SIZE}..{MAX_GRID_COLS})",
+    "Panah : Geser peta | - / = , roda: Zoom",
+    "1     : Cursor mode Obstacle",
+    "2     : Cursor mode Cost",
+    "F     : Toggle window size",
+    "ESC   : Keluar",
+]
+
+LEGEND_LINES = [
+    "[Mouse & Legend]",
+    "Left  : Edit (sesuai mode cursor)",
+    "Middle: Set START | Right: Set GOAL",
+    "Putih : Jalan | Hitam : Rintangan",
+    "Hijau : START | Merah : GOAL",
+    "Hijau  : Best path | Biru: Jalur agen",
+    "Merah pekat: sering dilalui",
+    "Titik hitam: cost 1-9 (dipakai di best cost)",
+]
+
+
 def build_sidebar_sections(sim: SimulationState):
     """Sumber tunggal semua teks sidebar."""
     line_h = 16
@@ -22,6 +71,30 @@ def build_sidebar_sections(sim: SimulationState):
     # ===== Statistik =====
     best_len = len(sim.best_path) if sim.best_path is not None else "-"
     best_cost_str = f"{sim.best_path_cost:.2f}" if sim.best_path_cost is not None else "-"
+    if sim.optimal_version != sim.map_version:
+        # belum dihitung untuk map ini (menunggu map diam, atau terlalu besar)
+        optimal_str = "-"
+    elif sim.optimal_cost is not None:
+        gap = optimality_gap(sim)
+        optimal_str = f"{sim.optimal_cost:.2f}"
+        if gap is not None:
+            optimal_str += f" (gap {gap * 100:.1f}%)"
+    else:
+        optimal_str = "tidak ada jalur"
+    stop_rules = []
+    if sim.stop_ci_halfwidth > 0:
+        _, half = success_rate_ci(sim, sim.sim_count)
+        half_str = f"{half * 100:.1f}%" if sim.sim_count > 0 else "-"
+        stop_rules.append(f"CI ±{sim.stop_ci_halfwidth * 100:g}% (kini {half_str})")
+    if sim.stop_patience > 0:
+        stop_rules.append(f"sabar {sim.sim_count - sim.best_improved_at}/{sim.stop_patience}")
+    stop_rules_str = ", ".join(stop_rules) if stop_rules else "OFF"
+    if not sim.track_paths:
+        paths_str = "OFF"
+    elif sim.top_path_share is None:
+        paths_str = "0"
+    else:
+        paths_str = f"{sim.distinct_paths} (top {sim.top_path_share * 100:.1f}%)"
     success_rate = (sim.success_count / sim.sim_count * 100) if sim.sim_count > 0 else 0.0
     avg_len = (sim.total_success_length / sim.success_count) if sim.success_count > 0 else 0
     avg_cost = (sim.total_success_cost / sim.success_count) if sim.success_count > 0 else 0.0
@@ -30,12 +103,20 @@ def build_sidebar_sections(sim: SimulationState):
         "[Statistik]",
         f"Simulasi: {sim.sim_count}/{sim.max_simulations}",
         f"Agen      : {sim.agent_count}",
-        f"Steps/frame: {sim.steps_per_frame}",
+        (f"Budget: {sim.frame_budget_ms:.0f} ms/frame" if sim.step_mode == "budget"
+         else f"Steps/frame: {sim.steps_per_frame}"),
+        f"Kunjungan/detik: {sim.visits_per_sec:,.0f}",
         f"Max steps/episode: {sim.max_steps_per_walk}",
+        (f"Pangkas: ON ({sim.pruned_count} walk)" if sim.prune_walks else "Pangkas: OFF"),
+        f"Policy: {sim.walk_policy}",
+        f"Stop: {stop_rules_str}",
+        f"Jalur unik: {paths_str}",
         f"Best length: {best_len}",
         f"Best cost  : {best_cost_str}",
+        f"Optimal    : {optimal_str}",
         f"Sukses: {sim.success_count} ({success_rate:.1f}%)",
         f"Map size: {sim.rows} x {sim.cols}",
+        f"Seed: {sim.seed}",
     ]
     if sim.success_count > 0:
         stats_lines += [
@@ -43,13 +124,23 @@ def build_sidebar_sections(sim: SimulationState):
             f"Min/Max len: {sim.min_success_length}/{sim.max_success_length}",
             f"Avg cost: {avg_cost:.2f}",
             f"Min/Max cost: {sim.min_success_cost:.2f}/{sim.max_success_cost:.2f}",
+            f"Sd len/cost: {sim.length_dist.moments.std:.1f}/{sim.cost_dist.moments.std:.1f}",
+            "p50/90/99 len: " + "/".join(f"{q:.0f}" for q in sim.length_dist.quantiles()),
+            "p50/90/99 cost: " + "/".join(f"{q:.1f}" for q in sim.cost_dist.quantiles()),
         ]
     else:
         stats_lines.append("Belum ada jalur sukses.")
+    if sim.walk_policy != "uniform":
+        rate, mean_cost, ess = importance_estimates(sim)
+        mean_str = f"{mean_cost:.2f}" if mean_cost is not None else "-"
+        stats_lines += [
+            f"Est. uniform: {rate * 100:.1f}% sukses",
+            f"Est. avg cost: {mean_str} (ESS {ess:.0f})",
+        ]
 
     # ===== Status =====
     if sim.simulation_done:
-        status_text = "DONE"
+        status_text = f"DONE ({sim.stop_reason})" if sim.stop_reason else "DONE"
     elif not sim.paused:
         status_text = "RUNNING"
     elif sim.paused and sim.sim_count > 0:
@@ -70,49 +161,30 @@ def build_sidebar_sections(sim: SimulationState):
     if sim.paused and not sim.simulation_done:
         status_lines.append("SPACE: Start / Pause")
     if sim.simulation_done:
+        status_lines.append(f"Berhenti: {describe_stop(sim)}")
         status_lines.append("Simulasi selesai. Tekan R untuk reset.")
 
-    # ===== Kontrol =====
-    controls_lines = [
-        "[Kontrol]",
-        "SPACE : Start / Pause",
-        "R     : Reset simulasi",
-        "Z / X : Agen - / +",
-        "C / V : Steps/frame - / +",
-        "[ / ] : Max simulations - / +",
-        ", / . : Max steps/episode - / +",
-        "N / M : Baris - / + (5..15)",
-        "K / L : Kolom - / + (5..23)",
-        "1     : Cursor mode Obstacle",
-        "2     : Cursor mode Cost",
-        "F     : Toggle window size",
-        "ESC   : Keluar",
-    ]
-
-    # ===== Legend =====
-    legend_lines = [
-        "[Mouse & Legend]",
-        "Left  : Edit (sesuai mode cursor)",
-        "Middle: Set START | Right: Set GOAL",
-        "Putih : Jalan | Hitam : Rintangan",
-        "Hijau : START | Merah : GOAL",
-        "Hijau  : Best path | Biru: Jalur agen",
-        "Merah pekat: sering dilalui",
-        "Titik hitam: cost 1-9 (dipakai di best cost)",
-    ]
-
     return {
         "line_h": line_h,
         "stats": stats_lines,
         "status": status_lines,
-        "controls": controls_lines,
-        "legend": legend_lines,
+        "controls": CONTROLS_LINES,
+        "legend": LEGEND_LINES,
     }
 
 
-def get_sidebar_height(sim: SimulationState, font, font_title):
-    """Hitung tinggi sidebar sesuai konten teks yang digambar."""
-    sec = build_sidebar_sections(sim)
+def get_sidebar_height(sim: SimulationState, font, font_title, sec=None):
+    """Hitung tinggi sidebar sesuai konten teks yang digambar.
+
+    sec: hasil build_sidebar_sections(sim) kalau sudah ada (dibangun sekali
+    per frame di main.py); tinggi hanya bergantung pada jumlah baris.
+    """
+    if sec is None:
+        sec = build_sidebar_sections(sim)
+    return _compute_sidebar_height(sec)
+
+
+def _compute_sidebar_height(sec) -> int:
     line_h = sec["line_h"]
     y = GRID_ORIGIN_Y + 10
 
@@ -148,13 +220,13 @@ def get_sidebar_height(sim: SimulationState, font, font_title):
 # =========================================================
 # Render GRID + PATH
 # =========================================================
-def draw_cost_dots(surface, r, c, cost, cell_size):
+def draw_cost_dots(surface, r, c, cost, cell_size, origin=(GRID_ORIGIN_X, GRID_ORIGIN_Y)):
     if cost <= 0:
         return
     cost = min(cost, 9)
 
-    cx = GRID_ORIGIN_X + c * cell_size + cell_size // 2
-    cy = GRID_ORIGIN_Y + r * cell_size + cell_size // 2
+    cx = origin[0] + c * cell_size + cell_size // 2
+    cy = origin[1] + r * cell_size + cell_size // 2
 
     offsets = [
         (-1, -1), (0, -1), (1, -1),
@@ -172,93 +244,481 @@ def draw_cost_dots(surface, r, c, cost, cell_size):
         pygame.draw.circle(surface, BLACK, (x, y), radius)
 
 
-def draw_grid(surface, sim: SimulationState, cell_size: int, font, font_title):
-    surface.fill(BG)
+# warna transparan untuk layer statis (tidak dipakai di tempat lain)
+COLORKEY = (255, 0, 255)
+
+
+def heat_color(count: int, max_count: int):
+    if max_count > 0 and count > 0:
+        ratio = count / max_count
+        gb = int(255 * (1 - ratio))
+        return (255, gb, gb)
+    return WHITE
+
+
+# heat_color sebagai palette 8-bit: index = komponen hijau/biru (255 = putih)
+HEAT_PALETTE = [(255, gb, gb) for gb in range(256)]
+# layer rintangan: index 0 = transparan, 1 = rintangan
+OBSTACLE_PALETTE = [COLORKEY, BLACK] + [COLORKEY] * 254
+
+
+def grid_view_size(sim: SimulationState, cell_size: int):
+    """Ukuran area grid di layar: seluruh map kalau muat, selain itu batas viewport."""
+    return (min(sim.cols * cell_size, VIEWPORT_MAX_W),
+            min(sim.rows * cell_size, VIEWPORT_MAX_H))
+
+
+class Viewport:
+    """Bagian map yang terlihat: zoom (piksel per sel) dan pan (sel kiri-atas).
+
+    zoom >= 1: tiap sel `px` piksel. zoom < 1: `k` x `k` sel digabung jadi
+    satu piksel (heatmap diambil max-nya, rintangan mayoritas).
+    Dipegang thread UI; tidak ikut snapshot simulasi.
+    """
+
+    def __init__(self):
+        self.map_size = None
+        self.view_w = self.view_h = 0
+        self.zoom = 1.0
+        self.r0 = self.c0 = 0
+
+    def sync(self, sim: SimulationState, cell_size: int):
+        """Ikuti ukuran map; zoom/pan di-reset kalau ukuran map berubah."""
+        self.view_w, self.view_h = grid_view_size(sim, cell_size)
+        size = (sim.rows, sim.cols)
+        if size != self.map_size:
+            self.map_size = size
+            self.zoom = self.fit_zoom(cell_size)
+            self.r0 = self.c0 = 0
+        self._clamp()
+
+    def fit_zoom(self, cell_size: int) -> float:
+        """cell_size kalau seluruh map muat, selain itu level terbesar yang memuat map."""
+        rows, cols = self.map_size
+        if cols * cell_size <= self.view_w and rows * cell_size <= self.view_h:
+            return cell_size
+        fits = [z for z in ZOOM_LEVELS if cols * z <= self.view_w and rows * z <= self.view_h]
+        return fits[-1] if fits else ZOOM_LEVELS[0]
+
+    def scale(self):
+        """(k, px): k x k sel per blok, px x px piksel per blok."""
+        if self.zoom >= 1:
+            return 1, int(self.zoom)
+        return int(round(1 / self.zoom)), 1
+
+    def visible_cells(self):
+        """Jumlah (baris, kolom) sel yang muat penuh di viewport."""
+        k, px = self.scale()
+        return max(1, self.view_h // px) * k, max(1, self.view_w // px) * k
+
+    def region(self):
+        """(r0, r1, c0, c1): sel yang (sebagian) terlihat."""
+        k, px = self.scale()
+        rows, cols = self.map_size
+        r1 = min(rows, self.r0 + -(-self.view_h // px) * k)
+        c1 = min(cols, self.c0 + -(-self.view_w // px) * k)
+        return self.r0, r1, self.c0, c1
+
+    def key(self):
+        return (self.map_size, self.view_w, self.view_h, self.zoom, self.r0, self.c0)
+
+    def _clamp(self):
+        rows, cols = self.map_size
+        vis_r, vis_c = self.visible_cells()
+        self.r0 = max(0, min(self.r0, rows - vis_r))
+        self.c0 = max(0, min(self.c0, cols - vis_c))
+
+    def pan(self, dr: int, dc: int):
+        self.r0 += dr
+        self.c0 += dc
+        self._clamp()
+
+    def pan_step(self):
+        """Geser seperempat layar per tombol panah."""
+        vis_r, vis_c = self.visible_cells()
+        return max(1, vis_r // 4), max(1, vis_c // 4)
+
+    def zoom_by(self, steps: int, anchor=None):
+        """Naik/turun `steps` level zoom; sel di bawah anchor (x, y layar) tetap di tempat."""
+        levels = list(ZOOM_LEVELS)
+        if self.zoom in levels:
+            i = levels.index(self.zoom)
+        else:
+            i = max(j for j, z in enumerate(levels) if z <= self.zoom)
+        i = max(0, min(len(levels) - 1, i + steps))
+        if levels[i] == self.zoom:
+            return
+
+        if anchor is None:
+            anchor = (GRID_ORIGIN_X + self.view_w // 2, GRID_ORIGIN_Y + self.view_h // 2)
+        ax = anchor[0] - GRID_ORIGIN_X
+        ay = anchor[1] - GRID_ORIGIN_Y
+        # posisi sel (pecahan) di bawah anchor sebelum dan sesudah zoom
+        fr = self.r0 + ay / self.zoom
+        fc = self.c0 + ax / self.zoom
+        self.zoom = levels[i]
+        self.r0 = int(round(fr - ay / self.zoom))
+        self.c0 = int(round(fc - ax / self.zoom))
+        self._clamp()
+
+    def contains(self, x: int, y: int) -> bool:
+        return (GRID_ORIGIN_X <= x < GRID_ORIGIN_X + self.view_w and
+                GRID_ORIGIN_Y <= y < GRID_ORIGIN_Y + self.view_h)
+
+    def cell_at(self, x: int, y: int):
+        """Sel di posisi layar (x, y), atau None kalau di luar map."""
+        if not self.contains(x, y):
+            return None
+        k, px = self.scale()
+        r = self.r0 + (y - GRID_ORIGIN_Y) // px * k
+        c = self.c0 + (x - GRID_ORIGIN_X) // px * k
+        rows, cols = self.map_size
+        if r < rows and c < cols:
+            return r, c
+        return None
+
+    def cell_center(self, r: int, c: int):
+        k, px = self.scale()
+        x = GRID_ORIGIN_X + (c - self.c0) // k * px + px // 2
+        y = GRID_ORIGIN_Y + (r - self.r0) // k * px + px // 2
+        return x, y
+
+    def clip_rect(self) -> pygame.Rect:
+        return pygame.Rect(GRID_ORIGIN_X, GRID_ORIGIN_Y, self.view_w, self.view_h)
+
+
+def _block_reduce(a, k: int, ufunc):
+    """Reduksi blok k x k (blok tepi boleh lebih kecil) dengan ufunc (max/add).
+
+    Per sumbu: mulai dari irisan a[0::k], lalu gabungkan a[i::k] untuk
+    i = 1..k-1. Lebih cepat dari ufunc.reduceat untuk blok kecil.
+    """
+    if k == 1:
+        return a
+    out = a[::k].copy()
+    for i in range(1, k):
+        part = a[i::k]
+        n = part.shape[0]
+        ufunc(out[:n], part, out=out[:n])
+    a = out
+    out = a[:, ::k].copy()
+    for i in range(1, k):
+        part = a[:, i::k]
+        n = part.shape[1]
+        ufunc(out[:, :n], part, out=out[:, :n])
+    return out
+
+
+def heat_block_counts(sim: SimulationState, r0, r1, c0, c1, k: int):
+    """Hitungan visit per blok area terlihat (numpy int64 [baris][kolom], max per blok)."""
+    counts = np.frombuffer(sim.visit_counts.data, dtype=np.int64)
+    return _block_reduce(counts.reshape(sim.rows, sim.cols)[r0:r1, c0:c1], k, np.maximum)
+
+
+def heat_index_values(counts, max_count: int):
+    """Index HEAT_PALETTE untuk array hitungan numpy (0 = putih)."""
+    if max_count <= 0:
+        return np.full(counts.shape, 255, dtype=np.uint8)
+    gb = (255 * (1 - counts / max_count)).astype(np.uint8)
+    return np.where(counts > 0, gb, 255).astype(np.uint8)
+
+
+def heat_index_row(counts, max_count: int) -> bytes:
+    """Index HEAT_PALETTE untuk satu baris hitungan (tanpa numpy)."""
+    return bytes(int(255 * (1 - v / max_count)) if v > 0 else 255 for v in counts)
+
+
+def obstacle_indices(sim: SimulationState, r0, r1, c0, c1, k: int) -> bytes:
+    """Index OBSTACLE_PALETTE per blok (1 = rintangan)."""
+    data = sim.grid.data
+    cols = sim.cols
+    if k == 1:
+        return b"".join(data[r * cols + c0:r * cols + c1].tobytes() for r in range(r0, r1))
+    if np is not None:
+        grid = np.frombuffer(data, dtype=np.int8).reshape(sim.rows, sim.cols)[r0:r1, c0:c1]
+        blocked = _block_reduce(grid.astype(np.int32), k, np.add)
+        total = _block_reduce(np.ones(grid.shape, dtype=np.int32), k, np.add)
+        return (blocked * 2 >= total).astype(np.uint8).tobytes()
+    return b"".join(data[r * cols + c0:r * cols + c1:k].tobytes() for r in range(r0, r1, k))
+
+
+def _palette_surface(indices: bytes, size, palette, px: int):
+    surf = pygame.image.frombuffer(indices, size, "P")
+    surf.set_palette(palette)
+    if px == 1:
+        return surf.copy()
+    return pygame.transform.scale(surf, (size[0] * px, size[1] * px))
+
+
+class GridLayers:
+    """Cache render area grid. Hanya sel yang terlihat di viewport yang diproses.
+
+    - static : rintangan, garis sel, titik cost, START/GOAL (colorkey) seukuran
+               viewport. Dibangun ulang hanya kalau sim.map_version atau
+               viewport (zoom/pan/ukuran) berubah.
+    - heat   : 1 index palette per sel/blok terlihat (heat_idx, dipakai
+               bersama surface 8-bit heat_small) + hasil scale-nya. Tiap
+               snapshot dengan heatmap baru, index dibandingkan dengan yang
+               lama; hanya tile HEAT_TILE yang berubah yang ditulis dan
+               di-scale ulang. Heatmap sama (pause) = tanpa kerja.
+    - panel  : background sidebar, di-cache per (posisi, tinggi).
+    """
+
+    def __init__(self):
+        self.static_key = None
+        self.static = None
+        self.heat_key = None
+        self.heat_stamp = None
+        self.heat_idx = None
+        self.heat_small = None
+        self.heat = None
+        # tanpa numpy: baris hitungan per baris blok + max saat index dihitung
+        self.heat_counts = []
+        self.heat_max = None
+        self.panel_key = None
+        self.panel = None
+
+    def _build_static(self, sim: SimulationState, vp: Viewport):
+        if self.static is None or self.static.get_size() != (vp.view_w, vp.view_h):
+            self.static = pygame.Surface((vp.view_w, vp.view_h))
+            self.static.set_colorkey(COLORKEY)
+        surf = self.static
+        surf.fill(COLORKEY)
+
+        r0, r1, c0, c1 = vp.region()
+        k, px = vp.scale()
+        size = (-(-(c1 - c0) // k), -(-(r1 - r0) // k))
+        surf.blit(_palette_surface(obstacle_indices(sim, r0, r1, c0, c1, k), size,
+                                   OBSTACLE_PALETTE, px), (0, 0))
+
+        if px >= GRID_LINE_MIN_PX:
+            grid, costs = sim.grid, sim.cell_costs
+            dots = px >= COST_DOT_MIN_PX
+            for r in range(r0, r1):
+                grid_row, cost_row = grid[r], costs[r]
+                y = (r - r0) * px
+                for c in range(c0, c1):
+                    if grid_row[c] == 0:
+                        pygame.draw.rect(surf, GRAY, pygame.Rect((c - c0) * px, y, px, px), 1)
+                        if dots and cost_row[c] > 0:
+                            draw_cost_dots(surf, r - r0, c - c0, cost_row[c], px, origin=(0, 0))
+
+        marker = max(px, MARKER_MIN_PX)
+        for (r, c), color in ((sim.start, GREEN), (sim.goal, RED)):
+            if r0 <= r < r1 and c0 <= c < c1:
+                pygame.draw.rect(surf, color, ((c - c0) // k * px, (r - r0) // k * px, marker, marker))
+
+    def _reset_heat(self, vp: Viewport):
+        r0, r1, c0, c1 = vp.region()
+        k, px = vp.scale()
+        w, h = -(-(c1 - c0) // k), -(-(r1 - r0) // k)
+        # 255 = putih, sama dengan isi awal heat
+        self.heat_idx = bytearray(b"\xff" * (w * h))
+        self.heat_small = pygame.image.frombuffer(self.heat_idx, (w, h), "P")
+        self.heat_small.set_palette(HEAT_PALETTE)
+        self.heat = pygame.Surface((w * px, h * px), depth=8)
+        self.heat.set_palette(HEAT_PALETTE)
+        self.heat.fill(255)
+        self.heat_counts = [None] * h
+        self.heat_max = None
+        self.heat_stamp = None
+
+    def _changed_tiles(self, sim: SimulationState, vp: Viewport):
+        """Tulis index yang berubah ke heat_idx; return tile (kolom, baris) yang kena."""
+        r0, r1, c0, c1 = vp.region()
+        k, _ = vp.scale()
+        w, h = self.heat_small.get_size()
+        t = HEAT_TILE
+        if np is not None:
+            counts = heat_block_counts(sim, r0, r1, c0, c1, k)
+            old = np.frombuffer(self.heat_idx, dtype=np.uint8).reshape(h, w)
+            # sel 0 yang sudah putih tetap putih: hanya sel berhitungan atau
+            # yang masih berwarna (mis. sesudah reset) yang dihitung ulang
+            ys, xs = np.nonzero((counts > 0) | (old != 255))
+            new = heat_index_values(counts[ys, xs], sim.visit_max)
+            changed = new != old[ys, xs]
+            ys, xs = ys[changed], xs[changed]
+            old[ys, xs] = new[changed]
+            tw = -(-w // t)
+            tiles = np.unique(ys // t * tw + xs // t)
+            return [(int(i % tw), int(i // tw)) for i in tiles]
+
+        # tanpa numpy: sel pertama blok (sampling); baris yang hitungannya
+        # sama dan max tidak berubah dilewati tanpa dihitung ulang
+        data = sim.visit_counts.data
+        cols = sim.cols
+        max_count = sim.visit_max
+        same_max = max_count == self.heat_max
+        self.heat_max = max_count
+        idx, counts = self.heat_idx, self.heat_counts
+        tiles = set()
+        for by, r in enumerate(range(r0, r1, k)):
+            row = data[r * cols + c0:r * cols + c1:k]
+            if same_max and row == counts[by]:
+                continue
+            counts[by] = row
+            new = heat_index_row(row, max_count) if max_count > 0 else b"\xff" * w
+            base = by * w
+            old = bytes(idx[base:base + w])
+            if new == old:
+                continue
+            idx[base:base + w] = new
+            for tx in range(-(-w // t)):
+                if new[tx * t:(tx + 1) * t] != old[tx * t:(tx + 1) * t]:
+                    tiles.add((tx, by // t))
+        return sorted(tiles)
+
+    def _update_heat(self, sim: SimulationState, vp: Viewport):
+        key = vp.key()
+        if key != self.heat_key:
+            self._reset_heat(vp)
+            self.heat_key = key
+        # hitungan hanya bertambah; reset / edit map selalu ganti map_version
+        stamp = (sim.map_version, sim.visit_total, sim.visit_max)
+        if stamp == self.heat_stamp:
+            return
+        self.heat_stamp = stamp
+
+        _, px = vp.scale()
+        t = HEAT_TILE
+        bounds = self.heat_small.get_rect()
+        for tx, ty in self._changed_tiles(sim, vp):
+            rect = pygame.Rect(tx * t, ty * t, t, t).clip(bounds)
+            dest = pygame.Rect(rect.x * px, rect.y * px, rect.w * px, rect.h * px)
+            pygame.transform.scale(self.heat_small.subsurface(rect), dest.size,
+                                   self.heat.subsurface(dest))
+
+    def draw(self, surface, sim: SimulationState, vp: Viewport):
+        key = (sim.map_version, vp.key())
+        if key != self.static_key:
+            self._build_static(sim, vp)
+            self.static_key = key
+        self._update_heat(sim, vp)
+
+        origin = (GRID_ORIGIN_X, GRID_ORIGIN_Y)
+        clip = vp.clip_rect()
+        surface.set_clip(clip)
+        heat_rect = surface.blit(self.heat, origin)
+        # blok tepi bisa tidak menutup seluruh viewport
+        if heat_rect.right < clip.right:
+            surface.fill(BG, (heat_rect.right, clip.top, clip.right - heat_rect.right, clip.height))
+        if heat_rect.bottom < clip.bottom:
+            surface.fill(BG, (clip.left, heat_rect.bottom, clip.width, clip.bottom - heat_rect.bottom))
+        surface.blit(self.static, origin)
+        surface.set_clip(None)
+
+    def draw_panel(self, surface, panel_x: int, panel_h: int, grid_w: int):
+        key = (panel_x, panel_h, grid_w)
+        if key != self.panel_key:
+            w = SIDEBAR_WIDTH - GRID_ORIGIN_X
+            # separator vertikal ada di kiri panel, jadi layer mulai dari situ
+            sep_x = GRID_ORIGIN_X // 2
+            # +1 baris: ujung bawah garis separator ikut tergambar
+            self.panel = pygame.Surface((w + sep_x + 1, panel_h + 1))
+            self.panel.fill(BG)
+            pygame.draw.rect(self.panel, PANEL_BG, pygame.Rect(sep_x + 1, 0, w, panel_h))
+            pygame.draw.rect(self.panel, PANEL_BORDER, pygame.Rect(sep_x + 1, 0, w, panel_h), 2)
+            pygame.draw.line(self.panel, PANEL_BORDER, (0, 0), (0, panel_h), 2)
+            self.panel_key = key
+        surface.blit(self.panel, (panel_x - GRID_ORIGIN_X // 2 - 1, GRID_ORIGIN_Y))
+
+
+_grid_layers = GridLayers()
+# zoom/pan area grid; main.py memakai ini juga untuk klik, roda mouse, panah
+viewport = Viewport()
+
+
+class DirtyRects:
+    """Area canvas (koordinat logis) yang berubah sejak take() terakhir.
+
+    Canvas tetap digambar utuh tiap frame; ini hanya mencatat bagian yang
+    pikselnya bisa berbeda, supaya main.py cukup menyalin / men-scale bagian
+    itu ke layar. Kunci per area (grid, layout sidebar) dan per slot teks
+    dibandingkan dengan frame sebelumnya.
+    """
+
+    def __init__(self):
+        self.full = True
+        self.rects = []
+        self.keys = {}
+        self.blits = {}
+
+    def invalidate(self):
+        self.full = True
+
+    def add(self, rect):
+        if not self.full:
+            self.rects.append(pygame.Rect(rect))
+
+    def check(self, name, key, rect=None):
+        """Tandai rect (None = seluruh canvas) kalau key area `name` berubah."""
+        if self.keys.get(name) != key:
+            self.keys[name] = key
+            if rect is None:
+                self.invalidate()
+            else:
+                self.add(rect)
 
-    grid_w = sim.cols * cell_size
-    grid_h = sim.rows * cell_size
-    panel_h = get_sidebar_height(sim, font, font_title)
+    def blit(self, surface, slot, surf, pos):
+        """surface.blit yang mencatat slot kalau surf atau posisinya berubah."""
+        rect = surface.blit(surf, pos)
+        old = self.blits.get(slot)
+        if old is None or old[0] is not surf or old[1] != rect:
+            if old is not None:
+                self.add(old[1])
+            self.add(rect)
+            self.blits[slot] = (surf, rect)
+        return rect
 
-    # panel sidebar
-    panel_x = GRID_ORIGIN_X + grid_w + GRID_ORIGIN_X
-    pygame.draw.rect(
-        surface,
-        PANEL_BG,
-        pygame.Rect(panel_x, GRID_ORIGIN_Y, SIDEBAR_WIDTH - GRID_ORIGIN_X, panel_h)
-    )
-    pygame.draw.rect(
-        surface,
-        PANEL_BORDER,
-        pygame.Rect(panel_x, GRID_ORIGIN_Y, SIDEBAR_WIDTH - GRID_ORIGIN_X, panel_h),
-        2
-    )
+    def take(self):
+        """(full, rects) lalu mulai frame baru."""
+        full, rects = self.full, self.rects
+        self.full = False
+        self.rects = []
+        return full, rects
 
-    # separator vertical
-    pygame.draw.line(
-        surface,
-        PANEL_BORDER,
-        (GRID_ORIGIN_X + grid_w + GRID_ORIGIN_X // 2, GRID_ORIGIN_Y),
-        (GRID_ORIGIN_X + grid_w + GRID_ORIGIN_X // 2, GRID_ORIGIN_Y + panel_h),
-        2
-    )
 
-    # cari max untuk heatmap
-    max_count = 0
-    for row in sim.visit_counts:
-        row_max = max(row) if row else 0
-        if row_max > max_count:
-            max_count = row_max
-
-    # grid cells
-    for r in range(sim.rows):
-        for c in range(sim.cols):
-            x = GRID_ORIGIN_X + c * cell_size
-            y = GRID_ORIGIN_Y + r * cell_size
-            rect = pygame.Rect(x, y, cell_size, cell_size)
-
-            if sim.grid[r][c] == 1:
-                pygame.draw.rect(surface, BLACK, rect)
-            else:
-                if max_count > 0 and sim.visit_counts[r][c] > 0:
-                    ratio = sim.visit_counts[r][c] / max_count
-                    red = 255
-                    gb = int(255 * (1 - ratio))
-                    color = (red, gb, gb)
-                else:
-                    color = WHITE
+dirty = DirtyRects()
 
-                pygame.draw.rect(surface, color, rect)
-                pygame.draw.rect(surface, GRAY, rect, 1)
 
-                if sim.cell_costs[r][c] > 0:
-                    draw_cost_dots(surface, r, c, sim.cell_costs[r][c], cell_size)
+def draw_grid(surface, sim: SimulationState, cell_size: int, font, font_title, sec=None):
+    viewport.sync(sim, cell_size)
 
-    # start
-    sx = GRID_ORIGIN_X + sim.start[1] * cell_size
-    sy = GRID_ORIGIN_Y + sim.start[0] * cell_size
-    pygame.draw.rect(surface, GREEN, (sx, sy, cell_size, cell_size))
+    grid_w = viewport.view_w
+    panel_h = get_sidebar_height(sim, font, font_title, sec)
+    panel_x = GRID_ORIGIN_X + grid_w + GRID_ORIGIN_X
+    # area grid & panel ditimpa utuh tiap frame; latar di luarnya cukup
+    # diisi kalau canvas digambar ulang semua (layout baru, resize, expose)
+    dirty.check("layout", (surface.get_size(), panel_x, panel_h))
+    if dirty.full:
+        surface.fill(BG)
+
+    # panel sidebar + separator vertical
+    _grid_layers.draw_panel(surface, panel_x, panel_h, grid_w)
 
-    # goal
-    gx = GRID_ORIGIN_X + sim.goal[1] * cell_size
-    gy = GRID_ORIGIN_Y + sim.goal[0] * cell_size
-    pygame.draw.rect(surface, RED, (gx, gy, cell_size, cell_size))
+    # heatmap + layer statis (garis, rintangan, cost, START/GOAL)
+    _grid_layers.draw(surface, sim, viewport)
+    # heatmap & jalur agen hanya berubah kalau ada langkah / simulasi baru
+    dirty.check("grid", (sim.map_version, viewport.key(), sim.visit_total, sim.sim_count,
+                         id(sim.best_path)), viewport.clip_rect())
 
 
 def draw_paths(surface, sim: SimulationState, cell_size: int):
+    # path disimpan ringkas (index flat); baru di-decode ke (r, c) di sini
+    surface.set_clip(viewport.clip_rect())
     if sim.best_path is not None and len(sim.best_path) >= 2:
-        draw_path(surface, sim.best_path, GREEN, cell_size, width=4)
+        draw_path(surface, decode_path(sim.best_path, sim.cols), GREEN, cell_size, width=4)
 
     for agent in sim.agents:
-        if agent.active and len(agent.path) >= 2:
-            draw_path(surface, agent.path, BLUE, cell_size, width=2)
+        if agent.active and agent.path_len >= 2:
+            draw_path(surface, decode_path(agent.cells(), sim.cols), BLUE, cell_size, width=2)
+    surface.set_clip(None)
 
 
 def draw_path(surface, path, color, cell_size, width=3):
-    pts = []
-    for (r, c) in path:
-        x = GRID_ORIGIN_X + c * cell_size + cell_size // 2
-        y = GRID_ORIGIN_Y + r * cell_size + cell_size // 2
-        pts.append((x, y))
+    # cell_size tidak dipakai lagi: posisi mengikuti zoom viewport
+    center = viewport.cell_center
+    pts = [center(r, c) for (r, c) in path]
     if len(pts) >= 2:
         pygame.draw.lines(surface, color, False, pts, width)
 
@@ -266,18 +726,56 @@ def draw_path(surface, path, color, cell_size, width=3):
 # =========================================================
 # Render SIDEBAR
 # =========================================================
-def draw_sidebar(surface, sim: SimulationState, font, font_title, cell_size):
-    """Gambar sidebar dan kembalikan rect tombol cost_minus, cost_plus."""
+class TextCache:
+    """Cache hasil font.render per slot baris sidebar.
+
+    Slot (mis. ("stats", 3)) hanya di-render ulang kalau teks/warna/font-nya
+    berubah; kontrol & legend praktis tidak pernah di-render ulang.
+    """
+
+    def __init__(self):
+        self.slots = {}
+
+    def render(self, slot, font, text, color):
+        key = (font, text, color)
+        hit = self.slots.get(slot)
+        if hit is not None and hit[0] == key:
+            return hit[1]
+        surf = font.render(text, True, color)
+        self.slots[slot] = (key, surf)
+        return surf
+
+
+_text_cache = TextCache()
+
+
+def draw_text_lines(surface, section: str, lines, font, x: int, y: int, line_h: int, color_of):
+    for i, text in enumerate(lines):
+        surf = _text_cache.render((section, i), font, text, color_of(text))
+        dirty.blit(surface, (section, i), surf, (x, y))
+        y += line_h
+    return y
+
 
-    grid_w = sim.cols * cell_size
+def draw_sidebar(surface, sim: SimulationState, font, font_title, cell_size, sec=None):
+    """Gambar sidebar dan kembalikan rect tombol cost_minus, cost_plus.
+
+    sec: build_sidebar_sections(sim) yang sama dengan draw_grid (opsional).
+    """
+
+    grid_w = grid_view_size(sim, cell_size)[0]
     panel_x = GRID_ORIGIN_X + grid_w + GRID_ORIGIN_X + 10
     y = GRID_ORIGIN_Y + 10
 
-    sec = build_sidebar_sections(sim)
+    if sec is None:
+        sec = build_sidebar_sections(sim)
     line_h = sec["line_h"]
+    # jumlah baris berubah = separator & section di bawahnya bergeser
+    dirty.check("sidebar", (line_h, len(sec["stats"]), len(sec["status"]),
+                            len(sec["controls"]), len(sec["legend"])))
 
     # Judul
-    title = font_title.render("Monte Carlo Pathfinding", True, (255, 255, 255))
+    title = _text_cache.render("title", font_title, "Monte Carlo Pathfinding", (255, 255, 255))
     surface.blit(title, (panel_x, y))
     y += line_h + 6
 
@@ -285,7 +783,7 @@ def draw_sidebar(surface, sim: SimulationState, font, font_title, cell_size):
     y += 6
 
     # ===== Cost control (tombol +/-) =====
-    label = font.render("Cost value (0-9) untuk mode Cost:", True, (230, 230, 230))
+    label = _text_cache.render("cost_label", font, "Cost value (0-9) untuk mode Cost:", (230, 230, 230))
     surface.blit(label, (panel_x, y))
     y += line_h
 
@@ -300,19 +798,19 @@ def draw_sidebar(surface, sim: SimulationState, font, font_title, cell_size):
     # minus
     pygame.draw.rect(surface, (100, 80, 80), cost_minus_rect, border_radius=3)
     pygame.draw.rect(surface, (220, 210, 210), cost_minus_rect, 1, border_radius=3)
-    minus_text = font.render("-", True, (255, 255, 255))
+    minus_text = _text_cache.render("cost_minus", font, "-", (255, 255, 255))
     surface.blit(minus_text, minus_text.get_rect(center=cost_minus_rect.center))
 
     # value
     pygame.draw.rect(surface, (80, 80, 110), value_rect, border_radius=3)
     pygame.draw.rect(surface, (200, 200, 230), value_rect, 1, border_radius=3)
-    val_text = font.render(str(sim.current_cost_value), True, (255, 255, 255))
-    surface.blit(val_text, val_text.get_rect(center=value_rect.center))
+    val_text = _text_cache.render("cost_value", font, str(sim.current_cost_value), (255, 255, 255))
+    dirty.blit(surface, "cost_value", val_text, val_text.get_rect(center=value_rect.center))
 
     # plus
     pygame.draw.rect(surface, (80, 120, 80), cost_plus_rect, border_radius=3)
     pygame.draw.rect(surface, (210, 230, 210), cost_plus_rect, 1, border_radius=3)
-    plus_text = font.render("+", True, (255, 255, 255))
+    plus_text = _text_cache.render("cost_plus", font, "+", (255, 255, 255))
     surface.blit(plus_text, plus_text.get_rect(center=cost_plus_rect.center))
 
     y += box_h + 6
@@ -320,39 +818,54 @@ def draw_sidebar(surface, sim: SimulationState, font, font_title, cell_size):
     y += 6
 
     # ===== Statistik =====
-    for text in sec["stats"]:
-        surf = font.render(text, True, (230, 230, 230))
-        surface.blit(surf, (panel_x, y))
-        y += line_h
+    y = draw_text_lines(surface, "stats", sec["stats"], font, panel_x, y, line_h,
+                        lambda text: (230, 230, 230))
 
     y += 4
     pygame.draw.line(surface, PANEL_BORDER, (panel_x, y), (panel_x + SIDEBAR_WIDTH - 40, y), 1)
     y += 6
 
     # ===== Status =====
-    for text in sec["status"]:
-        surf = font.render(text, True, (255, 255, 0) if text.startswith("Status:") else (180, 220, 255))
-        surface.blit(surf, (panel_x, y))
-        y += line_h
+    y = draw_text_lines(surface, "status", sec["status"], font, panel_x, y, line_h,
+                        lambda text: (255, 255, 0) if text.startswith("Status:") else (180, 220, 255))
 
     y += 4
     pygame.draw.line(surface, PANEL_BORDER, (panel_x, y), (panel_x + SIDEBAR_WIDTH - 40, y), 1)
     y += 6
 
     # ===== Kontrol =====
-    for text in sec["controls"]:
-        surf = font.render(text, True, (220, 220, 220))
-        surface.blit(surf, (panel_x, y))
-        y += line_h
+    y = draw_text_lines(surface, "controls", sec["controls"], font, panel_x, y, line_h,
+                        lambda text: (220, 220, 220))
 
     y += 4
     pygame.draw.line(surface, PANEL_BORDER, (panel_x, y), (panel_x + SIDEBAR_WIDTH - 40, y), 1)
     y += 6
 
     # ===== Legend =====
-    for text in sec["legend"]:
-        surf = font.render(text, True, (210, 210, 210))
-        surface.blit(surf, (panel_x, y))
-        y += line_h
+    y = draw_text_lines(surface, "legend", sec["legend"], font, panel_x, y, line_h,
+                        lambda text: (210, 210, 210))
 
     return cost_minus_rect, cost_plus_rect
+
+
+def draw_profile_overlay(surface, sim: SimulationState, lines, font, font_title, cell_size,
+                         sec=None):
+    """Kotak profiler di bagian bawah sidebar (menutupi kontrol/legend, layout tetap)."""
+    if not lines:
+        return
+    line_h = 16
+    grid_w = grid_view_size(sim, cell_size)[0]
+    panel_x = GRID_ORIGIN_X + grid_w + GRID_ORIGIN_X + 10
+    # sidebar bisa lebih tinggi dari canvas (canvas hanya diukur ulang saat resize)
+    panel_bottom = min(GRID_ORIGIN_Y + get_sidebar_height(sim, font, font_title, sec),
+                       surface.get_height() - GRID_ORIGIN_Y)
+
+    box = pygame.Rect(panel_x - 6, 0, SIDEBAR_WIDTH - 28, len(lines) * line_h + 12)
+    box.bottom = panel_bottom - 8
+    # kotak mengecil = sidebar di bekas tepinya harus terlihat lagi
+    dirty.check("overlay", tuple(box))
+    dirty.add(box)
+    pygame.draw.rect(surface, BG, box)
+    pygame.draw.rect(surface, PANEL_BORDER, box, 1)
+    draw_text_lines(surface, "profile", lines, font, panel_x, box.y + 6, line_h,
+                    lambda text: (255, 255, 0) if text.startswith("[") else (200, 255, 200))
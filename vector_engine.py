@@ -0,0 +1,340 @@
+# vector_engine.py
+#
+# Engine alternatif: semua walker maju bersama (lockstep) dalam satu langkah
+# NumPy. Posisi, jumlah step, cost berjalan, path dan visited-state tiap walker
+# disimpan di array, bukan di objek Agent.
+#
+# Statistik yang dihasilkan sama dengan SimulationState.handle_success
+# (success count, best path/cost, min/max/avg length & cost, visit_counts).
+#
+# Visited-state pakai "clock stamp": tiap walker punya jam yang naik satu per
+# langkah, dan stamp[w, sel] menyimpan jam saat sel itu dimasuki. Sel dianggap
+# visited di episode sekarang kalau stamp >= jam awal episode (epoch0[w]).
+# Restart episode tidak perlu membersihkan mask, dan path walker bisa disusun
+# ulang dari stamp (diurutkan) sehingga path tidak ditulis per langkah.
+
+from array import array
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy opsional, engine biasa tetap jalan tanpa numpy
+    np = None
+
+from config import MOVES
+from simulation import SimulationState, PATH_TYPECODE, is_better_path
+from gridarray import GridArray
+
+# ukuran visited-stamp (walker x sel) yang diincar, dalam byte. Dijaga kecil
+# supaya gather acak ke stamp tetap di cache; batch lebih besar tidak lebih
+# cepat. Map besar tetap dapat minimal MIN_BATCH_WALKERS walker, dibatasi
+# VISITED_MAX_BYTES.
+VISITED_CACHE_BYTES = 2 * 1024 * 1024
+VISITED_MAX_BYTES = 256 * 1024 * 1024
+MAX_BATCH_WALKERS = 8192
+MIN_BATCH_WALKERS = 1024
+
+# berapa lockstep per blok: buffer kunjungan & statistik sukses di-flush dan
+# bilangan acak dibuat ulang sekali per blok
+BLOCK_STEPS = 64
+
+STAMP_DTYPE = "uint32"
+STAMP_MAX = 2**32 - 1
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def build_neighbor_array(sim: SimulationState):
+    """Tabel tetangga (n_cells, 4) dari CSR sim.neighbors. Slot kosong menunjuk
+    ke sel itu sendiri (sel sendiri selalu sudah visited, jadi otomatis tidak valid)."""
+    n = sim.rows * sim.cols
+    offsets, indices = sim.neighbors.csr()
+    offsets = np.frombuffer(offsets, dtype=np.int32)
+    indices = np.frombuffer(indices, dtype=np.int32)
+
+    nbr = np.repeat(np.arange(n, dtype=np.int32)[:, None], len(MOVES), axis=1)
+    counts = np.diff(offsets)
+    slot = np.arange(len(indices)) - np.repeat(offsets[:-1], counts)
+    nbr[np.repeat(np.arange(n), counts), slot] = indices
+    return nbr
+
+
+def build_cost_array(sim: SimulationState):
+    """Cost tiap sel (flat), sama dengan sim.cost_table / get_cell_cost_value."""
+    return np.array(sim.cost_table, dtype=np.float64)
+
+
+def build_pick_tables():
+    """Untuk mask 4-bit tetangga valid: jumlah bit, dan kolom ke-k yang valid."""
+    n_moves = len(MOVES)
+    popcount = np.zeros(1 << n_moves, dtype=np.int32)
+    pick_col = np.zeros((1 << n_moves, n_moves), dtype=np.int32)
+    for mask in range(1 << n_moves):
+        cols = [k for k in range(n_moves) if mask & (1 << k)]
+        popcount[mask] = len(cols)
+        for j, k in enumerate(cols):
+            pick_col[mask, j] = k
+    return popcount, pick_col
+
+
+class VectorEngine:
+    """Self-avoiding walk Monte Carlo versi NumPy (lockstep)."""
+
+    def __init__(self, sim: SimulationState, batch_size: Optional[int] = None,
+                 seed: Optional[int] = None):
+        if np is None:
+            raise RuntimeError("VectorEngine butuh numpy (pip install numpy)")
+
+        self.sim = sim
+        self.rows, self.cols = sim.rows, sim.cols
+        self.n_cells = n = sim.rows * sim.cols
+        self.start = sim.start[0] * sim.cols + sim.start[1]
+        self.goal = sim.goal[0] * sim.cols + sim.goal[1]
+        self.max_steps = sim.max_steps_per_walk
+        self.max_simulations = sim.max_simulations
+
+        stamp_bytes = np.dtype(STAMP_DTYPE).itemsize
+        if batch_size is None:
+            row_bytes = n * stamp_bytes
+            batch_size = max(VISITED_CACHE_BYTES // row_bytes, MIN_BATCH_WALKERS)
+            batch_size = min(batch_size, max(1, VISITED_MAX_BYTES // row_bytes))
+        batch_size = max(1, min(batch_size, MAX_BATCH_WALKERS, self.max_simulations))
+        self.batch_size = B = batch_size
+
+        self.rng = np.random.default_rng(seed)
+        self.start_is_goal = self.start == self.goal
+
+        # index pakai intp supaya np.take tidak perlu konversi tiap langkah
+        nbr = build_neighbor_array(sim).astype(np.intp)
+        self.nbr_flat = nbr.ravel()
+        self.nbr_t = np.ascontiguousarray(nbr.T)
+        self.cell_cost = build_cost_array(sim)
+        popcount, pick_col = build_pick_tables()
+        self.popcount = popcount.astype(np.intp)
+        self.pick_col_flat = pick_col.astype(np.intp).ravel()
+
+        walker = np.arange(B, dtype=np.intp)
+        self.stamp_base = (walker * n)[None, :]
+
+        self.pos = np.full(B, self.start, dtype=np.intp)
+        self.steps = np.zeros(B, dtype=np.intp)
+        self.cost = np.zeros(B, dtype=np.float64)
+        self.active = np.zeros(B, dtype=bool)
+        self.epoch0 = np.zeros(B, dtype=STAMP_DTYPE)
+        self.next_epoch = np.ones(B, dtype=np.int64)
+        self.stamp = np.zeros(B * n, dtype=STAMP_DTYPE)
+
+        self.tick = 0
+        self.rand = None
+        # bin ekstra (index n) untuk walker yang tidak bergerak
+        self.visits = np.zeros(n + 1, dtype=np.int64)
+        self.visit_buf = np.full((BLOCK_STEPS, B), n, dtype=np.intp)
+        self.success_lens = []
+        self.success_costs = []
+
+        self.sim_count = 0
+        self.success_count = 0
+        self.total_success_length = 0
+        self.total_success_cost = 0.0
+        self.min_success_length = None
+        self.max_success_length = None
+        self.min_success_cost = None
+        self.max_success_cost = None
+        self.length_dist, self.cost_dist = sim.new_distributions()
+        self.best_path = None
+        self.best_path_cost = None
+
+        self._start_walkers(walker)
+
+    # ---------- episode management ----------
+
+    def _start_walkers(self, idx):
+        """Mulai episode baru untuk walker idx (sesuai sisa budget simulasi)."""
+        remaining = self.max_simulations - self.sim_count
+        if len(idx) > remaining:
+            self.active[idx[remaining:]] = False
+            idx = idx[:remaining]
+        if len(idx) == 0:
+            return
+
+        # jam walker hampir overflow: bersihkan baris stamp-nya, mulai dari 1
+        wrap = idx[self.next_epoch[idx] + self.max_steps >= STAMP_MAX]
+        if len(wrap):
+            n = self.n_cells
+            for w in wrap:
+                self.stamp[w * n:(w + 1) * n] = 0
+            self.next_epoch[wrap] = 1
+
+        e0 = self.next_epoch[idx]
+        self.epoch0[idx] = e0
+        self.next_epoch[idx] = e0 + self.max_steps + 1
+
+        self.pos[idx] = self.start
+        self.steps[idx] = 0
+        self.cost[idx] = self.cell_cost[self.start]
+        self.stamp[idx * self.n_cells + self.start] = e0
+        self.active[idx] = True
+        self.sim_count += len(idx)
+        self.visits[self.start] += len(idx)
+
+    def walker_path(self, w: int):
+        """Susun ulang path walker w dari stamp (urut jam masuk sel)."""
+        n = self.n_cells
+        row = self.stamp[w * n:(w + 1) * n]
+        cells = np.flatnonzero(row >= self.epoch0[w])
+        cells = cells[np.argsort(row[cells], kind="stable")]
+        return array(PATH_TYPECODE, cells.astype(np.intc).tobytes())
+
+    def _record_successes(self, idx):
+        lens = self.steps[idx] + 1
+        costs = self.cost[idx]
+        self.success_lens.append(lens)
+        self.success_costs.append(costs)
+
+        # hanya kandidat yang bisa mengalahkan best sekarang yang diperiksa
+        if self.best_path_cost is not None:
+            near = costs <= self.best_path_cost + 1e-9
+            if not near.any():
+                return
+            idx, lens, costs = idx[near], lens[near], costs[near]
+
+        # kandidat terbaik: cost terkecil lalu path terpendek
+        k = int(np.lexsort((lens, costs))[0])
+        path_cost, path_len = float(costs[k]), int(lens[k])
+        if self.best_path is None or is_better_path(
+                path_cost, path_len, None, self.best_path_cost, len(self.best_path), None):
+            self.best_path = self.walker_path(int(idx[k]))
+            self.best_path_cost = path_cost
+
+    def _flush(self):
+        """Masukkan buffer kunjungan dan statistik sukses ke total."""
+        used = self.visit_buf[:self.tick].ravel()
+        self.visits += np.bincount(used, minlength=self.n_cells + 1)
+        self.tick = 0
+
+        if self.success_lens:
+            lens = np.concatenate(self.success_lens)
+            costs = np.concatenate(self.success_costs)
+            self.success_lens, self.success_costs = [], []
+
+            self.success_count += len(lens)
+            self.total_success_length += int(lens.sum())
+            self.total_success_cost += float(costs.sum())
+            self.length_dist.add_array(lens)
+            self.cost_dist.add_array(costs)
+
+            lo_len, hi_len = int(lens.min()), int(lens.max())
+            lo_cost, hi_cost = float(costs.min()), float(costs.max())
+            if self.min_success_length is None or lo_len < self.min_success_length:
+                self.min_success_length = lo_len
+            if self.max_success_length is None or hi_len > self.max_success_length:
+                self.max_success_length = hi_len
+            if self.min_success_cost is None or lo_cost < self.min_success_cost:
+                self.min_success_cost = lo_cost
+            if self.max_success_cost is None or hi_cost > self.max_success_cost:
+                self.max_success_cost = hi_cost
+
+    # ---------- lockstep ----------
+
+    def step(self) -> bool:
+        """Majukan semua walker aktif satu langkah. Return False kalau sudah selesai."""
+        active = self.active
+        if not active.any():
+            return False
+
+        if self.tick == 0:
+            self.rand = self.rng.random((BLOCK_STEPS, self.batch_size), dtype=np.float32)
+
+        pos, steps, epoch0 = self.pos, self.steps, self.epoch0
+        n_moves = len(MOVES)
+
+        # bitmask arah yang masih bebas (belum visited di episode ini)
+        cand = np.take(self.nbr_t, pos, axis=1)
+        cand += self.stamp_base
+        free = (np.take(self.stamp, cand) < epoch0).view(np.uint8)
+        mask = free[0].copy()
+        for k in range(1, n_moves):
+            mask |= free[k] << k
+        count = np.take(self.popcount, mask)
+
+        # urutan cek sama dengan step_agent: max steps, sudah di goal, tetangga
+        out_of_steps = active & (steps >= self.max_steps)
+        movers = active & ~out_of_steps
+        if self.start_is_goal:
+            at_goal = movers & (pos == self.goal)
+            movers &= ~at_goal
+        has_move = count > 0
+        stuck = movers & ~has_move
+        moving = movers & has_move
+
+        pick = (self.rand[self.tick] * count).astype(np.intp)
+        col = np.take(self.pick_col_flat, mask * n_moves + pick)
+        nxt = np.take(self.nbr_flat, pos * n_moves + col)
+        np.copyto(nxt, pos, where=~moving)
+
+        # walker yang tidak bergerak menulis ulang stamp sel yang sama: aman
+        steps += moving
+        pos[:] = nxt
+        np.put(self.stamp, self.stamp_base[0] + nxt, epoch0 + steps)
+        self.cost += np.take(self.cell_cost, nxt) * moving
+
+        buf = self.visit_buf[self.tick]
+        buf[:] = self.n_cells
+        np.copyto(buf, nxt, where=moving)
+        self.tick += 1
+
+        success = moving & (nxt == self.goal)
+        if self.start_is_goal:
+            success |= at_goal
+        finished = out_of_steps | stuck | success
+
+        if finished.any():
+            if success.any():
+                self._record_successes(np.flatnonzero(success))
+            done = np.flatnonzero(finished)
+            active[done] = False
+            self._start_walkers(done)
+
+        if self.tick == BLOCK_STEPS:
+            self._flush()
+        return True
+
+    def run(self):
+        while self.step():
+            pass
+        self.publish()
+
+    def publish(self):
+        """Salin hasil ke SimulationState (field yang sama dengan handle_success)."""
+        self._flush()
+
+        sim = self.sim
+        sim.sim_count = self.sim_count
+        sim.success_count = self.success_count
+        sim.total_success_length = self.total_success_length
+        sim.total_success_cost = self.total_success_cost
+        sim.min_success_length = self.min_success_length
+        sim.max_success_length = self.max_success_length
+        sim.min_success_cost = self.min_success_cost
+        sim.max_success_cost = self.max_success_cost
+        sim.length_dist = self.length_dist.copy()
+        sim.cost_dist = self.cost_dist.copy()
+        sim.best_path = self.best_path
+        sim.best_path_cost = self.best_path_cost
+        # walker tidak punya nomor episode global; tie antar shard tidak menang
+        sim.best_episode = None
+        # walker vector selalu uniform: bobot importance = 1
+        sim.success_weight = float(self.success_count)
+        sim.success_weight_sq = float(self.success_count)
+        sim.success_weight_cost = self.total_success_cost
+
+        heat = self.visits[:self.n_cells]
+        sim.visit_counts = GridArray.from_flat(self.rows, self.cols, heat.astype(np.int64).tobytes(), "q")
+        sim.visit_max = int(heat.max()) if self.n_cells else 0
+        sim.visit_total = int(heat.sum())
+        sim.visit_nonzero = int(np.count_nonzero(heat))
+        sim.agents = []
+        sim.first_step_after_reset = False
+        sim.simulation_done = not self.active.any()
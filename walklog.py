@@ -0,0 +1,184 @@
+# walklog.py
+#
+# Log walk ke file biner terkompresi (gzip) untuk analisis offline, tanpa
+# menyimpan semua walk di memori. Format (little-endian):
+#
+#   header : b"MCWK", versi (B), rows (I), cols (I), jumlah move (B),
+#            delta index flat tiap move (i x jumlah move)
+#   record : outcome (B), episode (q), steps (I), cost (d), sel awal (I),
+#            lalu `steps` byte kode move (index ke tabel delta header)
+#
+# File hasil `cat a b > c` tetap valid: header boleh muncul lagi di batas
+# record (byte pertama record selalu < 4, header diawali "M").
+#
+#   for walk in read_walks("walks.bin.gz"):
+#       print(walk.episode, walk.cost, walk.cells)
+
+import gzip
+import struct
+from array import array
+from dataclasses import dataclass
+from itertools import accumulate, islice
+from operator import sub
+from typing import Iterator, List, Optional
+
+from config import MOVES, WALKLOG_CHUNK_BYTES, WALKLOG_LEVEL
+
+try:
+    import numpy as np
+except ImportError:  # numpy opsional: tanpa numpy kode move di-encode per record
+    np = None
+
+MAGIC = b"MCWK"
+VERSION = 1
+_HEADER = struct.Struct("<4sBIIB")
+_RECORD = struct.Struct("<BqIdI")
+
+# outcome walk
+OUTCOME_SUCCESS = 0
+OUTCOME_MAX_STEPS = 1   # kehabisan max steps
+OUTCOME_DEAD_END = 2    # tidak ada tetangga bebas
+OUTCOME_PRUNED = 3      # dihentikan prune_walks
+OUTCOME_NAMES = ("sukses", "max steps", "buntu", "dipangkas")
+
+
+@dataclass
+class WalkRecord:
+    outcome: int
+    episode: int
+    cost: float
+    # index flat sel, dari START
+    cells: array
+    rows: int
+    cols: int
+
+    @property
+    def steps(self) -> int:
+        return len(self.cells) - 1
+
+    @property
+    def success(self) -> bool:
+        return self.outcome == OUTCOME_SUCCESS
+
+
+class WalkWriter:
+    """Tulis walk ke file gzip; record dikumpulkan per chunk sebelum dikompres.
+
+    write() hanya menyalin path mentah (int32); kode move untuk satu chunk
+    dihitung sekaligus di flush(), jadi ongkos per walk di loop simulasi kecil.
+    """
+
+    def __init__(self, path: str, rows: int, cols: int, include_failed: bool = False,
+                 level: int = WALKLOG_LEVEL, chunk_bytes: int = WALKLOG_CHUNK_BYTES):
+        self.path = path
+        self.include_failed = include_failed
+        self.chunk_bytes = chunk_bytes
+        self.count = 0
+        self.raw_bytes = 0
+
+        deltas = [dr * cols + dc for dr, dc in MOVES]
+        # cols == 1: delta kiri/kanan bentrok dengan atas/bawah; yang pertama menang
+        self._codes = {}
+        for code, d in enumerate(deltas):
+            self._codes.setdefault(d, code)
+        if np is not None:
+            # kode move per delta di [-cols - 1, cols + 1]; delta lain (batas antar walk) = 0
+            self._span = cols + 1
+            self._lut = np.zeros(2 * self._span + 1, dtype=np.uint8)
+            for d, code in self._codes.items():
+                self._lut[d + self._span] = code
+
+        self._file = gzip.open(path, "wb", compresslevel=level)
+        self._file.write(_HEADER.pack(MAGIC, VERSION, rows, cols, len(deltas))
+                         + struct.pack(f"<{len(deltas)}i", *deltas))
+        self._heads: List[bytes] = []
+        self._paths: List[bytes] = []
+        self._pending = 0
+
+    def write(self, cells: array, n: int, cost: float, episode: int, outcome: int):
+        """Tambah satu walk: n sel pertama dari cells (path agen, buffer dipakai ulang)."""
+        if outcome != OUTCOME_SUCCESS and not self.include_failed:
+            return
+        self._heads.append(_RECORD.pack(outcome, episode, n - 1, cost, cells[0]))
+        self._paths.append(cells[:n].tobytes())
+        self._pending += n
+        self.count += 1
+        if self._pending * 4 >= self.chunk_bytes:
+            self.flush()
+
+    def flush(self):
+        if not self._heads:
+            return
+        out = []
+        if np is not None:
+            flat = np.frombuffer(b"".join(self._paths), dtype=np.int32)
+            delta = np.diff(flat) + self._span
+            np.clip(delta, 0, 2 * self._span, out=delta)
+            codes = self._lut[delta].tobytes()
+            off = 0
+            for head, path in zip(self._heads, self._paths):
+                n = len(path) >> 2
+                out.append(head)
+                out.append(codes[off:off + n - 1])
+                off += n
+        else:
+            get = self._codes.__getitem__
+            for head, path in zip(self._heads, self._paths):
+                cells = array("i", path)
+                out.append(head)
+                out.append(bytes(map(get, map(sub, islice(cells, 1, None), cells))))
+        data = b"".join(out)
+        self.raw_bytes += len(data)
+        self._file.write(data)
+        self._heads = []
+        self._paths = []
+        self._pending = 0
+
+    def close(self):
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "WalkWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_walks(path: str, outcomes: Optional[set] = None) -> Iterator[WalkRecord]:
+    """Generator WalkRecord dari file WalkWriter (juga hasil gabungan beberapa file).
+
+    outcomes: hanya outcome ini yang di-decode (mis. {OUTCOME_SUCCESS});
+    record lain dilewati tanpa menyusun path.
+    """
+    with gzip.open(path, "rb") as f:
+        rows = cols = 0
+        deltas: List[int] = []
+        while True:
+            head = f.read(1)
+            if not head:
+                return
+            if head == MAGIC[:1]:
+                magic, version, rows, cols, n_moves = _HEADER.unpack(head + _read_exact(f, _HEADER.size - 1))
+                if magic != MAGIC or version != VERSION:
+                    raise ValueError(f"{path}: bukan walk log versi {VERSION}")
+                deltas = list(struct.unpack(f"<{n_moves}i", _read_exact(f, 4 * n_moves)))
+                continue
+            if not deltas:
+                raise ValueError(f"{path}: record tanpa header")
+
+            outcome, episode, steps, cost, first = _RECORD.unpack(head + _read_exact(f, _RECORD.size - 1))
+            moves = _read_exact(f, steps)
+            if outcomes is not None and outcome not in outcomes:
+                continue
+            cells = array("i", accumulate(map(deltas.__getitem__, moves), initial=first))
+            yield WalkRecord(outcome, episode, cost, cells, rows, cols)
+
+
+def _read_exact(f, n: int) -> bytes:
+    data = f.read(n)
+    if len(data) != n:
+        raise ValueError("walk log terpotong")
+    return data
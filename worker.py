@@ -0,0 +1,273 @@
+# worker.py
+#
+# Simulasi di thread latar, terpisah dari loop render.
+#
+# - UI tidak menyentuh SimulationState langsung. Perintah (tombol, klik grid,
+#   ganti setting) masuk ke antrian dan dijalankan worker di sela putaran.
+# - Worker menerbitkan SimSnapshot ke double buffer dengan laju tetap
+#   (SNAPSHOT_HZ). UI memegang snapshot depan selama satu frame; worker hanya
+#   menulis ke buffer belakang, jadi yang dibaca UI selalu konsisten.
+
+import queue
+from array import array
+import threading
+import time
+from typing import Callable, List, Optional
+
+from config import (
+    FPS, SNAPSHOT_HZ, WORKER_SLICE_MS,
+    MIN_FRAME_BUDGET_MS, FRAME_SLACK_MS, ORACLE_DEBOUNCE_S,
+)
+from simulation import SimulationState, PATH_TYPECODE
+from gridarray import GridArray
+from streamstats import Distribution
+from profiler import FrameProfiler
+
+
+def effective_budget_ms(sim: SimulationState, other_ms: float) -> float:
+    """Budget simulasi per periode frame: sisa waktu setelah render/event UI."""
+    frame_ms = 1000.0 / FPS
+    spare = frame_ms - other_ms - FRAME_SLACK_MS
+    return max(MIN_FRAME_BUDGET_MS, min(sim.frame_budget_ms, spare))
+
+
+class AgentView:
+    """Jalur agen yang digambar UI (path ringkas disalin, bukan referensi)."""
+
+    __slots__ = ("path", "active")
+
+    def __init__(self):
+        self.path = array(PATH_TYPECODE)
+        self.active = False
+
+    @property
+    def path_len(self) -> int:
+        return len(self.path)
+
+    def cells(self) -> array:
+        return self.path
+
+
+# field bernilai immutable, disalin apa adanya
+_SCALAR_FIELDS = (
+    "rows", "cols", "start", "goal", "map_version",
+    "visit_max", "visit_total", "visit_nonzero",
+    "agent_count", "steps_per_frame", "max_steps_per_walk", "max_simulations",
+    "prune_walks", "pruned_count", "walk_policy", "bias_cost", "bias_goal",
+    "stop_ci_halfwidth", "stop_patience", "stop_reason", "best_improved_at",
+    "track_paths", "distinct_paths", "top_path_share",
+    "success_weight", "success_weight_sq", "success_weight_cost",
+    "step_mode", "frame_budget_ms", "visits_per_sec", "seed",
+    "best_path_cost", "optimal_cost", "optimal_length", "optimal_version",
+    "sim_count", "success_count", "total_success_length",
+    "min_success_length", "max_success_length",
+    "total_success_cost", "min_success_cost", "max_success_cost",
+    "simulation_done", "paused", "first_step_after_reset",
+    "cursor_mode", "current_cost_value",
+)
+
+
+class SimSnapshot:
+    """Salinan state yang dibaca UI; atributnya sama dengan SimulationState.
+
+    Heatmap dan path agen disalin ke buffer milik snapshot (dipakai ulang
+    antar publish). grid/cell_costs hanya disalin kalau map_version berubah. best_path
+    dibagi referensinya: SimulationState selalu mengganti list itu, tidak
+    pernah mengubahnya di tempat.
+    """
+
+    def __init__(self):
+        for name in _SCALAR_FIELDS:
+            setattr(self, name, None)
+        self.rows = self.cols = 0
+        self.grid: Optional[GridArray] = None
+        self.cell_costs: Optional[GridArray] = None
+        self.visit_counts: Optional[GridArray] = None
+        self.best_path: Optional[array] = None
+        self.length_dist: Optional[Distribution] = None
+        self.cost_dist: Optional[Distribution] = None
+        self.agents: List[AgentView] = []
+
+    def copy_from(self, sim: SimulationState):
+        map_changed = self.map_version != sim.map_version
+        resized = (self.rows, self.cols) != (sim.rows, sim.cols)
+
+        for name in _SCALAR_FIELDS:
+            setattr(self, name, getattr(sim, name))
+        self.best_path = sim.best_path
+        # kecil (ukuran tetap), disalin utuh tiap publish
+        self.length_dist = sim.length_dist.copy()
+        self.cost_dist = sim.cost_dist.copy()
+
+        if map_changed or resized:
+            self.grid = sim.grid.copy()
+            self.cell_costs = sim.cell_costs.copy()
+        if self.visit_counts is None or resized:
+            self.visit_counts = sim.visit_counts.copy()
+        else:
+            self.visit_counts.copy_into(sim.visit_counts)
+
+        views = self.agents
+        while len(views) < len(sim.agents):
+            views.append(AgentView())
+        del views[len(sim.agents):]
+        for view, agent in zip(views, sim.agents):
+            view.path = agent.cells()
+            view.active = agent.active
+
+
+class SnapshotBuffer:
+    """Double buffer snapshot: satu dibaca UI (depan), satu ditulis worker."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buffers = [SimSnapshot(), SimSnapshot()]
+        self._front = 0
+        self._reading: Optional[int] = None
+        self.published = 0
+
+    def publish(self, sim: SimulationState) -> bool:
+        """Salin sim ke buffer belakang lalu tukar. False kalau UI masih memegangnya."""
+        with self._lock:
+            back = 1 - self._front
+            if self._reading == back:
+                return False
+        # UI hanya bisa mengambil buffer depan, jadi salin di luar lock aman
+        self._buffers[back].copy_from(sim)
+        with self._lock:
+            self._front = back
+            self.published += 1
+        return True
+
+    def acquire(self) -> SimSnapshot:
+        """Snapshot terbaru; pegang sampai release() (satu frame)."""
+        with self._lock:
+            self._reading = self._front
+            return self._buffers[self._front]
+
+    def release(self):
+        with self._lock:
+            self._reading = None
+
+
+class SimulationWorker:
+    """Thread yang menjalankan SimulationState dan menerbitkan snapshot.
+
+    Mode "fixed": steps_per_frame putaran per periode frame (seperti loop
+    lama). Mode "budget": putaran selama budget efektif per periode frame,
+    dipotong per WORKER_SLICE_MS supaya antrian perintah tetap cepat
+    dilayani dan thread UI kebagian GIL.
+    """
+
+    def __init__(self, sim: SimulationState, publish_hz: float = SNAPSHOT_HZ,
+                 profiler: Optional[FrameProfiler] = None):
+        self.sim = sim
+        # step_frame & publish dicatat ke profiler (kalau aktif)
+        self.profiler = profiler if profiler is not None else FrameProfiler()
+        self.publish_period = 1.0 / publish_hz
+        self.commands: "queue.Queue" = queue.Queue()
+        self.snapshots = SnapshotBuffer()
+        # waktu render + event UI per frame (ms), diisi thread UI
+        self.ui_ms = 0.0
+        # map_version terakhir yang dilihat _publish & kapan mulai berlaku
+        self._map_version = None
+        self._map_since = 0.0
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self._publish()
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        self._stop.set()
+        self.commands.put(None)
+        self._thread.join(timeout)
+
+    def submit(self, fn: Callable, *args):
+        """Jalankan fn(sim, *args) di thread worker (urutan FIFO)."""
+        self.commands.put((fn, args))
+
+    # ---------- loop worker ----------
+
+    def _publish(self):
+        t0 = time.perf_counter()
+        # solusi eksak hanya dihitung ulang kalau map berubah, dan baru setelah
+        # map diam ORACLE_DEBOUNCE_S (tidak per sel saat rintangan digambar)
+        sim = self.sim
+        if sim.map_version != self._map_version:
+            self._map_version = sim.map_version
+            self._map_since = t0
+        elif t0 - self._map_since >= ORACLE_DEBOUNCE_S:
+            sim.update_optimal()
+        self.snapshots.publish(sim)
+        self.profiler.record("publish", t0, time.perf_counter())
+
+    def _execute(self, item):
+        if item is not None:
+            fn, args = item
+            fn(self.sim, *args)
+
+    def _drain(self):
+        while True:
+            try:
+                item = self.commands.get_nowait()
+            except queue.Empty:
+                return
+            self._execute(item)
+
+    def _wait(self, until: float):
+        """Tidur sampai `until`, tapi langsung bangun untuk perintah."""
+        timeout = until - time.perf_counter()
+        if timeout <= 0:
+            return
+        try:
+            item = self.commands.get(timeout=timeout)
+        except queue.Empty:
+            return
+        self._execute(item)
+
+    def _run(self):
+        sim = self.sim
+        prof = self.profiler
+        frame_s = 1.0 / FPS
+        now = time.perf_counter()
+        next_frame = now
+        next_publish = now + self.publish_period
+
+        while not self._stop.is_set():
+            self._drain()
+
+            now = time.perf_counter()
+            if now >= next_frame and not (sim.paused or sim.simulation_done):
+                if sim.step_mode == "budget":
+                    deadline = now + effective_budget_ms(sim, self.ui_ms) / 1000.0
+                    while now < deadline and not (sim.paused or sim.simulation_done):
+                        slice_ms = min(WORKER_SLICE_MS, (deadline - now) * 1000.0)
+                        sim.step_frame(slice_ms)
+                        prof.record("step_frame", now, time.perf_counter())
+                        self._drain()
+                        # lepas GIL sebentar untuk thread UI
+                        time.sleep(0)
+                        now = time.perf_counter()
+                else:
+                    sim.step_frame()
+                    prof.record("step_frame", now, time.perf_counter())
+                next_frame += frame_s
+                if next_frame < now:
+                    # tertinggal (mis. habis pause): jangan kejar frame yang lewat
+                    next_frame = now + frame_s
+            elif sim.paused or sim.simulation_done:
+                sim.update_visit_rate()
+                next_frame = now
+
+            now = time.perf_counter()
+            if now >= next_publish:
+                self._publish()
+                next_publish = now + self.publish_period
+
+            if sim.paused or sim.simulation_done:
+                self._wait(next_publish)
+            else:
+                self._wait(min(next_frame, next_publish))